@@ -0,0 +1,303 @@
+# -----------------------------------------------------------
+#  asset_bundle.py  (pre-decoded assets in one memory-mapped file)
+# -----------------------------------------------------------
+#  Build offline:        python asset_bundle.py build
+#  Compare cold starts:  python asset_bundle.py measure
+#
+#  The bundle holds the background and every library image already
+#  scaled to display size as raw RGB, and every sound already decoded to
+#  PCM in the mixer's format. At runtime it is memory-mapped and turned
+#  into surfaces and Sounds without running any decoder.
+#
+#  Freshness is tracked per entry: an asset is served from the bundle
+#  while its own source file is unchanged, and anything the bundle never
+#  held (such as later uploads) is simply decoded from its source.
+# -----------------------------------------------------------
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+
+import pygame
+
+from image_library import IMAGE_DIR, IMAGE_EXTENSIONS, IMAGE_SIZE, decode_image_bytes, to_display_format
+
+BUNDLE_PATH = os.path.join("assets", "cache", "assets.bundle")
+BACKGROUND_PATH = os.path.join("assets", "background.jpg")
+BACKGROUND_SIZE = (800, 650)
+SOUND_DIR = os.path.join("assets", "sounds")
+SOUND_EXTENSIONS = ('.wav', '.mp3', '.ogg')
+NO_BUNDLE_ENV = "PUZZLE_NO_BUNDLE"  # Set to 1 to ignore the bundle
+
+# File layout: magic, u32 header length, JSON header, then 16-byte aligned
+# blobs. The header maps asset keys to offsets and records, per entry, the
+# source path, a cheap (size, mtime) signature and the source's content hash.
+_MAGIC = b"PZBUNDL2"
+_LENGTH = struct.Struct("<I")
+_ALIGN = 16
+
+# ------------------ SOURCES --------------------------------
+def bundle_sources():
+    """(key, path, kind, size) for every asset that goes into the bundle."""
+    sources = []
+    if os.path.exists(BACKGROUND_PATH):
+        sources.append(("background.jpg", BACKGROUND_PATH, "image", BACKGROUND_SIZE))
+    for folder, extensions, kind, size in ((IMAGE_DIR, IMAGE_EXTENSIONS, "image", IMAGE_SIZE),
+                                           (SOUND_DIR, SOUND_EXTENSIONS, "sound", None)):
+        try:
+            names = sorted(f for f in os.listdir(folder) if f.lower().endswith(extensions))
+        except FileNotFoundError:
+            names = []
+        prefix = "images/" if kind == "image" else "sounds/"
+        for name in names:
+            sources.append((prefix + name, os.path.join(folder, name), kind, size))
+    return sources
+
+def source_signature(path):
+    """[size, mtime] of ``path``, or None when it is missing."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+def content_hash(path):
+    """SHA-256 of one source file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# ------------------ RUNTIME --------------------------------
+class AssetBundle:
+    """
+    Read-only, memory-mapped view of a built bundle.
+    Each entry is checked against its source the first time it is asked
+    for: a matching (size, mtime) is enough, and only a touched file is
+    hashed, so opening the bundle never reads the sources.
+    """
+    def __init__(self, path=BUNDLE_PATH):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        try:
+            if self._map[:len(_MAGIC)] != _MAGIC:
+                raise ValueError(f"{path} is not an asset bundle")
+            (length,) = _LENGTH.unpack_from(self._map, len(_MAGIC))
+            start = len(_MAGIC) + _LENGTH.size
+            self.header = json.loads(self._map[start:start + length].decode("utf-8"))
+            self.entries = self.header["entries"]
+        except (ValueError, KeyError, struct.error):
+            self.close()
+            raise
+        self._fresh = {}  # Key -> whether its source still matches the entry
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def is_fresh(self, key):
+        """True when ``key`` is bundled and its source file has not changed since."""
+        fresh = self._fresh.get(key)
+        if fresh is None:
+            entry = self.entries.get(key)
+            if entry is None:
+                fresh = False
+            else:
+                signature = source_signature(entry["path"])
+                if signature is None:
+                    fresh = False
+                elif signature == entry["signature"]:
+                    fresh = True
+                else:
+                    # Touched or copied; only a content change makes it stale
+                    try:
+                        fresh = content_hash(entry["path"]) == entry["hash"]
+                    except OSError:
+                        fresh = False
+            self._fresh[key] = fresh
+        return fresh
+
+    def is_current(self, sources):
+        """True when every one of ``sources`` is bundled and fresh (used by the build)."""
+        return (set(self.entries) == {key for key, _, _, _ in sources}
+                and all(self.is_fresh(key) for key, _, _, _ in sources))
+
+    def _view(self, entry):
+        return memoryview(self._map)[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def surface(self, key, size=None, convert=True):
+        """
+        Display-format surface for ``key``, or None if the bundle lacks it
+        at ``size``. ``convert=False`` gives a plain RGB copy for worker threads.
+        """
+        entry = self.entries.get(key)
+        if entry is None or entry["kind"] != "image" or (size and tuple(entry["size"]) != tuple(size)):
+            return None
+        if not self.is_fresh(key):
+            return None
+        surface = pygame.image.frombuffer(self._view(entry), tuple(entry["size"]), "RGB")
+        return to_display_format(surface) if convert else surface.copy()
+
+    def sound(self, key):
+        """Sound built from the stored PCM, or None if the mixer runs in another format."""
+        entry = self.entries.get(key)
+        if entry is None or entry["kind"] != "sound" or pygame.mixer.get_init() != tuple(self.header["mixer"]):
+            return None
+        if not self.is_fresh(key):
+            return None
+        return pygame.mixer.Sound(buffer=self._view(entry))
+
+_bundle = None
+_bundle_checked = False
+_bundle_lock = threading.Lock()
+
+def shared_bundle():
+    """
+    The bundle, memory-mapped on first use, or None. Entries whose source
+    has changed are skipped one by one (see ``AssetBundle.is_fresh``).
+    """
+    global _bundle, _bundle_checked
+    if not _bundle_checked:
+        # The prefetch thread and the main thread may both get here first
+        with _bundle_lock:
+            if not _bundle_checked:
+                if os.environ.get(NO_BUNDLE_ENV) != "1" and os.path.exists(BUNDLE_PATH):
+                    try:
+                        _bundle = AssetBundle(BUNDLE_PATH)
+                    except (OSError, ValueError, KeyError, struct.error) as e:
+                        print(f"Ignoring asset bundle: {e}")
+                _bundle_checked = True  # Set last, so no thread sees a half-open bundle
+    return _bundle
+
+_sounds = {}  # Loaded Sounds by path, shared by every game
+
+def load_sound(path):
+    """
+    pygame Sound for ``path``, taken from the bundle when possible.
+    Sounds are kept once loaded, so a prefetched one costs nothing later.
+    """
+    sound = _sounds.get(path)
+    if sound is None:
+        bundle = shared_bundle()
+        if bundle:
+            sound = bundle.sound("sounds/" + os.path.basename(path))
+        if sound is None:
+            sound = pygame.mixer.Sound(path)
+        _sounds[path] = sound
+    return sound
+
+def sound_bytes(sound):
+    """Decoded size of ``sound`` in the mixer's format."""
+    frequency, fmt, channels = pygame.mixer.get_init()
+    return int(sound.get_length() * frequency * channels * (abs(fmt) // 8))
+
+# ------------------ OFFLINE BUILD --------------------------
+def build_bundle(path=BUNDLE_PATH, force=False):
+    """Decodes every source and writes the bundle; skipped when already current."""
+    pygame.mixer.init()
+    mixer_format = pygame.mixer.get_init()
+    sources = bundle_sources()
+    if not force and os.path.exists(path):
+        try:
+            old = AssetBundle(path)
+            current = (old.is_current(sources) and tuple(old.header["mixer"]) == mixer_format
+                       and all(tuple(old.entries[key].get("size", ())) == tuple(size or ())
+                               for key, _, _, size in sources))
+            old.close()
+            if current:
+                print(f"{path} is up to date")
+                return
+        except (OSError, ValueError, KeyError, struct.error):
+            pass
+
+    blobs = []
+    entries = {}
+    for key, src, kind, size in sources:
+        if kind == "image":
+            data = decode_image_bytes(src, size)
+            entries[key] = {"kind": kind, "size": list(size)}
+        else:
+            data = pygame.mixer.Sound(src).get_raw()
+            entries[key] = {"kind": kind}
+        entries[key].update(path=src, signature=source_signature(src), hash=content_hash(src))
+        blobs.append((key, data))
+        print(f"  {key}: {len(data):,} bytes")
+
+    header = {"mixer": list(mixer_format), "entries": entries}
+    # Offsets depend on the header length, which depends on the offsets;
+    # reserve digits generously and pad the header to a fixed size.
+    for entry in entries.values():
+        entry["offset"], entry["length"] = 0, 0
+    header_size = len(json.dumps(header)) + 32 * (len(entries) + 1)
+    offset = len(_MAGIC) + _LENGTH.size + header_size
+    for key, data in blobs:
+        offset += -offset % _ALIGN
+        entries[key]["offset"], entries[key]["length"] = offset, len(data)
+        offset += len(data)
+    header_bytes = json.dumps(header).encode("utf-8").ljust(header_size)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_MAGIC + _LENGTH.pack(header_size) + header_bytes)
+        for key, data in blobs:
+            f.write(b"\0" * (entries[key]["offset"] - f.tell()))
+            f.write(data)
+    os.replace(tmp_path, path)
+    print(f"Wrote {path} ({os.path.getsize(path):,} bytes, {len(entries)} assets)")
+
+# ------------------ COLD-START MEASUREMENT -----------------
+_MEASURE_SNIPPET = """
+import os, time
+start = time.perf_counter()
+import pygame
+pygame.init()
+pygame.mixer.init()
+pygame.display.set_mode((800, 650))
+import asset_bundle
+from image_library import decode_image
+bundle = asset_bundle.shared_bundle()
+for key, path, kind, size in asset_bundle.bundle_sources():
+    if kind == "image":
+        (bundle and bundle.surface(key, size)) or decode_image(path, size)
+    else:
+        asset_bundle.load_sound(path)
+print(time.perf_counter() - start, bundle is not None)
+"""
+
+def measure_cold_start(runs=3):
+    """Times loading every asset in fresh interpreters, with and without the bundle."""
+    import subprocess
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    for label, disabled in (("decode from sources", "1"), ("memory-mapped bundle", "0")):
+        env = dict(os.environ, **{NO_BUNDLE_ENV: disabled})
+        env.setdefault("SDL_VIDEODRIVER", "dummy")
+        env.setdefault("SDL_AUDIODRIVER", "dummy")
+        times = []
+        used = False
+        for _ in range(runs):
+            out = subprocess.run([sys.executable, "-c", _MEASURE_SNIPPET], cwd=here, env=env,
+                                 capture_output=True, text=True, check=True).stdout.split()
+            times.append(float(out[-2]))
+            used = out[-1] == "True"
+        note = "" if used or disabled == "1" else "  (bundle missing or stale)"
+        print(f"{label:22s} best of {runs}: {1000 * min(times):7.1f} ms{note}")
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "build":
+        build_bundle(force="--force" in sys.argv)
+    elif command == "measure":
+        measure_cold_start()
+    else:
+        print("usage: python asset_bundle.py build [--force] | measure")
@@ -0,0 +1,172 @@
+# -----------------------------------------------------------
+#  distance_table.py  (exact distances for every 3x3 board)
+# -----------------------------------------------------------
+#  The 3x3 puzzle has 9!/2 = 181,440 reachable boards. One BFS from the
+#  goal stores each board's optimal distance in a byte array indexed by
+#  a permutation rank; the array is cached on disk after the first build.
+# -----------------------------------------------------------
+import os
+import random
+from array import array
+from collections import deque
+
+from pattern_db import placement_count, placement_rank, rank_multipliers
+
+TABLE_SIZE = 3
+TABLE_PATH = os.path.join("assets", "cache", "puzzle3x3_distances.bin")
+
+_CELLS = TABLE_SIZE * TABLE_SIZE
+_TILES = _CELLS - 1
+_RANKED = _TILES - 2  # The last two tiles are implied by solvability parity
+_MULTIPLIERS = rank_multipliers(_TILES, _RANKED)
+_TILE_ORDERS = placement_count(_TILES, _RANKED)  # 20,160 even tile orders
+_ENTRIES = _CELLS * _TILE_ORDERS  # 181,440
+_UNSEEN = 255
+
+def state_rank(state):
+    """
+    Perfect hash of a solvable 3x3 board into 0 .. 181,439: the blank's
+    position, then the rank of the tile order with the blank left out.
+    """
+    tiles = [t - 1 for t in state if t]
+    return state.index(0) * _TILE_ORDERS + placement_rank(tiles[:_RANKED], _MULTIPLIERS)
+
+def _has_even_inversions(tiles):
+    inversions = 0
+    for i in range(len(tiles)):
+        for j in range(i + 1, len(tiles)):
+            if tiles[j] < tiles[i]:
+                inversions += 1
+    return inversions % 2 == 0
+
+def state_unrank(rank):
+    """Inverse of ``state_rank``: rebuilds the solvable board for ``rank``."""
+    blank, rank = divmod(rank, _TILE_ORDERS)
+    free = list(range(1, _CELLS))
+    tiles = []
+    for multiplier in _MULTIPLIERS:
+        digit, rank = divmod(rank, multiplier)
+        tiles.append(free.pop(digit))
+    tiles += free
+    if not _has_even_inversions(tiles):
+        tiles[-2], tiles[-1] = tiles[-1], tiles[-2]
+    tiles.insert(blank, 0)
+    return tuple(tiles)
+
+class DistanceTable:
+    """Optimal distance of every solvable 3x3 board, plus lookups built on it."""
+    def __init__(self, data):
+        self.data = data
+        self._by_distance = None
+
+    @property
+    def max_distance(self):
+        return max(self.data)
+
+    def distance(self, state):
+        """Optimal number of moves to solve ``state`` (assumed solvable)."""
+        return self.data[state_rank(state)]
+
+    def next_move(self, state):
+        """An optimal first move for ``state``, or None when it is already solved."""
+        return self._next_move(state)[0]
+
+    def _next_move(self, state):
+        # (move, table lookups it took)
+        # Imported here because puzzle_solver itself defers to this table
+        from puzzle_solver import apply_move
+
+        current = self.distance(state)
+        if current == 0:
+            return None, 1
+        lookups = 1
+        for direction in ("up", "down", "left", "right"):
+            child = apply_move(state, TABLE_SIZE, direction)
+            if child is not None:
+                lookups += 1
+                if self.distance(child) == current - 1:
+                    return direction, lookups
+        return None, lookups
+
+    def solution(self, state):
+        """Full optimal move list, found by walking down the stored distances."""
+        return self.walk(state)[0]
+
+    def walk(self, state):
+        """(optimal move list, number of table lookups the walk made)."""
+        from puzzle_solver import apply_move
+
+        moves = []
+        direction, total = self._next_move(state)
+        while direction is not None:
+            moves.append(direction)
+            state = apply_move(state, TABLE_SIZE, direction)
+            direction, lookups = self._next_move(state)
+            total += lookups
+        return moves, total
+
+    def by_distance(self):
+        """Ranks grouped by distance, indexed once on first use."""
+        if self._by_distance is None:
+            buckets = [array("l") for _ in range(self.max_distance + 1)]
+            for rank, d in enumerate(self.data):
+                buckets[d].append(rank)
+            self._by_distance = buckets
+        return self._by_distance
+
+    def scramble(self, distance, rng=random):
+        """
+        A random board exactly ``distance`` optimal moves from solved.
+        Distances past the table's maximum are clamped to it.
+        """
+        buckets = self.by_distance()
+        bucket = buckets[max(0, min(distance, len(buckets) - 1))]
+        return state_unrank(bucket[rng.randrange(len(bucket))])
+
+def build_distance_table():
+    """Breadth-first search over every reachable 3x3 board."""
+    from puzzle_solver import goal_state, neighbor_table
+
+    neighbors = neighbor_table(TABLE_SIZE)
+    data = bytearray([_UNSEEN]) * _ENTRIES
+    goal = goal_state(TABLE_SIZE)
+    data[state_rank(goal)] = 0
+    queue = deque([(goal, goal.index(0))])
+    while queue:
+        state, blank = queue.popleft()
+        depth = data[state_rank(state)] + 1
+        for nb, _ in neighbors[blank]:
+            board = list(state)
+            board[blank], board[nb] = board[nb], 0
+            child = tuple(board)
+            rank = state_rank(child)
+            if data[rank] == _UNSEEN:
+                data[rank] = depth
+                queue.append((child, nb))
+    return data
+
+_table = None
+
+def load_distance_table(path=TABLE_PATH):
+    """Loads the cached table, building and saving it on first use."""
+    global _table
+    if _table is None:
+        data = None
+        try:
+            with open(path, "rb") as f:
+                data = bytearray(f.read())
+            if len(data) != _ENTRIES or _UNSEEN in data:
+                data = None
+        except OSError:
+            pass
+        if data is None:
+            data = build_distance_table()
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path + ".tmp", "wb") as f:
+                    f.write(data)
+                os.replace(path + ".tmp", path)
+            except OSError as e:
+                print(f"Could not cache 3x3 distance table: {e}")
+        _table = DistanceTable(data)
+    return _table
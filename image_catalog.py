@@ -0,0 +1,227 @@
+# -----------------------------------------------------------
+#  image_catalog.py  (SQLite index of the puzzle image folder)
+# -----------------------------------------------------------
+#  One row per image: file name, number (the N of imageN.jpg), content
+#  hash, dimensions, modification time and size, and for an upload the
+#  hash of the file that was uploaded (its kept original is named after
+#  it, see tile_pyramid.original_path). Listing, naming new
+#  uploads and finding duplicates are queries; the folder is only scanned
+#  again when its modification time says files were added, removed or
+#  renamed, and even then only new or changed files are hashed. A file
+#  overwritten in place leaves the folder's time alone, so the queries
+#  that hand out a hash (lookup, find_hash) stat that one file and hash it
+#  again if it changed. Thumbnails are kept by thumbnail_cache, which
+#  checks the same modification time and size.
+#
+#  The catalog lives under assets/cache and can be deleted at any time;
+#  it is rebuilt from the folder on the next start, without the upload
+#  hashes, so those images are then zoomed from their stored copy.
+# -----------------------------------------------------------
+import hashlib
+import os
+import sqlite3
+import threading
+
+from PIL import Image
+
+CATALOG_DIR = os.path.join("assets", "cache")
+HASH_CHUNK = 1024 * 1024
+CATALOG_VERSION = 2  # In the file name; a new layout starts a new catalog
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    filename  TEXT PRIMARY KEY,
+    number    INTEGER,
+    hash      TEXT NOT NULL,
+    width     INTEGER,
+    height    INTEGER,
+    mtime_ns  INTEGER,
+    size      INTEGER,
+    source    TEXT
+);
+CREATE INDEX IF NOT EXISTS images_hash ON images (hash);
+CREATE INDEX IF NOT EXISTS images_source ON images (source);
+CREATE INDEX IF NOT EXISTS images_number ON images (number);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value INTEGER);
+"""
+
+# Re-describing a file keeps its upload hash only while its content is unchanged
+_UPSERT = """
+INSERT INTO images (filename, number, hash, width, height, mtime_ns, size) VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (filename) DO UPDATE SET
+    number = excluded.number, width = excluded.width, height = excluded.height,
+    mtime_ns = excluded.mtime_ns, size = excluded.size,
+    source = CASE WHEN hash = excluded.hash THEN source END,
+    hash = excluded.hash
+"""
+
+def catalog_path(directory):
+    """Catalog file for the image folder ``directory``, one per folder."""
+    key = hashlib.sha1(os.path.abspath(directory).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CATALOG_DIR, f"catalog-v{CATALOG_VERSION}-{key}.sqlite3")
+
+def file_hash(path):
+    """SHA-256 of the file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def image_number(filename):
+    """N for ``imageN.ext``, the names uploads are given; None for other names."""
+    if not filename.startswith("image"):
+        return None
+    digits = "".join(filter(str.isdigit, filename))
+    return int(digits) if digits else None
+
+class ImageCatalog:
+    """
+    The index of one image folder. Safe to share between threads: every
+    query runs under one lock on one connection. If the catalog file
+    cannot be opened it falls back to an in-memory database, which works
+    the same but is rebuilt on every start.
+    """
+    def __init__(self, directory, extensions, path=None):
+        self.directory = directory
+        self.extensions = extensions
+        self.path = path or catalog_path(directory)
+        self._lock = threading.Lock()
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.executescript(_SCHEMA)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Image catalog unavailable ({e}); indexing in memory")
+            self._db = sqlite3.connect(":memory:", check_same_thread=False)
+            self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # ------------------ SYNC -----------------------------------
+    def sync(self, force=False):
+        """
+        Brings the catalog up to date with the folder; returns True if
+        it had to look at the files. Skipped while the folder's
+        modification time matches the last sync.
+        """
+        try:
+            folder_mtime = os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            with self._lock, self._db:
+                self._db.execute("DELETE FROM images")
+                self._db.execute("DELETE FROM meta")
+            return True
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'folder_mtime'").fetchone()
+            if row and row[0] == folder_mtime and not force:
+                return False
+            known = {name: (mtime, size) for name, mtime, size
+                     in self._db.execute("SELECT filename, mtime_ns, size FROM images")}
+
+        present = set()
+        changed = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.lower().endswith(self.extensions) or not entry.is_file():
+                    continue
+                present.add(entry.name)
+                st = entry.stat()
+                if known.get(entry.name) != (st.st_mtime_ns, st.st_size):
+                    changed.append((entry.name, st))
+        rows = []
+        for name, st in changed:  # Hashed outside the lock; only new or edited files
+            try:
+                rows.append(self._describe(name, st))
+            except (OSError, ValueError) as e:
+                print(f"Skipping unreadable image {name}: {e}")
+                present.discard(name)
+
+        with self._lock, self._db:
+            self._db.executemany(_UPSERT, rows)
+            self._db.executemany("DELETE FROM images WHERE filename = ?",
+                                 [(name,) for name in known.keys() - present])
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('folder_mtime', ?)", (folder_mtime,))
+        return True
+
+    def _describe(self, filename, st):
+        path = os.path.join(self.directory, filename)
+        with Image.open(path) as img:  # Reads the header only
+            width, height = img.size
+        return filename, image_number(filename), file_hash(path), width, height, st.st_mtime_ns, st.st_size
+
+    def _recheck(self, filename):
+        """Hashes ``filename`` again if it changed since it was catalogued; drops it if it is gone."""
+        with self._lock:
+            row = self._db.execute("SELECT mtime_ns, size FROM images WHERE filename = ?", (filename,)).fetchone()
+        if row is None:
+            return
+        try:
+            st = os.stat(os.path.join(self.directory, filename))
+            if (st.st_mtime_ns, st.st_size) == row:
+                return
+            described = self._describe(filename, st)
+        except FileNotFoundError:
+            with self._lock, self._db:
+                self._db.execute("DELETE FROM images WHERE filename = ?", (filename,))
+            return
+        except (OSError, ValueError) as e:
+            print(f"Skipping unreadable image {filename}: {e}")
+            return
+        with self._lock, self._db:
+            self._db.execute(_UPSERT, described)
+
+    # ------------------ QUERIES --------------------------------
+    def filenames(self):
+        """Every catalogued image, sorted by name."""
+        with self._lock:
+            return [name for name, in self._db.execute("SELECT filename FROM images ORDER BY filename")]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+
+    def __contains__(self, filename):
+        return self.lookup(filename) is not None
+
+    def lookup(self, filename):
+        """(hash, width, height, upload hash or None) of ``filename``, or None."""
+        self._recheck(filename)
+        with self._lock:
+            return self._db.execute("SELECT hash, width, height, source FROM images WHERE filename = ?",
+                                    (filename,)).fetchone()
+
+    def find_hash(self, digest):
+        """Name of a catalogued image that is, or was uploaded from, a file with hash ``digest``; or None."""
+        with self._lock:
+            names = [name for name, in self._db.execute(
+                "SELECT filename FROM images WHERE hash = ? OR source = ? ORDER BY filename", (digest, digest))]
+        for name in names:
+            record = self.lookup(name)  # Skips a match that was overwritten since
+            if record and digest in (record[0], record[3]):
+                return name
+        return None
+
+    def next_number(self):
+        """One more than the highest N among the ``imageN`` files."""
+        with self._lock:
+            highest = self._db.execute("SELECT MAX(number) FROM images").fetchone()[0]
+        return (highest or 0) + 1
+
+    # ------------------ UPDATES --------------------------------
+    def add(self, filename, source, size):
+        """
+        Records a file just written to the folder from an upload whose
+        own hash is ``source``, so uploading the same photo again finds
+        this one and its kept original can be found.
+        """
+        path = os.path.join(self.directory, filename)
+        st = os.stat(path)
+        digest = file_hash(path)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO images (filename, number, hash, width, height, mtime_ns, size, source) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (filename, image_number(filename), digest, size[0], size[1], st.st_mtime_ns, st.st_size, source))
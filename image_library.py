@@ -0,0 +1,234 @@
+# -----------------------------------------------------------
+#  image_library.py  (shared, lazily decoded puzzle images)
+# -----------------------------------------------------------
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import pygame
+from PIL import Image
+
+from image_catalog import ImageCatalog
+
+IMAGE_DIR = "assets/images"
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png')
+IMAGE_SIZE = (600, 600)
+DEFAULT_CACHE_BUDGET = 32 * 1024 * 1024  # About 22 decoded 600x600 images
+FALLBACK_NAME = "fallback.png"
+
+# Colors of the placeholder shown when the image folder is empty
+FALLBACK_BG = (176, 224, 230)
+FALLBACK_FG = (255, 255, 255)
+
+def surface_bytes(surface):
+    return surface.get_pitch() * surface.get_height()
+
+def to_display_format(surface):
+    """
+    Converts to the screen's pixel format so blits need no per-draw
+    conversion. Without a window (tools, benchmarks) an owned copy is
+    returned instead.
+    """
+    if pygame.display.get_surface() is None:
+        return surface.copy()
+    return surface.convert()
+
+def decode_image(path, size=IMAGE_SIZE, convert=True):
+    """
+    Decodes ``path`` straight to a ``size`` surface in display format.
+    JPEGs use Pillow's draft mode, so the DCT scales them down while
+    decoding to the smallest power-of-two reduction still at least
+    ``size``; a Lanczos resample then produces the final pixels.
+    With ``convert=False`` a plain RGB copy is returned, which is what
+    worker threads must use.
+    """
+    surface = pygame.image.frombuffer(decode_image_bytes(path, size), size, "RGB")
+    return to_display_format(surface) if convert else surface.copy()
+
+def decode_image_bytes(path, size=IMAGE_SIZE):
+    """Packed RGB pixels of ``path`` resampled to ``size`` (see ``decode_image``)."""
+    with Image.open(path) as img:
+        img.draft("RGB", size)
+        return img.convert("RGB").resize(size, Image.LANCZOS).tobytes()
+
+def decode_image_full(path, size=IMAGE_SIZE):
+    """The previous loader: full-resolution decode, then a plain scale."""
+    img = pygame.image.load(path)
+    return pygame.transform.scale(img, size)
+
+class ImageLibrary:
+    """
+    The list of puzzle images plus an LRU cache of decoded surfaces.
+    Listing is a query on the folder's ImageCatalog; an image is decoded
+    and scaled the first time it is requested, and the least recently used surfaces are
+    dropped once the cache grows past ``budget_bytes``.
+    ``prefetch`` may run on another thread; what it decodes is converted
+    to the display format on the main thread the first time it is used.
+    """
+    def __init__(self, directory=IMAGE_DIR, size=IMAGE_SIZE, budget_bytes=DEFAULT_CACHE_BUDGET):
+        self.directory = directory
+        self.size = size
+        self.budget_bytes = budget_bytes
+        self.catalog = ImageCatalog(directory, IMAGE_EXTENSIONS)
+        self.filenames = []
+        self._cache = OrderedDict()
+        self._unconverted = set()  # Prefetched entries still in plain RGB
+        self._lock = threading.RLock()
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.refresh()
+
+    def refresh(self):
+        """Re-reads the image list from the catalog; cached surfaces of files still present are kept."""
+        self.catalog.sync()
+        self.filenames = self.catalog.filenames() or [FALLBACK_NAME]
+
+    def __len__(self):
+        return len(self.filenames)
+
+    def add(self, filename, surface=None):
+        """Registers a newly saved image, optionally with its decoded surface."""
+        if self.filenames == [FALLBACK_NAME]:
+            self.filenames = []
+        if filename not in self.filenames:
+            self.filenames.append(filename)
+        if surface is not None:
+            surface = to_display_format(surface)
+            with self._lock:
+                self._store(filename, surface)
+        return self.filenames.index(filename)
+
+    def load(self, index):
+        """Decoded, scaled surface for ``filenames[index]``."""
+        return self.get(self.filenames[index])
+
+    def get(self, filename):
+        with self._lock:
+            surface = self._cache.get(filename)
+            if surface is not None:
+                self.hits += 1
+                self._cache.move_to_end(filename)
+                if filename in self._unconverted:
+                    surface = to_display_format(surface)
+                    self._store(filename, surface)
+                return surface
+            self.misses += 1
+        surface = self._decode(filename)
+        with self._lock:
+            self._store(filename, surface)
+        return surface
+
+    def prefetch(self, index):
+        """
+        Decodes ``filenames[index]`` into the cache from a worker thread,
+        without touching the LRU order or hit counters, and returns it.
+        """
+        filename = self.filenames[index]
+        with self._lock:
+            surface = self._cache.get(filename)
+        if surface is not None:
+            return surface
+        surface = self._decode(filename, convert=False)
+        with self._lock:
+            if filename in self._cache:
+                return self._cache[filename]
+            self._store(filename, surface)
+            self._unconverted.add(filename)
+        return surface
+
+    def _decode(self, filename, convert=True):
+        # Imported here because asset_bundle is built on top of this module
+        from asset_bundle import shared_bundle
+
+        bundle = shared_bundle()
+        if bundle:
+            surface = bundle.surface("images/" + filename, self.size, convert)
+            if surface:
+                return surface
+        if filename != FALLBACK_NAME:
+            try:
+                return decode_image(os.path.join(self.directory, filename), self.size, convert)
+            except (pygame.error, OSError, ValueError):
+                print(f"Failed to load: {filename}")
+        fallback = pygame.Surface(self.size)
+        fallback.fill(FALLBACK_BG)
+        pygame.draw.rect(fallback, FALLBACK_FG, (50, 50, self.size[0] - 100, self.size[1] - 100))
+        return to_display_format(fallback) if convert else fallback
+
+    def _store(self, filename, surface):
+        self._unconverted.discard(filename)
+        old = self._cache.pop(filename, None)
+        if old is not None:
+            self.memory_bytes -= surface_bytes(old)
+        self._cache[filename] = surface
+        self.memory_bytes += surface_bytes(surface)
+        # Always keep the newest entry, even if it alone exceeds the budget
+        while self.memory_bytes > self.budget_bytes and len(self._cache) > 1:
+            name, evicted = self._cache.popitem(last=False)
+            self._unconverted.discard(name)
+            self.memory_bytes -= surface_bytes(evicted)
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return {
+            'images': len(self.filenames),
+            'cached': len(self._cache),
+            'memory_bytes': self.memory_bytes,
+            'budget_bytes': self.budget_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hit_rate,
+        }
+
+_shared = None
+_shared_lock = threading.Lock()
+
+def shared_library():
+    """The library instance shared by every game, created on first use (from any thread)."""
+    global _shared
+    if _shared is None:
+        with _shared_lock:
+            if _shared is None:
+                _shared = ImageLibrary()
+    return _shared
+
+# ------------------ DECODE BENCHMARK -----------------------
+_BENCH_SNIPPET = """
+import resource, sys, time
+import image_library
+decode = getattr(image_library, sys.argv[1])
+paths = sys.argv[2:]
+start = time.perf_counter()
+for path in paths:
+    decode(path)
+elapsed = time.perf_counter() - start
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def benchmark_decode(paths):
+    """
+    Compares the draft-mode loader with the old full decode. Each loader
+    runs in a fresh interpreter so the peak RSS figures do not mix.
+    Peak RSS comes from ``resource`` and is therefore Unix-only.
+    """
+    import subprocess
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    for name in ("decode_image_full", "decode_image"):
+        out = subprocess.run([sys.executable, "-c", _BENCH_SNIPPET, name, *paths],
+                             cwd=here, capture_output=True, text=True, check=True).stdout.split()
+        elapsed, peak_kb = float(out[-2]), int(out[-1])
+        print(f"{name:18s} {1000 * elapsed / len(paths):8.1f} ms/image   peak RSS {peak_kb / 1024:7.1f} MB")
+
+if __name__ == "__main__":
+    # python image_library.py --benchmark photo1.jpg photo2.jpg ...
+    if len(sys.argv) > 2 and sys.argv[1] == "--benchmark":
+        benchmark_decode(sys.argv[2:])
+    else:
+        print("usage: python image_library.py --benchmark IMAGE [IMAGE ...]")
@@ -0,0 +1,306 @@
+# -----------------------------------------------------------
+#  image_picker.py  ("Show more" image chooser shared by the puzzles)
+# -----------------------------------------------------------
+#  The browser is drawn by the game's own loop, on top of the game, so
+#  the timer, uploads and piece cutting keep running while it is open.
+#  Only the rows in view are drawn and only their thumbnails are asked
+#  for, so a library of 10,000 images costs no more per frame than one
+#  of ten. Thumbnails are built on the thumbnail worker pool; requests
+#  for rows scrolled far out of view are cancelled.
+# -----------------------------------------------------------
+import os
+
+import pygame
+
+from thumbnail_cache import THUMB_SIZE, shared_thumbnails
+from tile_pyramid import TileCache
+
+BROWSER_RECT = pygame.Rect(100, 30, 600, 590)
+BROWSER_COLS = 3
+CELL_GAP = 16
+LABEL_HEIGHT = 24
+HEADER_HEIGHT = 56
+SCROLLBAR_WIDTH = 12
+SCROLL_STEP = 120  # Pixels per mouse-wheel notch
+SCROLL_HALF_LIFE = 40  # Milliseconds for the view to cover half the way to its target
+PREFETCH_ROWS = 2  # Rows above and below the view whose thumbnails are requested
+LOADS_PER_FRAME = 6  # Finished thumbnails read from disk per frame, to keep frames even
+THUMB_SURFACE_BUDGET = 16 * 1024 * 1024  # Decoded thumbnails kept, about 180
+
+BROWSER_BG = (220, 220, 240)
+BROWSER_BORDER = (180, 180, 200)
+CELL_BG = (255, 255, 255)
+CELL_BORDER = (70, 70, 70)
+CELL_HOVER = (255, 182, 193)
+SCROLLBAR_BG = (200, 200, 220)
+SCROLLBAR_FG = (150, 150, 180)
+TEXT_COLOR = (70, 70, 70)
+
+class ImageBrowser:
+    """
+    Scrollable, virtualized grid of every image in ``library``. Clicking
+    one closes the browser and calls ``on_select(index)``; Escape or a
+    click outside closes it. The game calls ``handle_event`` for each
+    event (it returns True for events it used) and ``draw`` each frame.
+    """
+    def __init__(self, library, on_select, font, rect=BROWSER_RECT, cols=BROWSER_COLS):
+        self.library = library
+        self.on_select = on_select
+        self.font = font
+        self.rect = pygame.Rect(rect)
+        self.cols = cols
+        self.cell = THUMB_SIZE + CELL_GAP
+        self.row_height = THUMB_SIZE + LABEL_HEIGHT + CELL_GAP
+        grid_width = cols * self.cell - CELL_GAP
+        self.view = pygame.Rect(self.rect.x + (self.rect.width - SCROLLBAR_WIDTH - grid_width) // 2,
+                                self.rect.y + HEADER_HEIGHT, grid_width,
+                                self.rect.height - HEADER_HEIGHT - CELL_GAP)
+        self.bar = pygame.Rect(self.rect.right - SCROLLBAR_WIDTH - 8, self.view.y, SCROLLBAR_WIDTH, self.view.height)
+        self.visible = False
+        self.scroll = 0.0
+        self.target = 0.0
+        self.surfaces = TileCache(THUMB_SURFACE_BUDGET)  # Thumbnails and labels, keyed by file name
+        self._pending = {}  # index -> future of the thumbnail path
+        self._ready = {}  # index -> thumbnail path on disk, not read yet
+        self._failed = set()  # Names without a thumbnail (missing or unreadable files)
+        self._dragging_bar = None  # Grab offset inside the scrollbar thumb while dragging it
+        self._last_tick = 0
+
+    # ------------------ OPEN / CLOSE ---------------------------
+    def open(self):
+        self.visible = True
+        self._failed.clear()  # Files may have appeared since
+        self._last_tick = pygame.time.get_ticks()
+        self.target = self.scroll = min(self.scroll, self.max_scroll())
+
+    def close(self):
+        self.visible = False
+        self._dragging_bar = None
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+        self._ready.clear()
+
+    # ------------------ GEOMETRY -------------------------------
+    def rows(self):
+        return -(-len(self.library.filenames) // self.cols)
+
+    def max_scroll(self):
+        return max(0, self.rows() * self.row_height - CELL_GAP - self.view.height)
+
+    def visible_rows(self, margin=0):
+        """The rows in view as a range, widened by ``margin`` rows each way."""
+        first = int(self.scroll) // self.row_height
+        last = (int(self.scroll) + self.view.height) // self.row_height
+        return range(max(0, first - margin), min(self.rows(), last + 1 + margin))
+
+    def cell_rect(self, index):
+        """Screen rect of thumbnail ``index`` at the current scroll position."""
+        row, col = divmod(index, self.cols)
+        return pygame.Rect(self.view.x + col * self.cell, self.view.y + row * self.row_height - int(self.scroll),
+                           THUMB_SIZE, THUMB_SIZE)
+
+    def index_at(self, pos):
+        """Index of the thumbnail under ``pos``, or None."""
+        if not self.view.collidepoint(pos):
+            return None
+        x, y = pos[0] - self.view.x, pos[1] - self.view.y + int(self.scroll)
+        col, row = x // self.cell, y // self.row_height
+        if x % self.cell >= THUMB_SIZE or y % self.row_height >= THUMB_SIZE:
+            return None
+        index = row * self.cols + col
+        return index if index < len(self.library.filenames) else None
+
+    def _bar_thumb(self):
+        total = self.max_scroll() + self.view.height
+        height = max(30, self.bar.height * self.view.height // total)
+        travel = self.bar.height - height
+        y = self.bar.y + (travel * self.scroll / self.max_scroll() if self.max_scroll() else 0)
+        return pygame.Rect(self.bar.x, int(y), self.bar.width, height)
+
+    def scroll_to(self, target, smooth=True):
+        self.target = max(0.0, min(float(self.max_scroll()), target))
+        if not smooth:
+            self.scroll = self.target
+
+    # ------------------ EVENTS ---------------------------------
+    def handle_event(self, event):
+        """Handles ``event`` if the browser is open and it is input; True when it was used."""
+        if not self.visible:
+            return False
+        if event.type == pygame.MOUSEWHEEL:
+            self.scroll_to(self.target - event.y * SCROLL_STEP)
+        elif event.type == pygame.KEYDOWN:
+            page = self.view.height - self.row_height
+            if event.key == pygame.K_ESCAPE:
+                self.close()
+            elif event.key in (pygame.K_DOWN, pygame.K_UP):
+                self.scroll_to(self.target + (self.row_height if event.key == pygame.K_DOWN else -self.row_height))
+            elif event.key in (pygame.K_PAGEDOWN, pygame.K_PAGEUP):
+                self.scroll_to(self.target + (page if event.key == pygame.K_PAGEDOWN else -page))
+            elif event.key in (pygame.K_HOME, pygame.K_END):
+                self.scroll_to(0 if event.key == pygame.K_HOME else self.max_scroll())
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            if event.button != 1:
+                return True  # Wheel buttons and the rest do nothing here
+            if not self.rect.collidepoint(event.pos):
+                self.close()
+            elif self.bar.collidepoint(event.pos):
+                thumb = self._bar_thumb()
+                if not thumb.collidepoint(event.pos):  # Jump so the thumb centres on the click
+                    self._drag_bar_to(event.pos[1] - thumb.height // 2)
+                    thumb = self._bar_thumb()
+                self._dragging_bar = event.pos[1] - thumb.y
+            else:
+                index = self.index_at(event.pos)
+                if index is not None:
+                    self.close()
+                    self.on_select(index)
+        elif event.type == pygame.MOUSEBUTTONUP:
+            self._dragging_bar = None
+        elif event.type == pygame.MOUSEMOTION:
+            if self._dragging_bar is not None:
+                self._drag_bar_to(event.pos[1] - self._dragging_bar)
+        elif event.type not in (pygame.KEYUP, pygame.TEXTINPUT):
+            return False
+        return True
+
+    def _drag_bar_to(self, thumb_y):
+        travel = self.bar.height - self._bar_thumb().height
+        if travel > 0:
+            self.scroll_to((thumb_y - self.bar.y) / travel * self.max_scroll(), smooth=False)
+
+    # ------------------ THUMBNAILS -----------------------------
+    def _thumbnail(self, index, loads):
+        """
+        The thumbnail surface for ``index``, or None while it is still
+        being made; ``loads`` counts the disk reads left this frame.
+        """
+        filename = self.library.filenames[index]
+        surface = self.surfaces.get(filename)
+        if surface is not None or filename in self._failed:
+            return surface
+        path = self._ready.get(index)
+        if path is None:
+            future = self._pending.get(index)
+            if future is None:
+                image_path = os.path.join(self.library.directory, filename)
+                path = shared_thumbnails().cached(image_path)
+                if path is None:
+                    if not os.path.exists(image_path):
+                        self._failed.add(filename)
+                    else:
+                        self._pending[index] = shared_thumbnails().request(image_path)
+                    return None
+            elif future.done():
+                del self._pending[index]
+                try:
+                    path = future.result()
+                except Exception as e:
+                    print(f"Thumbnail error: {e}")
+                    self._failed.add(filename)
+                    return None
+            else:
+                return None
+            self._ready[index] = path
+        if not loads:
+            return None
+        loads.pop()
+        del self._ready[index]
+        try:
+            surface = pygame.image.load(path)
+        except (pygame.error, OSError) as e:
+            print(f"Thumbnail error: {e}")
+            self._failed.add(filename)
+            return None
+        surface = surface.convert() if pygame.display.get_surface() is not None else surface
+        self.surfaces.put(filename, surface)
+        return surface
+
+    def _label(self, filename):
+        key = ("label", filename)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.font.render(os.path.splitext(filename)[0][:14], True, TEXT_COLOR)
+            self.surfaces.put(key, surface)
+        return surface
+
+    def _cancel_far_requests(self, near):
+        for index in [i for i in self._pending if i // self.cols not in near]:
+            self._pending.pop(index).cancel()
+        for index in [i for i in self._ready if i // self.cols not in near]:
+            del self._ready[index]
+
+    # ------------------ DRAW -----------------------------------
+    def draw(self, screen):
+        """Eases the scroll toward its target and draws the rows in view."""
+        if not self.visible:
+            return
+        now = pygame.time.get_ticks()
+        elapsed, self._last_tick = now - self._last_tick, now
+        if abs(self.target - self.scroll) < 0.5:
+            self.scroll = self.target
+        else:
+            self.scroll += (self.target - self.scroll) * (1 - 0.5 ** (elapsed / SCROLL_HALF_LIFE))
+
+        pygame.draw.rect(screen, BROWSER_BG, self.rect, border_radius=15)
+        pygame.draw.rect(screen, BROWSER_BORDER, self.rect, 2, border_radius=15)
+        title = self.font.render(f"Select Image  ({len(self.library.filenames)})", True, TEXT_COLOR)
+        screen.blit(title, (self.rect.centerx - title.get_width() // 2,
+                            self.rect.y + (HEADER_HEIGHT - title.get_height()) // 2))
+
+        old_clip = screen.get_clip()
+        screen.set_clip(self.view.clip(old_clip))
+        hover = self.index_at(pygame.mouse.get_pos())
+        loads = [None] * LOADS_PER_FRAME
+        count = len(self.library.filenames)
+        visible = self.visible_rows()
+        for row in visible:
+            for index in range(row * self.cols, min(count, (row + 1) * self.cols)):
+                rect = self.cell_rect(index)
+                thumb = self._thumbnail(index, loads)
+                if thumb is None:
+                    pygame.draw.rect(screen, CELL_BG, rect)
+                else:
+                    screen.blit(thumb, rect)
+                pygame.draw.rect(screen, CELL_HOVER if index == hover else CELL_BORDER, rect, 2)
+                label = self._label(self.library.filenames[index])
+                screen.blit(label, (rect.centerx - label.get_width() // 2, rect.bottom + 2))
+        screen.set_clip(old_clip)
+
+        # Requested just outside the view too, so slow scrolling never shows blanks
+        near = self.visible_rows(PREFETCH_ROWS)
+        for row in near:
+            if row not in visible:
+                for index in range(row * self.cols, min(count, (row + 1) * self.cols)):
+                    self._thumbnail(index, [])
+        self._cancel_far_requests(near)
+
+        if self.max_scroll():
+            pygame.draw.rect(screen, SCROLLBAR_BG, self.bar, border_radius=6)
+            pygame.draw.rect(screen, SCROLLBAR_FG, self._bar_thumb(), border_radius=6)
+
+# ------------------ FILE DIALOG ----------------------------
+_tk_root = None
+
+def tk_root():
+    """
+    A hidden Tk root for native dialogs, created the first time one is
+    needed so starting a game does not load Tk.
+    """
+    global _tk_root
+    if _tk_root is None:
+        import tkinter as tk
+        _tk_root = tk.Tk()
+        _tk_root.withdraw()
+    return _tk_root
+
+def ask_image_path():
+    """Asks for an image file with the native dialog; an empty string if cancelled."""
+    from tkinter import filedialog
+
+    tk_root()
+    return filedialog.askopenfilename(
+        title="Select an image",
+        filetypes=[("Image files", "*.jpg *.jpeg *.png")]
+    )
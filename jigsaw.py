@@ -1,11 +1,20 @@
 import pygame
 import os
+import sys
 import random
-import math
+import itertools
 from pygame.locals import *
-import tkinter as tk
-from tkinter import filedialog, messagebox
-from PIL import Image, ImageTk
+from image_library import IMAGE_DIR, shared_library
+from asset_bundle import load_sound
+from image_picker import ImageBrowser, ask_image_path, tk_root
+from jigsaw_pieces import THUMB_SIZE, PieceCutter, create_jigsaw_pieces, new_seed, take_prepared_pieces, zoom_mask
+from jigsaw_carousel import CarouselStrip
+from spatial_grid import SpatialGrid
+from piece_groups import PieceGroups, turn_rect
+from jigsaw_save import AUTOSAVE_INTERVAL, Autosaver, load_save, take_snapshot
+from tile_pyramid import TileCache, find_original, open_pyramid_async
+from upload_pipeline import UPLOAD_DONE, draw_upload_progress, start_upload
+from scene import Scene, shared_screen
 
 # Initialize pygame
 pygame.init()
@@ -22,11 +31,19 @@ SCREEN_HEIGHT = PUZZLE_AREA_HEIGHT + CAROUSEL_HEIGHT
 
 
 PIECE_SIZE = 100  # Base size for jigsaw pieces
+# Piece count -> (rows, cols) of the cut; cycled from the settings panel
+PIECE_GRIDS = {16: (4, 4), 64: (8, 8), 100: (10, 10), 256: (16, 16),
+               500: (20, 25), 1000: (25, 40), 2000: (40, 50)}
+SNAP_DISTANCE = 50  # Largest snap distance, in pixels; small pieces use half their size
+BOARD_RECT = pygame.Rect(0, 0, 600, 550)  # Where pieces can be dropped (above the carousel)
+BOARD_AREA = pygame.Rect(0, 0, 600, 600)  # What the board draws; the carousel overlaps its bottom
+BOARD_BG = (240, 240, 240)
+GROUP_CELL = 100  # Cell size of the board index; groups grow far larger than one piece
+ZOOM_LEVELS = (1, 2, 4, 8)  # Board magnifications, cycled with the wheel or +/-
+ZOOM_CACHE_BUDGET = 64 * 1024 * 1024  # Magnified piece images kept between frames
 FPS = 60
 MAX_VISIBLE_IMAGES = 5
-POPUP_COLS = 3
 # --- Carousel layout ---
-THUMB_SIZE   = 70          # size of one thumbnail
 THUMB_GAP    = 10          # gap between thumbnails
 STEP         = THUMB_SIZE + THUMB_GAP
 
@@ -64,23 +81,53 @@ def safe_load_fonts():
 
 title_font, header_font, button_font, info_font, show_more, emoji_font = safe_load_fonts()
 
-# Screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Jigsaw Puzzle")
+# Screen (the launcher's window when started from the menu)
+screen = shared_screen()
 clock = pygame.time.Clock()
 
 # Game state
-image_data = []
+image_library = shared_library()
 current_image_idx = -1
 original_image = None
-pieces = []
-placed_pieces = []  # Pieces placed on the puzzle board
-carousel_pieces = []  # Pieces in the carousel
-selected_piece = None
-offset_x, offset_y = 0, 0
+pieces = []  # Every piece of the current puzzle, indexed by piece id
+placed = bytearray()  # placed[id] is 1 once that piece is on the board
+carousel_pieces = []  # Pieces in the carousel, in slot order
+highlight_surfaces = {}  # Piece size -> translucent "correct" overlay
+selected_piece = None  # Piece being dragged out of the carousel
+dragged_group = None  # Root of the group being dragged on the board
+drag_start = None  # (offset, turn) of the dragged group when it was picked up
+offset_x, offset_y = 0, 0  # Grab point inside the dragged piece or group
+board_layer = None  # The board with every group except the dragged one, kept between frames
+board_background = None  # The empty board, for repainting parts of board_layer
+board_damage = []  # Rects of board_layer changed since the screen last showed it
+board_on_screen = False  # The screen's board area holds board_layer plus the last overlay
+overlay_rect = None  # Board area covered by last frame's drag overlay
+drag_surface = None  # The dragged group composited once when it is picked up
+view_zoom = 1  # Board magnification, one of ZOOM_LEVELS
+view_px, view_py = 0, 0  # Top-left of the view in magnified board pixels
+view_layer = None  # board_layer's counterpart at view_zoom, screen-sized
+view_key = None  # (zoom, x, y) view_layer was painted for
+zoomed_pieces = TileCache(ZOOM_CACHE_BUDGET)  # (id, zoom) -> magnified piece image
+pyramid = None  # Full-resolution tile pyramid of the current image, once built
+pyramid_future = None  # Pending open_pyramid_async for pyramid_name
+pyramid_name = None
 show_preview = False
 show_settings = False
 carousel_scroll = 0
+piece_count = 16
+rotate_pieces = False  # Harder mode: pieces arrive turned and must be turned back
+piece_turns = bytearray()  # piece_turns[id]: quarter turns of a piece in the carousel
+home_index = SpatialGrid(PIECE_SIZE)  # Image rect of every piece at home, keyed by id
+board_groups = PieceGroups()  # Pieces on the board, joined into groups
+board_index = SpatialGrid(GROUP_CELL)  # Outline of every group where it lies, keyed by root
+cutter = PieceCutter()  # Cuts in worker processes; pieces arrive over several frames
+cut_seed = None  # Seed of the current cut, so a save can cut the same pieces again
+resume_state = None  # JigsawSave whose board is rebuilt as its pieces arrive
+resume_roots = {}  # Saved group index -> a piece of it already back on the board
+autosaver = Autosaver()
+unsaved = False  # The board changed since the last autosave
+last_autosave = 0
+carousel_strip = CarouselStrip(THUMB_SIZE, THUMB_GAP, CAROUSEL_BG, (100, 100, 100))
 sound_settings = {
     'piece_sound': True,
     'background_music': False,
@@ -89,109 +136,99 @@ sound_settings = {
 game_time = 0  # Timer for the game
 
 # Sounds
-correct_piece_sound = pygame.mixer.Sound("assets/sounds/right.mp3")
-win_sound = pygame.mixer.Sound("assets/sounds/winning.mp3")  # Load winning sound
+correct_piece_sound = load_sound("assets/sounds/right.mp3")
+win_sound = load_sound("assets/sounds/winning.mp3")  # Load winning sound
 win_sound_played = False  # Flag to prevent win sound from repeating
-piece_sound = pygame.mixer.Sound("assets/sounds/right.mp3")
-
-def load_images():
-    try:
-        image_files = [f for f in os.listdir("assets/images") if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
-    except FileNotFoundError:
-        image_files = []
-    images = []
-    for file in image_files:
-        try:
-            img = pygame.image.load(os.path.join("assets/images", file))
-            img = pygame.transform.scale(img, (600, 600))
-            images.append((file, img))
-        except:
-            print(f"Failed to load: {file}")
-    if not images:
-        fallback = pygame.Surface((600, 600))
-        fallback.fill(ACCENT_2)
-        pygame.draw.rect(fallback, TILE_BG, (50, 50, 500, 500))
-        images.append(("fallback.png", fallback))
-    return images
+piece_sound = load_sound("assets/sounds/right.mp3")
 
 def upload_image():
-    file_path = filedialog.askopenfilename(
-        title="Select an image",
-        filetypes=[("Image files", "*.jpg *.jpeg *.png")]
-    )
+    """Asks for an image and hands it to the background upload pipeline."""
+    file_path = ask_image_path()
     if file_path:
-        try:
-            next_num = len(image_data) + 1
-            ext = os.path.splitext(file_path)[1].lower()
-            if ext not in ['.jpg', '.jpeg', '.png']:
-                ext = '.jpg'
-            new_filename = f"image{next_num}{ext}"
-            new_path = os.path.join("assets/images", new_filename)
-            
-            # Use PIL to resize and save the image
-            pil_img = Image.open(file_path)
-            pil_img = pil_img.resize((600, 600))
-            pil_img.save(new_path)
-            
-            img = pygame.image.load(new_path)
-            return (new_filename, img)
-        except Exception as e:
-            print(f"Failed to load/copy uploaded image: {e}")
-    return None
-
-def create_jigsaw_pieces(image):
-    pieces = []
-    rows = 4
-    cols = 4
-    piece_width = image.get_width() // cols
-    piece_height = image.get_height() // rows
-    
-    for row in range(rows):
-        for col in range(cols):
-            piece_rect = pygame.Rect(col * piece_width, row * piece_height, piece_width, piece_height)
-            piece = image.subsurface(piece_rect).copy()
-            
-            # Ensure pieces are shown properly
-            piece.set_colorkey((0, 0, 0))  # Set black as transparent
-
-            if row > 0 or col > 0:  # Skip first piece (top-left corner)
-                if random.random() > 0.5 and col > 0:
-                    tab_pos = random.randint(int(piece_height*0.2), int(piece_height*0.8))
-                    pygame.draw.circle(piece, (0, 0, 0), (0, tab_pos), 15)
-                if random.random() > 0.5 and row > 0:
-                    tab_pos = random.randint(int(piece_width*0.2), int(piece_width*0.8))
-                    pygame.draw.circle(piece, (0, 0, 0), (tab_pos, 0), 15)
-            
-            piece_info = {
-                'image': piece,
-                'rect': pygame.Rect(0, 0, piece_width, piece_height),
-                'target_pos': (col * piece_width, row * piece_height),
-                'current_pos': (0, 0),
-                'size': (piece_width, piece_height),
-                'correct': False,
-                'id': row * cols + col
-            }
-            pieces.append(piece_info)
-    
-    return pieces
-
-def reset_game():
-    global pieces, placed_pieces, carousel_pieces, selected_piece, carousel_scroll, game_time, win_sound_played, start_time    
+        start_upload(file_path)
+
+def reset_game(save=None):
+    """Starts a new puzzle from the current image, or the one in ``save`` where it left off."""
+    global game_time, win_sound_played, start_time, cut_seed, unsaved
     win_sound_played = False
     game_time = 0  # Reset timer to 0
     start_time = pygame.time.get_ticks()      # <─ restart the timer
+    if save:
+        start_time -= save.elapsed_ms
 
     if original_image:
-        all_pieces = create_jigsaw_pieces(original_image)
-        carousel_pieces = all_pieces.copy()
-        placed_pieces = []
-        
-        for i, piece in enumerate(carousel_pieces):
-            piece['current_pos'] = (50 + i * 110, SCREEN_HEIGHT - 120)
-            piece['display_size'] = (100, 100)
-        
-        selected_piece = None
-        carousel_scroll = 0
+        load_pyramid(image_library.filenames[current_image_idx])
+        rows, cols = PIECE_GRIDS[piece_count]
+        prepared = None if save else take_prepared_pieces(image_library.filenames[current_image_idx], rows, cols)
+        if prepared:
+            cutter.cancel()
+            cut_seed = prepared[0]
+            start_pieces(prepared[1])
+        else:
+            # The board is playable at once; receive_pieces fills the carousel
+            cut_seed = save.seed if save else new_seed()
+            start_pieces([], rows * cols, save)
+            cutter.start(original_image, rows, cols, cut_seed)
+        unsaved = not save
+
+def start_pieces(first_pieces, total=None, save=None):
+    """
+    Empties the board and carousel for a puzzle of ``total`` pieces
+    (default: all of ``first_pieces``) and adds ``first_pieces``. With
+    ``save``, arriving pieces go back where the save had them.
+    """
+    global pieces, placed, carousel_pieces, selected_piece, dragged_group, carousel_scroll, \
+           view_zoom, view_px, view_py, resume_state, piece_turns
+    total = len(first_pieces) if total is None else total
+    pieces = [None] * total  # Filled in by id as pieces are cut
+    placed = bytearray(total)
+    if save:
+        piece_turns = bytearray(save.turns)
+    elif rotate_pieces:
+        piece_turns = bytearray(random.Random(cut_seed).choices(range(4), k=total))
+    else:
+        piece_turns = bytearray(total)
+    carousel_pieces = []
+    carousel_strip.reset(())
+    selected_piece = None
+    dragged_group = None
+    carousel_scroll = 0
+    view_zoom, view_px, view_py = 1, 0, 0
+    zoomed_pieces.clear()
+    home_index.clear()
+    board_groups.clear()
+    board_index.clear()
+    resume_state = save
+    resume_roots.clear()
+    repaint_board()
+    add_pieces(first_pieces)
+
+def add_pieces(new_pieces):
+    """Appends freshly cut pieces to the carousel, none placed yet."""
+    if new_pieces and not home_index:
+        home_index.cell_size = max(new_pieces[0].image.get_size())
+    for piece in new_pieces:
+        pieces[piece.id] = piece
+        home_index.insert(piece.id, piece.image.get_rect(topleft=piece.target_pos))
+    if resume_state is not None:
+        new_pieces = restore_pieces(new_pieces)
+    carousel_pieces.extend(new_pieces)
+    carousel_strip.extend(piece.turned(piece_turns[piece.id])[1] for piece in new_pieces)
+
+def receive_pieces():
+    """Adds the next batch from the cutter, if one is ready; called once per frame."""
+    global resume_state
+    if not cutter.done:
+        add_pieces(cutter.poll())
+        if cutter.done and resume_state is not None:
+            resume_state = None
+            repaint_board()
+    if pyramid_future is not None and pyramid_future.done():
+        receive_pyramid()
+
+def next_piece_count():
+    counts = sorted(PIECE_GRIDS)
+    return counts[(counts.index(piece_count) + 1) % len(counts)]
 
 def draw_button(rect, color, text, text_color=TEXT_COLOR, border_radius=10):
     pygame.draw.rect(screen, color, rect, border_radius=border_radius)
@@ -209,21 +246,8 @@ def draw_carousel():
     pygame.draw.rect(screen, CAROUSEL_BG, carousel_rect)
     pygame.draw.rect(screen, (180, 180, 180), carousel_rect, 2)
 
-    piece_thumb_size = 70                                    # smaller thumbnails
-    gap = 10
-    for i, piece in enumerate(carousel_pieces):
-        if piece in placed_pieces:
-            continue
-        x_pos = gap + i * (piece_thumb_size + gap) - carousel_scroll
-        if -piece_thumb_size < x_pos < PUZZLE_AREA_WIDTH:
-            thumb = pygame.transform.scale(piece['image'],
-                                           (piece_thumb_size, piece_thumb_size))
-            screen.blit(thumb, (x_pos, CAROUSEL_Y + 10))
-            border = pygame.Rect(x_pos, CAROUSEL_Y + 10,
-                                 piece_thumb_size, piece_thumb_size)
-            pygame.draw.rect(screen, (100, 100, 100), border, 2)
-            piece['current_pos'] = (x_pos, CAROUSEL_Y + 10)
-            piece['display_size'] = (piece_thumb_size, piece_thumb_size)
+    # Thumbnails are pre-composited; scrolling only moves the blit offset
+    carousel_strip.draw(screen, (0, CAROUSEL_Y + 10), PUZZLE_AREA_WIDTH, carousel_scroll)
 
     # --- Arrow buttons inside the carousel ---
     btn_size = 30
@@ -237,6 +261,7 @@ def draw_carousel():
                             btn.centery - label.get_height()//2))
 
 def draw_puzzle():
+    global board_on_screen, overlay_rect
     if show_preview:
         screen.blit(original_image, (0, 0))
         overlay = pygame.Surface((600, 600), pygame.SRCALPHA)
@@ -245,149 +270,523 @@ def draw_puzzle():
 
         preview_text = header_font.render("Preview Mode", True, TEXT_COLOR)
         screen.blit(preview_text, (300 - preview_text.get_width()//2, 300))
+        board_on_screen = False
+        return
+
+    # Placed groups live on board_layer (view_layer when zoomed). Each
+    # frame only restores what the layer or last frame's overlay changed,
+    # then draws the overlay, so dragging costs the same however many
+    # pieces are on the board.
+    if board_layer is None:
+        repaint_board()
+    if view_zoom == 1:
+        layer, damage = board_layer, board_damage
+    else:
+        damage = update_view_layer()
+        layer = view_layer
+    if not board_on_screen:
+        screen.blit(layer, BOARD_AREA)
+    else:
+        for rect in damage + ([overlay_rect] if overlay_rect else []):
+            screen.blit(layer, rect, rect)
+    board_damage.clear()
+    board_on_screen = True
+    overlay_rect = None
+
+    if dragged_group is not None:
+        rect = board_groups.rect(dragged_group)
+        old_clip = screen.get_clip()
+        screen.set_clip(BOARD_AREA.clip(old_clip))
+        if view_zoom == 1:
+            screen.blit(drag_surface, rect)
+        else:
+            # Only the visible pieces, magnified; the whole group could be
+            # many times the window's size
+            draw_group(screen, dragged_group, board_rect(BOARD_AREA), view_zoom, (view_px, view_py))
+            rect = view_rect(rect)
+        pygame.draw.rect(screen, (200, 200, 0), rect, 2)
+        screen.set_clip(old_clip)
+        overlay_rect = rect.clip(BOARD_AREA)
+
+    if selected_piece and not placed[selected_piece.id]:
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        turn = piece_turns[selected_piece.id]
+        if view_zoom == 1:
+            image = selected_piece.turned(turn)[0]
+        else:
+            image = zoomed_piece(selected_piece, view_zoom, turn)
+        border_rect = image.get_rect(
+            topleft=(mouse_x - offset_x * view_zoom, mouse_y - offset_y * view_zoom)
+        )
+        screen.blit(image, border_rect)
+        pygame.draw.rect(screen, (200, 200, 0), border_rect, 2)
+        overlay_rect = border_rect.clip(BOARD_AREA)
+
+def draw_group(surface, root, rect=None, zoom=1, origin=(0, 0)):
+    """
+    Blits group ``root`` onto a board-sized ``surface`` where it lies;
+    with ``rect`` (in board pixels), only the pieces reaching into it.
+    At ``zoom`` > 1 the surface is a view whose top-left is ``origin``
+    in magnified board pixels.
+    """
+    ids = board_groups.members[root]
+    if rect is not None and not rect.contains(board_groups.rect(root)):
+        local = turn_rect(rect.move([-v for v in board_groups.offset[root]]), -board_groups.turn[root])
+        cell = home_index.cell_size
+        if len(ids) <= (local.width // cell + 1) * (local.height // cell + 1):
+            # Fewer pieces in the group than index cells under the rect
+            rects = home_index.rects
+            ids = [id for id in ids if rects[id].colliderect(local)]
+        else:
+            find = board_groups.find
+            ids = [id for id in home_index.in_rect(local) if placed[id] and find(id) == root]
+    # In id order: neighbours' soft edges overlap, so the order shows
+    members = [pieces[id] for id in sorted(ids)]
+    turn = board_groups.turn[root]
+    at_home = turn == 0 and board_groups.offset[root] == [0, 0]
+    if zoom == 1:
+        if turn == 0:
+            ox, oy = board_groups.offset[root]
+            if at_home:
+                surface.blits([(highlight_surface(piece.size), piece.rect) for piece in members], False)
+            surface.blits([(piece.image, (piece.target_pos[0] + ox, piece.target_pos[1] + oy))
+                           for piece in members], False)
+        else:
+            place = board_groups.place
+            surface.blits([(piece.turned(turn)[0], place(root, home_index.rects[piece.id]))
+                           for piece in members], False)
+        return
+    if at_home:
+        surface.blits([(highlight_surface((piece.size[0] * zoom, piece.size[1] * zoom)),
+                        (piece.rect.x * zoom - origin[0], piece.rect.y * zoom - origin[1])) for piece in members], False)
+    place = board_groups.place
+    blits = []
+    for piece in members:
+        x, y = place(root, home_index.rects[piece.id]).topleft
+        blits.append((zoomed_piece(piece, zoom, turn), (x * zoom - origin[0], y * zoom - origin[1])))
+    surface.blits(blits, False)
+
+# ------------------ BOARD LAYER ----------------------------
+def repaint_board(rect=BOARD_AREA):
+    """
+    Redraws ``rect`` of board_layer: background, picture outline, then
+    every group over it except the dragged one, bottom first. Called
+    only when groups are placed, picked up or dropped.
+    """
+    global board_layer, board_background
+    if board_layer is None:
+        board_background = pygame.Surface(BOARD_AREA.size)
+        if pygame.display.get_surface() is not None:
+            board_background = board_background.convert()
+        board_background.fill(BOARD_BG)
+        # Outline of the finished picture; groups at home snap inside it
+        pygame.draw.rect(board_background, (200, 200, 200), BOARD_AREA, 2)
+        board_layer = board_background.copy()
+    rect = pygame.Rect(rect).clip(BOARD_AREA)
+    if not rect.width or not rect.height:
+        return
+    board_layer.set_clip(rect)
+    board_layer.blit(board_background, rect, rect)
+    roots = board_index.in_rect(rect)
+    roots.discard(dragged_group)
+    for root in sorted(roots, key=board_index.z.__getitem__):
+        draw_group(board_layer, root, rect)
+    board_layer.set_clip(None)
+    board_damage.append(rect)
+
+def group_surface(root):
+    """Group ``root`` composited onto one surface the size of its outline, turned as it lies."""
+    turn = board_groups.turn[root]
+    bounds = turn_rect(board_groups.bounds[root], turn)
+    surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+    surface.blits([(pieces[id].turned(turn)[0], turn_rect(home_index.rects[id], turn).move(-bounds.x, -bounds.y))
+                   for id in sorted(board_groups.members[root])], False)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface
+
+def invalidate_board():
+    """Something else drew over the board; the next frame redraws all of it."""
+    global board_on_screen
+    board_on_screen = False
+
+# ------------------ ZOOM -----------------------------------
+def to_board(pos):
+    """Board pixel under screen point ``pos``; the same point at zoom 1."""
+    return (view_px + pos[0]) // view_zoom, (view_py + pos[1]) // view_zoom
+
+def view_rect(rect):
+    """Screen rect showing board ``rect`` at the current zoom."""
+    return pygame.Rect(rect.x * view_zoom - view_px, rect.y * view_zoom - view_py,
+                       rect.width * view_zoom, rect.height * view_zoom)
+
+def board_rect(rect):
+    """Board pixels covering screen ``rect`` at the current zoom."""
+    left, top = to_board(rect.topleft)
+    right = -(-(view_px + rect.right) // view_zoom)
+    bottom = -(-(view_py + rect.bottom) // view_zoom)
+    return pygame.Rect(left, top, right - left, bottom - top)
+
+def set_zoom(zoom, anchor):
+    """Magnifies the board by ``zoom``, keeping the point under screen ``anchor`` still."""
+    global view_zoom
+    x = (view_px + anchor[0]) / view_zoom
+    y = (view_py + anchor[1]) / view_zoom
+    view_zoom = zoom
+    pan_view(anchor[0] - round(x * zoom) + view_px, anchor[1] - round(y * zoom) + view_py)
+
+def step_zoom(step, anchor):
+    index = ZOOM_LEVELS.index(view_zoom) + step
+    if 0 <= index < len(ZOOM_LEVELS):
+        set_zoom(ZOOM_LEVELS[index], anchor)
+
+def pan_view(dx, dy):
+    """Scrolls the magnified board by (dx, dy) screen pixels, kept inside the board."""
+    global view_px, view_py
+    limit_x = BOARD_AREA.width * (view_zoom - 1)
+    limit_y = BOARD_AREA.height * (view_zoom - 1)
+    view_px = max(0, min(limit_x, view_px - dx))
+    view_py = max(0, min(limit_y, view_py - dy))
+    invalidate_board()
+
+def update_view_layer():
+    """
+    Brings view_layer up to date and returns the screen rects it changed:
+    all of it when the view moved, otherwise board_layer's damage seen
+    through the view.
+    """
+    global view_layer, view_key
+    key = (view_zoom, view_px, view_py)
+    if view_layer is None or view_key != key:
+        if view_layer is None:
+            view_layer = pygame.Surface(BOARD_AREA.size)
+            if pygame.display.get_surface() is not None:
+                view_layer = view_layer.convert()
+        view_key = key
+        repaint_view(BOARD_AREA)
+        return [BOARD_AREA]
+    changed = []
+    for rect in board_damage:
+        rect = view_rect(rect).clip(BOARD_AREA)
+        if rect.width and rect.height:
+            repaint_view(rect)
+            changed.append(rect)
+    return changed
+
+def repaint_view(rect):
+    """repaint_board for view_layer: redraws screen ``rect`` at the current zoom."""
+    view_layer.set_clip(rect)
+    view_layer.fill(BOARD_BG, rect)
+    outline = view_rect(BOARD_AREA)
+    for edge in ((outline.x, outline.y, outline.width, 2), (outline.x, outline.bottom - 2, outline.width, 2),
+                 (outline.x, outline.y, 2, outline.height), (outline.right - 2, outline.y, 2, outline.height)):
+        view_layer.fill((200, 200, 200), edge)
+    area = board_rect(rect)
+    roots = board_index.in_rect(area)
+    roots.discard(dragged_group)
+    for root in sorted(roots, key=board_index.z.__getitem__):
+        draw_group(view_layer, root, area, view_zoom, (view_px, view_py))
+    view_layer.set_clip(None)
+
+def zoomed_piece(piece, zoom, turn=0):
+    """
+    ``piece`` magnified ``zoom`` times and turned ``turn`` quarter turns,
+    kept in an LRU. Once the image's tile pyramid is ready the pixels come
+    from the full-resolution photo, decoding only the tiles under the
+    piece; the piece's own image only supplies the outline.
+    """
+    key = (piece.id, zoom, turn)
+    image = zoomed_pieces.get(key)
+    if image is not None:
+        return image
+    if turn:
+        image = pygame.transform.rotate(zoomed_piece(piece, zoom), -90 * turn)
+        zoomed_pieces.put(key, image)
+        return image
+    width, height = piece.image.get_size()
+    size = (width * zoom, height * zoom)
+    image = pygame.transform.smoothscale(piece.image, size)
+    if pyramid is not None:
+        sx = pyramid.width / original_image.get_width()
+        sy = pyramid.height / original_image.get_height()
+        x, y = piece.target_pos
+        image = pygame.Surface(size, pygame.SRCALPHA)
+        image.blit(pyramid.render((x * sx, y * sy, width * sx, height * sy), size), (0, 0))
+    pygame.surfarray.pixels_alpha(image)[:] = zoom_mask(piece.image, zoom)
+    if pygame.display.get_surface() is not None:
+        image = image.convert_alpha()
+    zoomed_pieces.put(key, image)
+    return image
+
+def load_pyramid(filename):
+    """Starts opening (or building) the tile pyramid of ``filename`` in the background."""
+    global pyramid, pyramid_future, pyramid_name
+    if filename == pyramid_name:
+        return
+    pyramid_name = filename
+    if pyramid is not None:
+        pyramid.close()
+    pyramid = None
+    if pyramid_future is not None:
+        # Still building for the previous image; close it when it arrives
+        pyramid_future.add_done_callback(lambda f: f.exception() is None and f.result().close())
+    # Uploads keep their full-resolution original; other images are their own source
+    record = image_library.catalog.lookup(filename)
+    original = record and record[3] and find_original(record[3])
+    path = os.path.join(IMAGE_DIR, filename)
+    if original:
+        pyramid_future = open_pyramid_async(original, upright=True)
     else:
-        pygame.draw.rect(screen, (240, 240, 240), (0, 0, 600, 600))
-        
-        for piece in carousel_pieces:
-            if piece in placed_pieces:
+        pyramid_future = open_pyramid_async(path) if os.path.exists(path) else None
+
+def receive_pyramid():
+    """Switches magnified pieces over to the finished pyramid."""
+    global pyramid, pyramid_future, view_key
+    future, pyramid_future = pyramid_future, None
+    try:
+        pyramid = future.result()
+    except Exception as e:
+        print(f"Could not tile {pyramid_name}: {e}")
+        return
+    zoomed_pieces.clear()
+    view_key = None  # Repaint the view with the sharper pieces
+    invalidate_board()
+
+def highlight_surface(size):
+    """The "correct" overlay for pieces of ``size``, made once per size."""
+    surface = highlight_surfaces.get(size)
+    if surface is None:
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        surface.fill(CORRECT_COLOR)
+        highlight_surfaces[size] = surface
+    return surface
+
+def carousel_piece_at(pos):
+    """(piece, slot position) of the carousel thumbnail under ``pos``, or (None, None)."""
+    if not CAROUSEL_Y + 10 <= pos[1] < CAROUSEL_Y + 10 + THUMB_SIZE:
+        return None, None
+    index = carousel_strip.slot_at(pos[0], carousel_scroll)
+    if index is None:
+        return None, None
+    return carousel_pieces[index], (carousel_strip.slot_x(index, carousel_scroll), CAROUSEL_Y + 10)
+
+def place_piece(piece, pos):
+    """
+    Moves ``piece`` from the carousel onto the board, turned as it was
+    held, with its image's top-left at ``pos``; then joins it to
+    matching neighbours.
+    """
+    global carousel_scroll
+    if placed[piece.id]:
+        return
+    placed[piece.id] = 1
+    index = carousel_pieces.index(piece)  # Identity comparisons only
+    del carousel_pieces[index]
+    carousel_strip.remove(index)
+    carousel_scroll = min(carousel_scroll, carousel_strip.max_scroll(PUZZLE_AREA_WIDTH))
+    turn = piece_turns[piece.id]
+    turned = turn_rect(home_index.rects[piece.id], turn)
+    board_groups.add(piece.id, home_index.rects[piece.id], (pos[0] - turned.x, pos[1] - turned.y), turn)
+    board_index.insert(piece.id, board_groups.rect(piece.id))
+    return settle_group(piece.id)
+
+def snap_distance(piece):
+    return min(SNAP_DISTANCE, min(piece.size) // 2)
+
+def settle_group(root):
+    """
+    Called when a group is dropped: joins it to every neighbouring group
+    turned the same way and lying within the snap distance of its correct
+    relative position, then snaps it home if it is upright and that close
+    to its place in the picture. Returns the root of the resulting group.
+    """
+    global unsaved
+    unsaved = True
+    tolerance = snap_distance(pieces[root])
+    board_index.remove(root)
+    # (outline at home, board outline and z on board_layer or None) of
+    # every part of the result, to repaint only what appeared, moved or
+    # was raised
+    parts = [(board_groups.bounds[root], None, None)]
+    joined = False
+    for id in list(board_groups.members[root]):
+        for neighbour in pieces[id].neighbours:
+            if not placed[neighbour]:
                 continue
-                
-            slot_rect = pygame.Rect(
-                piece['target_pos'][0], piece['target_pos'][1],
-                piece['size'][0], piece['size'][1]
-            )
-            pygame.draw.rect(screen, (220, 220, 220), slot_rect)
-            pygame.draw.rect(screen, (180, 180, 180), slot_rect, 2)
-        
-        for piece in placed_pieces:
-            if piece['correct']:
-                highlight = pygame.Surface(piece['size'], pygame.SRCALPHA)
-                highlight.fill(CORRECT_COLOR)
-                screen.blit(highlight, piece['target_pos'])
-            
-            screen.blit(piece['image'], piece['target_pos'])
-            
-            border_color = (50, 200, 50) if piece['correct'] else (100, 100, 100)
-            border_rect = pygame.Rect(
-                piece['target_pos'][0], piece['target_pos'][1],
-                piece['size'][0], piece['size'][1]
-            )
-            pygame.draw.rect(screen, border_color, border_rect, 2)
-        
-        if selected_piece and selected_piece not in placed_pieces:
-            mouse_x, mouse_y = pygame.mouse.get_pos()
-            screen.blit(
-                selected_piece['image'],
-                (mouse_x - offset_x, mouse_y - offset_y)
-            )
-            border_rect = pygame.Rect(
-                mouse_x - offset_x, mouse_y - offset_y,
-                selected_piece['size'][0], selected_piece['size'][1]
-            )
-            pygame.draw.rect(screen, (200, 200, 0), border_rect, 2)
-
-def check_piece_position(piece, mouse_pos):
-    target_x, target_y = piece['target_pos']
-    piece_x, piece_y = mouse_pos[0] - offset_x, mouse_pos[1] - offset_y
-    distance = math.sqrt((target_x - piece_x)**2 + (target_y - piece_y)**2)
-
-    if distance < 50:
-        piece['correct'] = True
-        placed_pieces.append(piece)
-        if piece in carousel_pieces:
-            carousel_pieces.remove(piece)
+            other = board_groups.find(neighbour)
+            if other == root:
+                continue
+            (gx, gy), (nx, ny) = board_groups.offset[root], board_groups.offset[other]
+            if (board_groups.turn[root] == board_groups.turn[other]
+                    and abs(gx - nx) <= tolerance and abs(gy - ny) <= tolerance):
+                parts.append((board_groups.bounds[other], board_index.rects[other], board_index.z[other]))
+                board_index.remove(other)
+                # The first neighbour stays put and the dropped group lines
+                # up with it; further groups then line up with the result
+                root = board_groups.union(root, other) if joined else board_groups.union(other, root)
+                joined = True
+
+    offset = board_groups.offset[root]
+    at_home = board_groups.turn[root] == 0 and abs(offset[0]) <= tolerance and abs(offset[1]) <= tolerance
+    if at_home or is_puzzle_complete():
+        offset[0] = offset[1] = 0
+    board_index.insert(root, board_groups.rect(root))
+    for bounds, old, z in parts:
+        rect = board_groups.place(root, bounds)
+        if old != rect:
+            if old is not None:
+                repaint_board(old)
+            repaint_board(rect)
+        else:
+            # Same place but now on top: only overlaps with groups that
+            # used to be above it look different
+            for other in board_index.in_rect(rect):
+                if other != root and board_index.z[other] > z:
+                    repaint_board(rect.clip(board_index.rects[other]))
+
+    if joined or at_home:
         if piece_sound and sound_settings['piece_sound']:
             piece_sound.play()
         if sound_settings['piece_sound']:  # Play the correct sound
             correct_piece_sound.play()
-        return True
-    return False
-
-
-
-def select_image(index, image_list, popup):
-    global current_image_idx, original_image
-    current_image_idx = index
-    original_image = image_list[current_image_idx][1]
-    reset_game()
-    popup.destroy()
+    return root
+
+def group_hit(root, pos):
+    """True if a pixel of a piece in group ``root`` is under ``pos``."""
+    # Tested against the upright masks at the matching home pixel
+    local = board_groups.to_home(root, pos)
+    return any(placed[id] and board_groups.find(id) == root and pieces[id].hit(local, pieces[id].target_pos)
+               for id in home_index.at_point(local))
+
+def group_at(pos):
+    """Root of the topmost group with a piece under ``pos``, or None."""
+    return board_index.topmost_at(pos, hit=group_hit)
+
+def pick_up_group(root, mouse_pos):
+    """Starts dragging ``root``: lifts it off board_layer into its own surface."""
+    global dragged_group, drag_start, drag_surface, offset_x, offset_y
+    dragged_group = root
+    drag_start = (list(board_groups.offset[root]), board_groups.turn[root])
+    offset_x, offset_y = mouse_pos[0] - drag_start[0][0], mouse_pos[1] - drag_start[0][1]
+    board_index.raise_to_top(root)
+    drag_surface = group_surface(root)
+    repaint_board(board_index.rects[root])
+
+def drop_group(mouse_pos):
+    """Ends the drag: settles the group where it is, or puts it back if dropped off the board."""
+    global dragged_group, drag_surface
+    root, dragged_group, drag_surface = dragged_group, None, None
+    if BOARD_RECT.collidepoint(mouse_pos):
+        settle_group(root)
+    else:
+        board_groups.offset[root], board_groups.turn[root] = drag_start
+        repaint_board(board_index.rects[root])
+
+def rotate_held(mouse_pos):
+    """Turns the piece or group being dragged a quarter turn clockwise under the pointer."""
+    global drag_surface, offset_x, offset_y
+    if dragged_group is not None:
+        pivot = to_board(mouse_pos)
+        board_groups.rotate(dragged_group, pivot)
+        drag_surface = group_surface(dragged_group)
+        offset_x = pivot[0] - board_groups.offset[dragged_group][0]
+        offset_y = pivot[1] - board_groups.offset[dragged_group][1]
+    elif selected_piece is not None:
+        turn = piece_turns[selected_piece.id] = (piece_turns[selected_piece.id] + 1) % 4
+        image, thumb = selected_piece.turned(turn)
+        offset_x, offset_y = image.get_width() // 2, image.get_height() // 2  # Still held by the centre
+        carousel_strip.replace(carousel_pieces.index(selected_piece), thumb)
+
+def rotate_group_at(mouse_pos):
+    """Right-click on the board: turns the group under the pointer about that point."""
+    pos = to_board(mouse_pos)
+    root = group_at(pos)
+    if root is not None:
+        pick_up_group(root, pos)
+        rotate_held(mouse_pos)
+        drop_group(mouse_pos)
 
 def is_puzzle_complete():
-    return len(placed_pieces) == len(carousel_pieces) + len(placed_pieces)
+    """Every piece is on the board in one upright group (trivially true without pieces)."""
+    return not pieces or (placed[0] == 1 and board_groups.group_size(0) == len(pieces)
+                          and board_groups.turn[board_groups.find(0)] == 0)
+
+# ------------------ SAVE / RESUME --------------------------
+def restore_pieces(new_pieces):
+    """
+    Puts the pieces of ``new_pieces`` that resume_state had on the board
+    back into their groups, offsets, turns and stacking order, and returns the
+    rest for the carousel. The board is painted once, when the last batch
+    is in, which is a few frames after the start.
+    """
+    global dragged_group
+    groups, offsets, turns = resume_state.groups, resume_state.offsets, resume_state.turns
+    loose = []
+    for piece in new_pieces:
+        group = groups[piece.id]
+        if group < 0:
+            loose.append(piece)
+            continue
+        placed[piece.id] = 1
+        board_groups.add(piece.id, home_index.rects[piece.id], offsets[group], turns[piece.id])
+        other = resume_roots.get(group)
+        if other is None:
+            resume_roots[group] = root = piece.id
+        else:
+            old = board_groups.find(other)
+            root = board_groups.union(old, piece.id)
+            board_index.remove(old)
+            if old == dragged_group:
+                dragged_group = root  # Picked up before all of it was back
+        board_index.insert(root, board_groups.rect(root), group + 1)
+    return loose
+
+def save_progress():
+    """Hands a snapshot of the puzzle to the background autosaver."""
+    global unsaved, last_autosave
+    unsaved = False
+    last_autosave = pygame.time.get_ticks()
+    if not pieces or resume_state is not None:
+        return  # Nothing to save, or the saved board is not rebuilt yet
+    if is_puzzle_complete():
+        autosaver.delete()
+        return
+    rows, cols = PIECE_GRIDS[piece_count]
+    moving = {dragged_group: (tuple(drag_start[0]), drag_start[1])} if dragged_group is not None else None
+    autosaver.save(take_snapshot(image_library.filenames[current_image_idx], cut_seed, rows, cols,
+                                 pygame.time.get_ticks() - start_time, board_groups, board_index.z,
+                                 piece_turns, rotate_pieces, moving))
+
+def resume_saved_game():
+    """Continues the saved puzzle if its image is still in the library; True if it did."""
+    global current_image_idx, original_image, piece_count, rotate_pieces
+    save = load_save(autosaver.path)
+    if save is None or save.image not in image_library.filenames:
+        return False
+    if PIECE_GRIDS.get(save.rows * save.cols) != (save.rows, save.cols):
+        return False
+    current_image_idx = image_library.filenames.index(save.image)
+    original_image = image_library.load(current_image_idx)
+    piece_count = save.rows * save.cols
+    rotate_pieces = save.rotate
+    reset_game(save)
+    return True
 
 def show_instructions():
+    from tkinter import messagebox
+
+    tk_root()
     messagebox.showinfo("Instructions", "To play the game:\n- Click and drag the pieces to move them.\n- Place them in the correct position to complete the puzzle.\n- The timer tracks how long you've been playing.\n- Enjoy the game!")
 
 
 
-def show_image_popup():
-    popup = tk.Toplevel()
-    popup.title("Select Image")
-    popup.geometry("500x500")
-    popup.resizable(False, False)
-
-    # Center the popup on the main window
-    popup_width = 500
-    popup_height = 500
-    screen_width = popup.winfo_screenwidth()
-    screen_height = popup.winfo_screenheight()
-    x = (screen_width - popup_width) // 2
-    y = (screen_height - popup_height) // 2
-    popup.geometry(f"{popup_width}x{popup_height}+{x}+{y}")
-
-    # Scrollable frame
-    canvas = tk.Canvas(popup, highlightthickness=0)
-    scrollbar = tk.Scrollbar(popup, orient="vertical", command=canvas.yview)
-    scrollable_frame = tk.Frame(canvas)
-
-    scrollable_frame.bind(
-        "<Configure>",
-        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    THUMB_SIZE = 150
-    for idx, (filename, _) in enumerate(image_data):
-        col = idx % POPUP_COLS
-        if col == 0:
-            row_frame = tk.Frame(scrollable_frame)
-            row_frame.pack()
-
-        img_path = os.path.join("assets/images", filename)
-        try:
-            pil_img = Image.open(img_path).convert("RGBA")
-
-            # Fill square, keep aspect
-            pil_img.thumbnail((THUMB_SIZE, THUMB_SIZE), Image.LANCZOS)
-            square = Image.new("RGBA", (THUMB_SIZE, THUMB_SIZE), (255, 255, 255, 255))
-            offset = ((THUMB_SIZE - pil_img.width) // 2,
-                      (THUMB_SIZE - pil_img.height) // 2)
-            square.paste(pil_img, offset, pil_img)
-
-            photo = ImageTk.PhotoImage(square)
-
-            btn = tk.Label(row_frame, image=photo, bd=2, relief="solid")
-            btn.image = photo  # Keep reference
-            btn.grid(row=0, column=col, padx=5, pady=5)
-            btn.bind("<Button-1>", lambda e, i=idx: select_image(i))
-
-            label = tk.Label(row_frame, text=os.path.splitext(filename)[0][:10])
-            label.grid(row=1, column=col, padx=5, pady=5)
-        except Exception as e:
-            print(f"Thumbnail error for {filename}: {e}")
-
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
-
-    def select_image(idx):
-        global current_image_idx, original_image
-        current_image_idx = idx
-        original_image = image_data[current_image_idx][1]
-        reset_game()
-        popup.destroy()
+def select_image(index):
+    global current_image_idx, original_image
+    current_image_idx = index
+    original_image = image_library.load(current_image_idx)
+    reset_game()
 
-    popup.wait_window()
+image_browser = ImageBrowser(image_library, select_image, show_more)
 
 def draw_sidebar():
     sidebar = pygame.Rect(600, 0, 200, SCREEN_HEIGHT)
@@ -401,9 +800,9 @@ def draw_sidebar():
 
     y_offset = 105
     button_rects = []
-    visible_images = min(MAX_VISIBLE_IMAGES, len(image_data))
+    visible_images = min(MAX_VISIBLE_IMAGES, len(image_library))
     for i in range(visible_images):
-        filename, _ = image_data[i]
+        filename = image_library.filenames[i]
         btn_rect = pygame.Rect(610, y_offset, 180, 40)
         btn_color = HIGHLIGHT if i == current_image_idx else TILE_BG
         display_text = os.path.splitext(filename)[0][:12]
@@ -411,7 +810,7 @@ def draw_sidebar():
         button_rects.append(btn)
         y_offset += 50
 
-    if len(image_data) > MAX_VISIBLE_IMAGES:
+    if len(image_library) > MAX_VISIBLE_IMAGES:
         show_more_text = show_more.render("Show more", True, TEXT_COLOR)
         screen.blit(show_more_text, (660, y_offset + 5))
         show_more_btn = pygame.Rect(610, y_offset, 180, 45)
@@ -420,6 +819,7 @@ def draw_sidebar():
         show_more_btn = None
 
     upload_btn = draw_button(pygame.Rect(610, y_offset, 180, 45), ACCENT_3, "Upload Image")
+    draw_upload_progress(screen, show_more, upload_btn, TEXT_COLOR, ACCENT_3)
     y_offset += 50
 
     preview_btn = draw_button(pygame.Rect(610, y_offset, 180, 45), ACCENT_4, "Preview (P)")
@@ -431,23 +831,13 @@ def draw_sidebar():
     return button_rects, show_more_btn, upload_btn, preview_btn, reset_btn, settings_btn
 
 
-def run_jigsaw():
-    global image_data, current_image_idx, original_image, show_preview, \
+def main():
+    global current_image_idx, original_image, show_preview, \
            show_settings, selected_piece, offset_x, offset_y, carousel_scroll, \
-           game_time, win_sound_played, start_time
-    
-    start_time = pygame.time.get_ticks()   # <-- add this
-
-
-    if not image_data:
-        image_data = load_images()
-        if image_data:
-            current_image_idx = 0
-            original_image = image_data[current_image_idx][1]
-            reset_game()
+           game_time, win_sound_played, piece_count, rotate_pieces
 
     running = True
-    start_time = pygame.time.get_ticks()
+    held_button = 1  # Mouse button holding the piece or group; only its release drops it
 
     # --- Arrow-button rectangles (fixed positions) ---
     btn_size = 30
@@ -459,7 +849,11 @@ def run_jigsaw():
                                     btn_size, btn_size)
 
     while running:
-        screen.fill(BACKGROUND)
+        receive_pieces()
+        if unsaved and pygame.time.get_ticks() - last_autosave >= AUTOSAVE_INTERVAL:
+            save_progress()
+        # No fill: sidebar, board and carousel cover the window between
+        # them, and the board only repaints what changed
         elapsed = (pygame.time.get_ticks() - start_time) // 1000
         game_time = elapsed
         # 1. Sidebar (drawn first)
@@ -485,11 +879,18 @@ def run_jigsaw():
             screen.blit(title_text, (400 - title_text.get_width() // 2, 170))
 
             piece_btn = draw_button(
-                pygame.Rect(250, 220, 300, 50),
+                pygame.Rect(250, 215, 300, 45),
                 ACCENT_2 if sound_settings['piece_sound'] else TILE_BG,
                 "Piece Sound: ON" if sound_settings['piece_sound'] else "Piece Sound: OFF"
             )
-            quit_btn = draw_button(pygame.Rect(250, 280, 300, 50), ACCENT_4, "Quit Game")
+            count_btn = draw_button(pygame.Rect(250, 270, 300, 45), ACCENT_3, f"Pieces: {piece_count}")
+            rotate_btn = draw_button(
+                pygame.Rect(250, 325, 300, 45),
+                ACCENT_2 if rotate_pieces else TILE_BG,
+                "Rotation: ON" if rotate_pieces else "Rotation: OFF"
+            )
+            quit_btn = draw_button(pygame.Rect(250, 380, 300, 45), ACCENT_4, "Quit Game")
+            invalidate_board()
 
         # --- Win overlay ---
         if is_puzzle_complete():
@@ -504,17 +905,34 @@ def run_jigsaw():
             screen.blit(win_text, (300 - win_text.get_width() // 2,
                                    300 - win_text.get_height() // 2))
 
+            invalidate_board()
+
             if not win_sound_played and sound_settings['piece_sound']:
                 win_sound.play()
                 win_sound_played = True
 
+        # --- Image browser (if open) ---
+        if image_browser.visible:
+            image_browser.draw(screen)
+            invalidate_board()
+
         # ------------------------------------------------------------------
         # EVENT LOOP
         # ------------------------------------------------------------------
         for event in pygame.event.get():
+            if image_browser.handle_event(event):
+                continue
             if event.type == QUIT:
                 running = False
 
+            elif event.type == UPLOAD_DONE:
+                if event.surface is None:
+                    print(event.error)
+                else:
+                    current_image_idx = image_library.add(event.filename, event.surface)
+                    original_image = event.surface
+                    reset_game()
+
             elif event.type == KEYDOWN:
                 if event.key == K_p:
                     show_preview = not show_preview
@@ -523,10 +941,22 @@ def run_jigsaw():
                 elif event.key == K_LEFT:
                     carousel_scroll = max(0, carousel_scroll - STEP)
                 elif event.key == K_RIGHT:
-                    max_scroll = max(0, len(carousel_pieces) * STEP - PUZZLE_AREA_WIDTH)
-                    carousel_scroll = min(max_scroll, carousel_scroll + STEP)
+                    carousel_scroll = min(carousel_strip.max_scroll(PUZZLE_AREA_WIDTH), carousel_scroll + STEP)
                 elif event.key == K_h:
                     show_instructions()
+                elif event.key in (K_PLUS, K_EQUALS, K_KP_PLUS):
+                    step_zoom(1, BOARD_RECT.center)
+                elif event.key in (K_MINUS, K_KP_MINUS):
+                    step_zoom(-1, BOARD_RECT.center)
+                elif event.key == K_0:
+                    set_zoom(1, BOARD_RECT.center)
+                elif event.key == K_SPACE and rotate_pieces:
+                    rotate_held(pygame.mouse.get_pos())
+
+            elif event.type == MOUSEWHEEL:
+                mouse_pos = pygame.mouse.get_pos()
+                if event.y and not show_preview and BOARD_RECT.collidepoint(mouse_pos):
+                    step_zoom(1 if event.y > 0 else -1, mouse_pos)
 
             elif event.type == MOUSEBUTTONDOWN:
                 mouse_pos = pygame.mouse.get_pos()
@@ -535,17 +965,24 @@ def run_jigsaw():
                 if left_button_rect.collidepoint(mouse_pos):
                     carousel_scroll = max(0, carousel_scroll - STEP)
                 elif right_button_rect.collidepoint(mouse_pos):
-                    max_scroll = max(0, len(carousel_pieces) * STEP  - PUZZLE_AREA_WIDTH)
-                    carousel_scroll = min(max_scroll, carousel_scroll + STEP)
+                    carousel_scroll = min(carousel_strip.max_scroll(PUZZLE_AREA_WIDTH), carousel_scroll + STEP)
 
                 # Settings panel clicks
                 if show_settings:
                     if piece_btn.collidepoint(mouse_pos):
                         sound_settings['piece_sound'] = not sound_settings['piece_sound']
+                    elif count_btn.collidepoint(mouse_pos):
+                        piece_count = next_piece_count()
+                        reset_game()
+                    elif rotate_btn.collidepoint(mouse_pos):
+                        rotate_pieces = not rotate_pieces
+                        reset_game()
                     elif quit_btn.collidepoint(mouse_pos):
                         running = False
                     else:
                         show_settings = False
+                elif event.button == 3 and rotate_pieces and (selected_piece or dragged_group is not None):
+                    rotate_held(mouse_pos)
                 else:
                     # Sidebar button clicks
                     if settings_btn.collidepoint(mouse_pos):
@@ -555,57 +992,145 @@ def run_jigsaw():
                     elif reset_btn.collidepoint(mouse_pos):
                         reset_game()
                     elif upload_btn.collidepoint(mouse_pos):
-                        uploaded = upload_image()
-                        if uploaded:
-                            image_data.append(uploaded)
-                            current_image_idx = len(image_data) - 1
-                            original_image = image_data[current_image_idx][1]
-                            reset_game()
+                        upload_image()
                     elif show_more_btn and show_more_btn.collidepoint(mouse_pos):
-                        show_image_popup()
+                        image_browser.open()
                     else:
                         # Image-selection buttons
                         for i, btn_rect in enumerate(button_rects):
                             if btn_rect.collidepoint(mouse_pos) and i != current_image_idx:
                                 current_image_idx = i
-                                original_image = image_data[current_image_idx][1]
+                                original_image = image_library.load(current_image_idx)
                                 reset_game()
                                 break
 
-                        # Carousel piece pick-up
+                        # Carousel piece pick-up, held by its centre
                         if mouse_pos[1] > CAROUSEL_Y:
-                            for piece in carousel_pieces:
-                                if piece in placed_pieces:
-                                    continue
-                                piece_rect = pygame.Rect(
-                                    piece['current_pos'][0],
-                                    piece['current_pos'][1],
-                                    piece['display_size'][0],
-                                    piece['display_size'][1]
-                                )
-                                if piece_rect.collidepoint(mouse_pos):
-                                    selected_piece = piece
-                                    offset_x = mouse_pos[0] - piece['current_pos'][0]
-                                    offset_y = mouse_pos[1] - piece['current_pos'][1]
-                                    break
+                            piece, thumb_pos = carousel_piece_at(mouse_pos)
+                            if piece:
+                                selected_piece, held_button = piece, event.button
+                                image = piece.turned(piece_turns[piece.id])[0]
+                                offset_x, offset_y = image.get_width() // 2, image.get_height() // 2
+
+                        # Board pick-up: the whole group under the pointer
+                        elif event.button == 1 and not show_preview and BOARD_RECT.collidepoint(mouse_pos):
+                            root = group_at(to_board(mouse_pos))
+                            if root is not None:
+                                pick_up_group(root, to_board(mouse_pos))
+                                held_button = 1
+
+                        # Right-click on the board turns a group where it lies
+                        elif event.button == 3 and rotate_pieces and not show_preview \
+                                and BOARD_RECT.collidepoint(mouse_pos):
+                            rotate_group_at(mouse_pos)
 
             elif event.type == MOUSEBUTTONUP:
-                if selected_piece and selected_piece not in placed_pieces:
-                    mouse_pos = pygame.mouse.get_pos()
-                    if mouse_pos[1] < CAROUSEL_Y:
-                        check_piece_position(selected_piece, mouse_pos)
+                mouse_pos = pygame.mouse.get_pos()
+                if event.button != held_button:
+                    pass
+                elif selected_piece and not placed[selected_piece.id]:
+                    if BOARD_RECT.collidepoint(mouse_pos):
+                        board_x, board_y = to_board(mouse_pos)
+                        place_piece(selected_piece, (board_x - offset_x, board_y - offset_y))
                     selected_piece = None
+                elif dragged_group is not None:
+                    drop_group(mouse_pos)
 
             elif event.type == MOUSEMOTION:
+                if dragged_group is not None:
+                    # One translation for the whole group, however many pieces it has
+                    board_x, board_y = to_board(event.pos)
+                    board_groups.offset[dragged_group] = [board_x - offset_x, board_y - offset_y]
+                elif event.buttons[1] and view_zoom > 1:  # middle-drag to pan
+                    pan_view(*event.rel)
                 if event.buttons[2]:  # right-drag to scroll
                     carousel_scroll = max(0,
-                                          min(len(carousel_pieces) * STEP - PUZZLE_AREA_WIDTH,
+                                          min(carousel_strip.max_scroll(PUZZLE_AREA_WIDTH),
                                               carousel_scroll - event.rel[0]))
 
         pygame.display.flip()
         clock.tick(FPS)
 
-    pygame.mixer.music.stop()
+# ------------------ SCENE ----------------------------------
+class JigsawScene(Scene):
+    """Jigsaw state lives in this module's globals, so suspending keeps it as is."""
+    caption = "Jigsaw Puzzle"
+
+    def enter(self, screen):
+        global current_image_idx, original_image
+        super().enter(screen)
+        if not resume_saved_game():
+            current_image_idx = 0
+            original_image = image_library.load(current_image_idx)
+            reset_game()
+        invalidate_board()
+
+    def run(self):
+        main()
+
+    def suspend(self):
+        super().suspend()
+        pygame.mixer.music.stop()
+        save_progress()
+
+    def resume(self, screen):
+        global start_time
+        super().resume(screen)
+        start_time += self.suspended_ms()  # The timer does not run while suspended
+        invalidate_board()  # Other scenes drew on the shared window
+
+    def exit(self):
+        cutter.close()
+        autosaver.flush()
+
+def run_jigsaw():
+    scene = JigsawScene()
+    scene.enter(shared_screen())
+    scene.run()
+    scene.suspend()
+    scene.exit()
+
+# ------------------ FRAME BENCHMARK ------------------------
+BENCHMARK_GRIDS = ((4, 4), (16, 16), (32, 64))  # 16, 256 and 2,048 pieces
+
+def benchmark_frames(grids=BENCHMARK_GRIDS, frames=200):
+    """
+    Times one frame's board and carousel passes plus a carousel hit test,
+    with every other piece placed, for each (rows, cols) in ``grids``:
+    once idle and once while a loose piece is dragged across the board,
+    with rotation off and on.
+    """
+    import time
+
+    global original_image, current_image_idx, rotate_pieces
+    current_image_idx = 0
+    original_image = image_library.load(current_image_idx)
+    for (rows, cols), rotate_pieces in itertools.product(grids, (False, True)):
+        start_pieces(create_jigsaw_pieces(original_image, rows, cols))
+        for piece in pieces[::2]:
+            place_piece(piece, piece.target_pos)
+        loose = pieces[1]
+        place_piece(loose, (300, 300))
+        invalidate_board()
+        timings = []
+        for dragging in (False, True):
+            if dragging:
+                pick_up_group(loose.id, (300, 300))
+            start = time.perf_counter()
+            for frame in range(frames):
+                if dragging:
+                    board_groups.offset[loose.id] = [frame % 400 - loose.target_pos[0], 200 - loose.target_pos[1]]
+                draw_puzzle()
+                draw_carousel()
+                carousel_piece_at((45, CAROUSEL_Y + 30))
+            timings.append((time.perf_counter() - start) / frames)
+        drop_group((300, 300))
+        print(f"{rows * cols:5d} pieces  rotation {'on ' if rotate_pieces else 'off'}  "
+              f"idle {1000 * timings[0]:7.3f} ms/frame  dragging {1000 * timings[1]:7.3f} ms/frame")
 
 if __name__ == "__main__":
-    run_jigsaw()
\ No newline at end of file
+    # python jigsaw.py --benchmark   times the per-frame passes
+    if "--benchmark" in sys.argv:
+        benchmark_frames()
+    else:
+        run_jigsaw()
\ No newline at end of file
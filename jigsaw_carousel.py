@@ -0,0 +1,96 @@
+# -----------------------------------------------------------
+#  jigsaw_carousel.py  (the jigsaw's piece carousel, pre-composited)
+# -----------------------------------------------------------
+import pygame
+
+PAGE_SLOTS = 32  # Thumbnails composited into one page surface
+
+class CarouselStrip:
+    """
+    A horizontal strip of piece thumbnails, composited into fixed-width
+    pages. Drawing blits the visible part of at most two pages, however
+    many pieces there are. Removing a piece shifts every later slot, so
+    the pages from that slot on are dropped and rebuilt when they next
+    scroll into view.
+    """
+    def __init__(self, thumb_size, gap, background, border_color, page_slots=PAGE_SLOTS):
+        self.thumb_size = thumb_size
+        self.gap = gap
+        self.step = thumb_size + gap
+        self.background = background
+        self.border_color = border_color
+        self.page_slots = page_slots
+        self.thumbs = []
+        self.pages = {}  # Page number -> composited surface
+
+    def __len__(self):
+        return len(self.thumbs)
+
+    def reset(self, thumbs):
+        self.thumbs = list(thumbs)
+        self.pages.clear()
+
+    def extend(self, thumbs):
+        """Appends slots; only the page that held the old last slot is redrawn."""
+        first = max(0, len(self.thumbs) - 1) // self.page_slots
+        self.thumbs.extend(thumbs)
+        for page in [p for p in self.pages if p >= first]:
+            del self.pages[page]
+
+    def remove(self, index):
+        """Drops slot ``index``; only pages at or after it are redrawn."""
+        del self.thumbs[index]
+        first = index // self.page_slots
+        for page in [p for p in self.pages if p >= first]:
+            del self.pages[page]
+
+    def replace(self, index, thumb):
+        """Swaps the thumbnail in slot ``index``; only its page is redrawn."""
+        self.thumbs[index] = thumb
+        self.pages.pop(index // self.page_slots, None)
+
+    def max_scroll(self, view_width):
+        return max(0, len(self.thumbs) * self.step - view_width)
+
+    def slot_x(self, index, scroll):
+        """Left edge of slot ``index`` relative to the strip's origin."""
+        return self.gap + index * self.step - scroll
+
+    def slot_at(self, x, scroll):
+        """Index of the thumbnail under strip-relative ``x``, or None."""
+        offset = x + scroll - self.gap
+        if offset < 0 or offset % self.step >= self.thumb_size:
+            return None
+        index = offset // self.step
+        return index if index < len(self.thumbs) else None
+
+    def _page(self, page):
+        surface = self.pages.get(page)
+        if surface is None:
+            surface = pygame.Surface((self.page_slots * self.step, self.thumb_size))
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            surface.fill(self.background)
+            first = page * self.page_slots
+            for slot, thumb in enumerate(self.thumbs[first:first + self.page_slots]):
+                x = slot * self.step
+                surface.blit(thumb, (x, 0))
+                pygame.draw.rect(surface, self.border_color, (x, 0, self.thumb_size, self.thumb_size), 2)
+            self.pages[page] = surface
+        return surface
+
+    def draw(self, screen, origin, view_width, scroll):
+        """Blits the part of the strip visible in ``view_width`` pixels from ``origin``."""
+        if not self.thumbs:
+            return
+        page_width = self.page_slots * self.step
+        last_page = (len(self.thumbs) - 1) // self.page_slots
+        first = max(0, (scroll - self.gap) // page_width)
+        old_clip = screen.get_clip()
+        screen.set_clip(pygame.Rect(origin[0], origin[1], view_width, self.thumb_size).clip(old_clip))
+        for page in range(first, last_page + 1):
+            x = origin[0] + self.gap + page * page_width - scroll
+            if x >= origin[0] + view_width:
+                break
+            screen.blit(self._page(page), (x, origin[1]))
+        screen.set_clip(old_clip)
@@ -0,0 +1,602 @@
+# -----------------------------------------------------------
+#  jigsaw_pieces.py  (cutting an image into jigsaw pieces)
+# -----------------------------------------------------------
+#  Kept free of window and mixer setup so pieces can be cut away from
+#  the game loop, e.g. by the launcher's prefetch thread.
+# -----------------------------------------------------------
+import math
+import os
+import pickle
+import queue
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future, wait as wait_futures
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pygame
+
+THUMB_SIZE = 70  # Edge of a piece's carousel thumbnail
+
+# ------------------ EDGE SHAPE -----------------------------
+# One knob, as cubic Bezier segments in edge-local units: ``t`` runs
+# along the edge from its midpoint, ``s`` points away from the piece that
+# owns the knob. Units are the shorter side of a piece. The neighbour's
+# blank is the same region, so the two pieces always interlock.
+KNOB_CURVES = (
+    ((-0.12, 0.00), (-0.07, 0.00), (-0.04, 0.04), (-0.06, 0.08)),
+    ((-0.06, 0.08), (-0.14, 0.14), (-0.12, 0.26), (0.00, 0.26)),
+    ((0.00, 0.26), (0.12, 0.26), (0.14, 0.14), (0.06, 0.08)),
+    ((0.06, 0.08), (0.04, 0.04), (0.07, 0.00), (0.12, 0.00)),
+)
+KNOB_DEPTH = 0.27  # Furthest the curves reach past the edge
+KNOB_JITTER = 0.08  # Random shift of a knob along its edge
+CURVE_STEPS = 16  # Points sampled per Bezier segment
+
+def bezier_points(curves, steps=CURVE_STEPS):
+    points = []
+    for p0, p1, p2, p3 in curves:
+        for i in range(steps):
+            t = i / steps
+            a, b, c, d = (1 - t) ** 3, 3 * t * (1 - t) ** 2, 3 * t * t * (1 - t), t ** 3
+            points.append((a * p0[0] + b * p1[0] + c * p2[0] + d * p3[0],
+                           a * p0[1] + b * p1[1] + c * p2[1] + d * p3[1]))
+    points.append(curves[-1][3])
+    return points
+
+def knob_template(scale):
+    """
+    Boolean array [t, s] of the pixels a knob covers when the shorter
+    piece side is ``scale`` pixels, plus the ``t`` of the edge midpoint.
+    """
+    outline = bezier_points(KNOB_CURVES)
+    half = math.ceil(max(abs(t) for t, _ in outline) * scale) + 1
+    depth = math.ceil(KNOB_DEPTH * scale) + 1
+    surface = pygame.Surface((2 * half, depth), depth=8)
+    surface.fill(0)
+    pygame.draw.polygon(surface, 1, [(half + t * scale, s * scale) for t, s in outline])
+    return pygame.surfarray.array2d(surface).astype(bool), half
+
+# ------------------ CUTTING --------------------------------
+class Piece:
+    """
+    One jigsaw piece. ``id`` is its row-major index, which is also its
+    position in the list returned by ``create_jigsaw_pieces``, so games
+    can keep per-piece state in flat arrays indexed by id.
+    ``image`` is the cell plus a margin for knobs on every side; it is
+    drawn at ``target_pos`` when the piece sits in its home cell ``rect``.
+    ``neighbours`` are the ids of the pieces sharing an edge with it.
+    """
+    __slots__ = ("id", "image", "thumb", "mask", "target_pos", "size", "rect", "neighbours", "_turned")
+
+    def __init__(self, id, image, thumb, target_pos, size, rect, neighbours=()):
+        self.id = id
+        self.image = image
+        self.thumb = thumb
+        self.mask = pygame.mask.from_surface(image)
+        self.target_pos = target_pos
+        self.size = size
+        self.rect = rect  # Home cell on the board
+        self.neighbours = neighbours
+        self._turned = {}  # Quarter turns -> (image, thumb)
+
+    def turned(self, turn):
+        """
+        (image, thumb) turned ``turn`` quarter turns clockwise. Made the
+        first time a turn is needed and kept, so drawing never rotates.
+        """
+        turn %= 4
+        if turn == 0:
+            return self.image, self.thumb
+        surfaces = self._turned.get(turn)
+        if surfaces is None:
+            surfaces = self._turned[turn] = (pygame.transform.rotate(self.image, -90 * turn),
+                                             pygame.transform.rotate(self.thumb, -90 * turn))
+        return surfaces
+
+    def hit(self, pos, image_pos):
+        """Pixel-accurate test of ``pos`` against the piece drawn at ``image_pos``."""
+        x, y = pos[0] - image_pos[0], pos[1] - image_pos[1]
+        width, height = self.mask.get_size()
+        return 0 <= x < width and 0 <= y < height and bool(self.mask.get_at((x, y)))
+
+def owner_map(width, height, rows, cols, rng):
+    """
+    Piece id owning each pixel of the sheet, as an int32 array [x, y]
+    (-1 outside the grid); ``rng`` is a NumPy Generator. Starts from the
+    plain grid, then stamps every knob into the neighbouring cell with one
+    vectorized assignment per edge orientation and direction.
+    """
+    piece_width, piece_height = width // cols, height // rows
+    xs = np.arange(width) // piece_width
+    ys = np.arange(height) // piece_height
+    owners = (ys[None, :] * cols + xs[:, None]).astype(np.int32)
+    owners[xs >= cols, :] = -1
+    owners[:, ys >= rows] = -1
+
+    scale = min(piece_width, piece_height)
+    template, half = knob_template(scale)
+    dt, ds = np.nonzero(template)
+    jitter = KNOB_JITTER * scale
+
+    # Horizontal edges: between (r, c) and (r + 1, c), knob centre along x
+    r, c = np.meshgrid(np.arange(rows - 1), np.arange(cols), indexing="ij")
+    r, c = r.ravel(), c.ravel()
+    centre = c * piece_width + piece_width // 2 + knob_shifts(rng, r.size, jitter) - half
+    edge = (r + 1) * piece_height
+    outward = rng.integers(0, 2, r.size) * 2 - 1
+    for sign in (1, -1):
+        pick = outward == sign
+        owner = r[pick] * cols + c[pick] + (0 if sign > 0 else cols)
+        x = centre[pick, None] + dt[None, :]
+        y = edge[pick, None] + (ds[None, :] if sign > 0 else -1 - ds[None, :])
+        owners[x, y] = np.repeat(owner, dt.size).reshape(x.shape)
+
+    # Vertical edges: between (r, c) and (r, c + 1), knob centre along y
+    r, c = np.meshgrid(np.arange(rows), np.arange(cols - 1), indexing="ij")
+    r, c = r.ravel(), c.ravel()
+    centre = r * piece_height + piece_height // 2 + knob_shifts(rng, r.size, jitter) - half
+    edge = (c + 1) * piece_width
+    outward = rng.integers(0, 2, r.size) * 2 - 1
+    for sign in (1, -1):
+        pick = outward == sign
+        owner = r[pick] * cols + c[pick] + (0 if sign > 0 else 1)
+        y = centre[pick, None] + dt[None, :]
+        x = edge[pick, None] + (ds[None, :] if sign > 0 else -1 - ds[None, :])
+        owners[x, y] = np.repeat(owner, dt.size).reshape(x.shape)
+    return owners
+
+def knob_shifts(rng, count, jitter):
+    return np.rint(rng.uniform(-jitter, jitter, count)).astype(np.int64)
+
+def create_jigsaw_pieces(image, rows=4, cols=4, thumb_size=THUMB_SIZE, seed=None):
+    """
+    Cuts ``image`` into ``rows`` x ``cols`` interlocking pieces. The same
+    ``seed`` always gives the same cut. Safe to call from a worker thread:
+    pieces come back with per-pixel alpha but not yet display-converted.
+    """
+    width, height = image.get_size()
+    owners = owner_map(width, height, rows, cols, np.random.default_rng(seed))
+    return [Piece(*cut) for cut in cut_cells(image, owners, rows, cols, range(rows * cols), thumb_size)]
+
+def grid_neighbours(id, rows, cols):
+    """Ids of the pieces above, right of, below and left of ``id``, where they exist."""
+    row, col = divmod(id, cols)
+    return tuple(r * cols + c for r, c in ((row - 1, col), (row, col + 1), (row + 1, col), (row, col - 1))
+                 if 0 <= r < rows and 0 <= c < cols)
+
+def piece_rects(id, size, rows, cols):
+    """(home cell, image window) of piece ``id`` on a sheet of ``size``."""
+    piece_width, piece_height = size[0] // cols, size[1] // rows
+    margin = math.ceil(KNOB_DEPTH * min(piece_width, piece_height)) + 1
+    row, col = divmod(id, cols)
+    cell = pygame.Rect(col * piece_width, row * piece_height, piece_width, piece_height)
+    return cell, cell.inflate(2 * margin, 2 * margin)
+
+def cut_cells(image, owners, rows, cols, ids, thumb_size=THUMB_SIZE):
+    """
+    Cuts the pieces ``ids`` out of ``image`` using a map from ``owner_map``
+    and yields the Piece constructor arguments of each.
+    """
+    bounds = image.get_rect()
+    for id in ids:
+        cell, window = piece_rects(id, bounds.size, rows, cols)
+        clipped = window.clip(bounds)
+        piece = pygame.Surface(window.size, pygame.SRCALPHA)
+        offset = (clipped.x - window.x, clipped.y - window.y)
+        piece.blit(image, offset, clipped)
+        alpha = pygame.surfarray.pixels_alpha(piece)
+        alpha[:] = 0
+        region = owners[clipped.left:clipped.right, clipped.top:clipped.bottom]
+        alpha[offset[0]:offset[0] + clipped.width, offset[1]:offset[1] + clipped.height] = \
+            (region == id) * 255
+        del alpha  # Unlocks the surface
+
+        yield (id, piece, pygame.transform.smoothscale(piece, (thumb_size, thumb_size)),
+               window.topleft, cell.size, cell, grid_neighbours(id, rows, cols))
+
+def zoom_mask(image, zoom):
+    """
+    Alpha of piece ``image`` magnified ``zoom`` times: bilinear between
+    pixel centres, then cut at a quarter. Neighbouring masks add up to
+    opaque and are sampled on the same board grid, so one of at most four
+    pieces meeting anywhere is always drawn; where two overlap they show
+    the same pixels.
+    """
+    alpha = pygame.surfarray.array_alpha(image).astype(np.float32)
+
+    def taps(count):
+        pos = (np.arange(count * zoom, dtype=np.float32) + 0.5) / zoom - 0.5
+        low = np.floor(pos)
+        frac = pos - low
+        low = low.astype(np.intp)
+        return np.clip(low, 0, count - 1), np.clip(low + 1, 0, count - 1), frac
+
+    x0, x1, fx = taps(alpha.shape[0])
+    y0, y1, fy = taps(alpha.shape[1])
+    columns = alpha[x0] * (1 - fx)[:, None] + alpha[x1] * fx[:, None]
+    rows = columns[:, y0] * (1 - fy) + columns[:, y1] * fy
+    return np.where(rows >= 63.75, 255, 0).astype(np.uint8)
+
+# ------------------ PARALLEL CUTTING -----------------------
+#  PieceCutter cuts in a pool of worker processes over one shared-memory
+#  block: the source pixels, the owner map, then one fixed-size slot per
+#  piece for its RGBA image and thumbnail. Tasks name a batch of piece
+#  ids and the workers write the pixels straight into the slots, so only
+#  the ids cross a pipe. The game polls once per frame and adds finished
+#  batches to the carousel, so the board is usable while the rest of the
+#  pieces are still being cut.
+#
+#  The workers are fresh interpreters running this module (python -m
+#  jigsaw_pieces --worker), started the first time a cut needs them. A
+#  forked worker could inherit SDL state or a lock held by one of the
+#  game's threads, and spawn would re-run the launcher in every worker;
+#  a new interpreter that imports only this module has neither problem.
+CUT_BATCH = 64  # Pieces per worker task
+CUT_TIMEOUT = 5.0  # Seconds the oldest batch may take before the rest is cut inline
+MAX_CUT_WORKERS = 4  # More processes stop paying off for a 600x600 sheet
+
+class SharedSheet:
+    """Offsets of the parts of a PieceCutter shared-memory block."""
+    def __init__(self, size, rows, cols, thumb_size):
+        self.size = size
+        self.rows, self.cols = rows, cols
+        self.thumb_size = thumb_size
+        self.window_size = piece_rects(0, size, rows, cols)[1].size
+        self.owners_offset = size[0] * size[1] * 3
+        self.slots_offset = self.owners_offset + size[0] * size[1] * 4
+        self.image_bytes = self.window_size[0] * self.window_size[1] * 4
+        self.slot_bytes = self.image_bytes + thumb_size * thumb_size * 4
+        self.nbytes = self.slots_offset + rows * cols * self.slot_bytes
+
+    def slot(self, id):
+        start = self.slots_offset + id * self.slot_bytes
+        return start, start + self.image_bytes, start + self.slot_bytes
+
+def _cut_shared(name, sheet, ids):
+    """Worker side of PieceCutter: cuts ``ids`` into their slots of block ``name``."""
+    shm = shared_memory.SharedMemory(name=name)
+    # Attaching registers the block with this worker's own resource
+    # tracker, which would unlink it when the worker exits; the game owns it
+    resource_tracker.unregister(shm._name, "shared_memory")
+    image = owners = None
+    try:
+        image = pygame.image.frombuffer(shm.buf[:sheet.owners_offset], sheet.size, "RGB")
+        owners = np.ndarray(sheet.size, np.int32, buffer=shm.buf, offset=sheet.owners_offset)
+        for id, piece, thumb, *_ in cut_cells(image, owners, sheet.rows, sheet.cols, ids, sheet.thumb_size):
+            start, middle, end = sheet.slot(id)
+            shm.buf[start:middle] = pygame.image.tobytes(piece, "RGBA")
+            shm.buf[middle:end] = pygame.image.tobytes(thumb, "RGBA")
+    finally:
+        del image, owners  # Views into shm.buf must go before it closes
+        shm.close()
+
+def default_workers():
+    """One process per spare core, at most ``MAX_CUT_WORKERS``; 0 cuts on the calling thread."""
+    return max(0, min(MAX_CUT_WORKERS, (os.cpu_count() or 1) - 1))
+
+class CutterPool:
+    """
+    Worker processes for PieceCutter. ``submit`` queues a batch and
+    returns a Future; one feeder thread per worker hands it the next
+    batch over its stdin and reads the answer from its stdout.
+    """
+    def __init__(self, workers):
+        self.workers = workers
+        self._tasks = queue.Queue()
+        self._processes = []
+        here = os.path.dirname(os.path.abspath(__file__))
+        env = dict(os.environ, PYGAME_HIDE_SUPPORT_PROMPT="1")
+        for _ in range(workers):
+            process = subprocess.Popen([sys.executable, "-m", "jigsaw_pieces", "--worker"], cwd=here, env=env,
+                                       stdin=subprocess.PIPE, stdout=subprocess.PIPE)
+            self._processes.append(process)
+            threading.Thread(target=self._feed, args=(process,), name="cutter-feed", daemon=True).start()
+
+    def submit(self, name, sheet, ids):
+        future = Future()
+        self._tasks.put((future, (name, sheet, ids)))
+        return future
+
+    def _feed(self, process):
+        try:
+            pickle.load(process.stdout)  # Takes no batch until the worker has imported pygame
+            failure = None
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError) as e:
+            failure = RuntimeError(f"cutting worker did not start ({e})")
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                return
+            future, args = task
+            if not future.set_running_or_notify_cancel():
+                continue
+            if failure is not None:
+                future.set_exception(failure)
+                continue
+            try:
+                pickle.dump(args, process.stdin)
+                process.stdin.flush()
+                error = pickle.load(process.stdout)
+            except (OSError, EOFError, pickle.UnpicklingError, ValueError) as e:
+                future.set_exception(RuntimeError(f"cutting worker exited ({e})"))
+                return
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(RuntimeError(error))
+
+    def shutdown(self):
+        """Lets the workers exit once they finish their current batch; queued batches are dropped."""
+        self._cancel_queued()
+        for process in self._processes:
+            self._tasks.put(None)
+            try:
+                process.stdin.close()  # The worker exits at end of input
+            except OSError:
+                pass
+
+    def terminate(self):
+        """Kills the workers now, including one stuck in a batch."""
+        self.shutdown()
+        for process in self._processes:
+            process.kill()
+
+    def _cancel_queued(self):
+        while True:
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                return
+            if task is not None:
+                task[0].cancel()
+
+def serve_worker():
+    """Worker loop: runs ``_cut_shared`` for each pickled batch on stdin, answers on stdout."""
+    replies = os.fdopen(os.dup(sys.stdout.fileno()), "wb")
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())  # Stray prints must not corrupt the replies
+    tasks = sys.stdin.buffer
+    pickle.dump("ready", replies)
+    replies.flush()
+    while True:
+        try:
+            name, sheet, ids = pickle.load(tasks)
+        except EOFError:
+            return
+        try:
+            _cut_shared(name, sheet, ids)
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        pickle.dump(error, replies)
+        replies.flush()
+
+_workers = None  # Pool shared by every PieceCutter(), started on first use
+_workers_lock = threading.Lock()
+
+def shared_workers():
+    """The shared CutterPool, started on first call; None when cutting inline."""
+    global _workers
+    with _workers_lock:
+        if _workers is None and default_workers():
+            _workers = CutterPool(default_workers())
+        return _workers
+
+class PieceCutter:
+    """
+    Streams the pieces of one puzzle at a time. ``start`` begins a cut and
+    each ``poll`` returns the next batch once it is ready, in id order,
+    without blocking. With no workers ``poll`` cuts that batch itself,
+    which still keeps every frame's share of the work to one batch. It
+    also does that for the rest of a cut when a worker fails, or when the
+    oldest batch is not back ``CUT_TIMEOUT`` seconds after a worker took it; the workers
+    are then stopped, and the next cut starts new ones.
+
+    Without ``workers`` the shared pool is used, started by the first cut.
+    A count (as the benchmark passes) gets a pool of its own, 0 none.
+    """
+    def __init__(self, workers=None, batch=CUT_BATCH):
+        self._own_pool = workers is not None
+        self._pool = CutterPool(workers) if self._own_pool and workers > 0 else None
+        self.batch = batch
+        self.total = 0
+        self.delivered = 0
+        self._shm = None
+        self._sheet = None
+        self._pending = []  # (ids, future, or None to cut inline) per batch not yet delivered
+        self._source = None  # (image, owners, rows, cols, thumb_size) of the current cut
+        self._head_since = 0.0  # When the oldest pending batch became the oldest
+
+    @property
+    def workers(self):
+        pool = self._pool if self._own_pool else _workers
+        return pool.workers if pool else 0
+
+    @property
+    def done(self):
+        return not self._pending
+
+    def start(self, image, rows, cols, seed=None, thumb_size=THUMB_SIZE):
+        """Cancels any cut still running and starts cutting ``image``."""
+        self.cancel()
+        size = image.get_size()
+        owners = owner_map(size[0], size[1], rows, cols, np.random.default_rng(seed))
+        self.total = rows * cols
+        self.delivered = 0
+        batches = [range(first, min(first + self.batch, self.total))
+                   for first in range(0, self.total, self.batch)]
+        self._source = (image, owners, rows, cols, thumb_size)
+        self._head_since = time.monotonic()
+        pool = self._pool if self._own_pool else shared_workers()
+        if pool is None:
+            self._pending = [(ids, None) for ids in batches]
+            return
+        sheet = self._sheet = SharedSheet(size, rows, cols, thumb_size)
+        self._shm = shared_memory.SharedMemory(create=True, size=sheet.nbytes)
+        self._shm.buf[:sheet.owners_offset] = pygame.image.tobytes(image, "RGB")
+        view = np.ndarray(owners.shape, np.int32, buffer=self._shm.buf, offset=sheet.owners_offset)
+        view[:] = owners
+        del view
+        self._pending = [(ids, pool.submit(self._shm.name, sheet, ids)) for ids in batches]
+
+    def poll(self):
+        """The next batch of pieces, or [] while it is still being cut."""
+        ready = []
+        if self._pending:
+            # Batches are handed out in order, so the carousel fills in id order
+            ids, future = self._pending[0]
+            if future is None:
+                self._pending.pop(0)
+                image, owners, rows, cols, thumb_size = self._source
+                ready = [Piece(*cut) for cut in cut_cells(image, owners, rows, cols, ids, thumb_size)]
+            elif future.done():
+                try:
+                    future.result()
+                    self._pending.pop(0)
+                    ready = [self._piece(id) for id in ids]
+                except Exception as e:  # A dead worker must not take the game down
+                    print(f"Piece cutting failed: {e}; cutting the rest here")
+                    self._drop_workers()
+            elif not future.running():
+                self._head_since = time.monotonic()  # Queued behind starting workers; not stalled yet
+            elif time.monotonic() - self._head_since > CUT_TIMEOUT:
+                print(f"Piece cutting stalled for {CUT_TIMEOUT:.0f} s; cutting the rest here")
+                self._drop_workers()
+            if ready:
+                self._head_since = time.monotonic()
+        if not self._pending:
+            self._release()
+        self.delivered += len(ready)
+        return ready
+
+    def wait(self):
+        """Every remaining piece, blocking until they are cut (or time out and are cut here)."""
+        ready = []
+        while not self.done:
+            future = self._pending[0][1]
+            if future is not None:
+                wait_futures([future], timeout=max(0.0, self._head_since + CUT_TIMEOUT - time.monotonic()))
+            ready += self.poll()
+        return ready
+
+    def _drop_workers(self):
+        """Stops the pool and cuts what is left inline."""
+        global _workers
+        self._pending = [(ids, None) for ids, _ in self._pending]
+        if self._own_pool:
+            pool, self._pool = self._pool, None
+        else:
+            with _workers_lock:
+                pool, _workers = _workers, None
+        if pool is not None:
+            pool.terminate()
+
+    def cancel(self):
+        for _, future in self._pending:
+            if future is not None:
+                future.cancel()
+        self._pending = []
+        self._release()
+
+    def close(self):
+        """Stops the cut, and the worker processes if this cutter started them."""
+        self.cancel()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _piece(self, id):
+        sheet = self._sheet
+        start, middle, end = sheet.slot(id)
+        # frombuffer views the block; converting (or copying) detaches it
+        image = pygame.image.frombuffer(self._shm.buf[start:middle], sheet.window_size, "RGBA")
+        thumb = pygame.image.frombuffer(self._shm.buf[middle:end], (sheet.thumb_size,) * 2, "RGBA")
+        if pygame.display.get_surface() is not None:
+            image, thumb = image.convert_alpha(), thumb.convert_alpha()
+        else:
+            image, thumb = image.copy(), thumb.copy()
+        cell, window = piece_rects(id, sheet.size, sheet.rows, sheet.cols)
+        return Piece(id, image, thumb, window.topleft, cell.size, cell,
+                     grid_neighbours(id, sheet.rows, sheet.cols))
+
+    def _release(self):
+        self._source = None
+        if self._shm is not None:
+            # Workers still running keep their own mapping until they finish
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+# ------------------ PREFETCHED PIECES ----------------------
+_prepared = {}  # (filename, rows, cols) -> (seed, pieces) cut ahead of time
+
+def new_seed():
+    """A fresh cut seed; saves store it to cut the same pieces again."""
+    return int.from_bytes(os.urandom(8), "little")
+
+def prepare_pieces(filename, image, rows=4, cols=4):
+    """Cuts the pieces for ``filename`` ahead of time; safe to call from a worker thread."""
+    seed = new_seed()
+    _prepared[filename, rows, cols] = (seed, create_jigsaw_pieces(image, rows, cols, seed=seed))
+
+def take_prepared_pieces(filename, rows=4, cols=4):
+    """
+    (seed, pieces) prepared for ``filename`` at this grid, or None. They
+    are handed out once, so a restart still gets a fresh cut, and converted
+    to the display format here because that has to happen on the main thread.
+    """
+    prepared = _prepared.pop((filename, rows, cols), None)
+    if prepared and pygame.display.get_surface() is not None:
+        for piece in prepared[1]:
+            piece.image = piece.image.convert_alpha()
+            piece.thumb = piece.thumb.convert_alpha()
+    return prepared
+
+# ------------------ CUTTING BENCHMARK ----------------------
+def benchmark_cutting(image, rows=40, cols=50, worker_counts=None):
+    """
+    Times one cut per worker count, polling like the game loop does.
+    ``stall`` is the longest time the calling thread was busy in one go,
+    which is what the player sees as a dropped frame.
+    """
+    if worker_counts is None:
+        worker_counts = range(os.cpu_count() + 1)
+    start = time.perf_counter()
+    create_jigsaw_pieces(image, rows, cols, seed=1)
+    blocking = time.perf_counter() - start
+    print(f"{rows * cols} pieces, blocking cut {1000 * blocking:.1f} ms")
+    for workers in worker_counts:
+        cutter = PieceCutter(workers)
+        cutter.start(image, rows, cols, seed=1)
+        cutter.wait()  # Warms the workers up before timing
+        start = time.perf_counter()
+        cutter.start(image, rows, cols, seed=1)
+        stall = time.perf_counter() - start
+        first = None
+        while not cutter.done:
+            busy = time.perf_counter()
+            if cutter.poll() and first is None:
+                first = time.perf_counter() - start
+            stall = max(stall, time.perf_counter() - busy)
+            time.sleep(0.001)
+        total = time.perf_counter() - start
+        cutter.close()
+        print(f"{workers:2d} workers  first batch {1000 * first:7.1f} ms  all {1000 * total:7.1f} ms"
+              f"  speedup {blocking / total:4.2f}x  longest stall {1000 * stall:5.1f} ms")
+
+if __name__ == "__main__":
+    # python jigsaw_pieces.py --benchmark [IMAGE]
+    if len(sys.argv) > 1 and sys.argv[1] == "--worker":
+        serve_worker()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--benchmark":
+        path = sys.argv[2] if len(sys.argv) > 2 else None
+        if path:
+            sheet = pygame.transform.smoothscale(pygame.image.load(path), (600, 600))
+        else:
+            from image_library import shared_library
+            sheet = shared_library().load(0)
+        benchmark_cutting(sheet)
+    else:
+        print("usage: python jigsaw_pieces.py --benchmark [IMAGE]")
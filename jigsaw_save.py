@@ -0,0 +1,188 @@
+# -----------------------------------------------------------
+#  jigsaw_save.py  (compact binary saves of a jigsaw in progress)
+# -----------------------------------------------------------
+#  A save holds what it takes to rebuild the board: the image's file
+#  name, the seed and grid of the cut (the pieces are simply cut again),
+#  the elapsed time, and for every piece the group it is in and how it is
+#  turned, with each group's offset from home in stacking order. 1,000
+#  pieces take about 8 KB.
+#
+#  Layout, little-endian:
+#    header   magic, seed, rows, cols, elapsed ms, name length, group count, flags
+#    name     UTF-8 file name of the image
+#    groups   int32 per piece: index into offsets, or -1 in the carousel
+#    turns    uint8 per piece: quarter turns clockwise
+#    offsets  int32 (dx, dy) per group, bottom of the stack first
+#
+#  Version 1 saves (no flags or turns) still load, with every piece upright.
+# -----------------------------------------------------------
+import os
+import struct
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+SAVE_PATH = os.path.join("saves", "jigsaw.sav")
+AUTOSAVE_INTERVAL = 2000  # Milliseconds between autosaves while the board keeps changing
+
+_MAGIC = b"PZSAVE02"
+_HEADER = struct.Struct("<8sQHHIHIB")
+_MAGIC_V1 = b"PZSAVE01"
+_HEADER_V1 = struct.Struct("<8sQHHIHI")
+_ROTATE = 1  # Flag: pieces were dealt turned
+
+class JigsawSave:
+    """
+    A loaded save. ``groups[id]`` is the index of piece ``id``'s group in
+    ``offsets`` (bottom of the stack first), or -1 for a carousel piece;
+    ``turns[id]`` is how the piece is turned; ``rotate`` is the rotation
+    setting it was played with.
+    """
+    __slots__ = ("image", "seed", "rows", "cols", "elapsed_ms", "groups", "offsets", "turns", "rotate")
+
+    def __init__(self, image, seed, rows, cols, elapsed_ms, groups, offsets, turns, rotate):
+        self.image = image
+        self.seed = seed
+        self.rows = rows
+        self.cols = cols
+        self.elapsed_ms = elapsed_ms
+        self.groups = groups
+        self.offsets = offsets
+        self.turns = turns
+        self.rotate = rotate
+
+def take_snapshot(image, seed, rows, cols, elapsed_ms, groups, z, turns, rotate, moving=None):
+    """
+    Copies what a save needs out of live game state: flat dict copies and
+    one tuple per group, cheap enough for the main thread. ``groups`` is a
+    PieceGroups, ``z`` maps roots to stacking order, ``turns`` holds the
+    carousel pieces' turns and ``moving`` gives (offset, turn) to use
+    instead, e.g. where a group in mid-drag came from.
+    """
+    offsets = {root: (tuple(offset), groups.turn[root]) for root, offset in groups.offset.items()}
+    if moving:
+        offsets.update(moving)
+    return image, seed, rows, cols, elapsed_ms, dict(groups.parent), offsets, dict(z), bytes(turns), rotate
+
+def encode_save(snapshot):
+    """The bytes of a save file for ``take_snapshot``'s result."""
+    image, seed, rows, cols, elapsed_ms, parent, offsets, z, turns, rotate = snapshot
+    order = sorted(offsets, key=z.__getitem__)
+    index = {root: i for i, root in enumerate(order)}
+    groups = np.full(rows * cols, -1, np.int32)
+    turns = np.frombuffer(turns, np.uint8).copy()
+    for id in parent:
+        root = id
+        while parent[root] != root:
+            root = parent[root]
+        groups[id] = index[root]
+        turns[id] = offsets[root][1]  # Placed pieces turn with their group
+    name = image.encode("utf-8")
+    return b"".join((
+        _HEADER.pack(_MAGIC, seed, rows, cols, elapsed_ms, len(name), len(order), _ROTATE if rotate else 0),
+        name,
+        groups.astype("<i4").tobytes(),
+        turns.tobytes(),
+        np.array([offsets[root][0] for root in order], "<i4").reshape(-1, 2).tobytes(),
+    ))
+
+def decode_save(data):
+    if data[:8] == _MAGIC_V1:
+        magic, seed, rows, cols, elapsed_ms, name_length, group_count = _HEADER_V1.unpack_from(data)
+        flags, header_size = 0, _HEADER_V1.size
+    else:
+        magic, seed, rows, cols, elapsed_ms, name_length, group_count, flags = _HEADER.unpack_from(data)
+        header_size = _HEADER.size
+        if magic != _MAGIC:
+            raise ValueError("not a jigsaw save")
+    count = rows * cols
+    at = header_size + name_length
+    image = data[header_size:at].decode("utf-8")
+    groups = np.frombuffer(data, "<i4", count, at)
+    at += 4 * count
+    if magic == _MAGIC_V1:
+        turns = bytes(count)
+    else:
+        turns = bytes(np.frombuffer(data, np.uint8, count, at))
+        at += count
+        if max(turns, default=0) > 3:
+            raise ValueError("piece turn out of range")
+    offsets = np.frombuffer(data, "<i4", 2 * group_count, at).reshape(-1, 2)
+    if groups.size and groups.max() >= group_count:
+        raise ValueError("group index out of range")
+    return JigsawSave(image, seed, rows, cols, elapsed_ms, groups.tolist(), [tuple(o) for o in offsets.tolist()],
+                      turns, bool(flags & _ROTATE))
+
+def write_save(path, data):
+    """Writes ``data`` to ``path`` so a crash leaves either the old save or the new one."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def load_save(path=SAVE_PATH):
+    """The save at ``path``, or None if there is none or it is damaged."""
+    try:
+        with open(path, "rb") as f:
+            return decode_save(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, struct.error, UnicodeDecodeError) as e:
+        print(f"Ignoring unreadable save {path}: {e}")
+        return None
+
+class Autosaver:
+    """
+    Encodes and writes snapshots on one background thread, in order. A
+    snapshot still waiting when a newer one arrives is replaced by it, so
+    a slow disk never builds up a queue.
+    """
+    def __init__(self, path=SAVE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._queued = None
+        self._last = None
+        self._executor = None
+
+    def _submit(self, task):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="autosave")
+        self._last = self._executor.submit(task)
+
+    def save(self, snapshot):
+        with self._lock:
+            waiting = self._queued is not None
+            self._queued = snapshot
+        if not waiting:
+            self._submit(self._write)
+
+    def delete(self):
+        """Removes the save once pending writes are done, e.g. for a finished puzzle."""
+        with self._lock:
+            self._queued = None
+        self._submit(self._remove)
+
+    def flush(self):
+        """Blocks until everything submitted so far is on disk."""
+        if self._last is not None:
+            self._last.result()
+
+    def _write(self):
+        with self._lock:
+            snapshot, self._queued = self._queued, None
+        if snapshot is None:
+            return
+        try:
+            write_save(self.path, encode_save(snapshot))
+        except OSError as e:
+            print(f"Autosave failed: {e}")
+
+    def _remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
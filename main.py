@@ -1,14 +1,48 @@
 # -----------------------------------------------------------
-#  main.py  (launcher + original sliding puzzle + stub jigsaw)
+#  main.py  (launcher: menu + lazily loaded games)
 # -----------------------------------------------------------
-import pygame, sys, os
-from pygame.locals import *
-from jigsaw import run_jigsaw
-from sudoku import run_sudoku
-from snake import run_snake
+import time
+_process_start = time.perf_counter()
+import sys, os, importlib
+from contextlib import contextmanager
 
-pygame.init()
-pygame.mixer.init()
+# ------------------ STARTUP PROFILE ------------------------
+# python main.py --profile-startup prints how long each import and
+# initialization phase took, up to the first menu frame and for each
+# game the first time it is opened.
+PROFILE_STARTUP = "--profile-startup" in sys.argv
+startup_phases = []
+startup_reported = False
+
+@contextmanager
+def startup_phase(name):
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    startup_phases.append((name, elapsed))
+    if PROFILE_STARTUP and startup_reported:
+        print(f"[startup] {name:28s} {1000 * elapsed:8.1f} ms")
+
+def report_startup():
+    global startup_reported
+    startup_reported = True
+    if not PROFILE_STARTUP:
+        return
+    for name, elapsed in startup_phases:
+        print(f"[startup] {name:28s} {1000 * elapsed:8.1f} ms")
+    print(f"[startup] {'first menu frame':28s} {1000 * (time.perf_counter() - _process_start):8.1f} ms total")
+
+with startup_phase("import pygame"):
+    import pygame
+    from pygame.locals import *
+with startup_phase("import asset_bundle"):
+    from asset_bundle import shared_bundle
+with startup_phase("import prefetch"):
+    from prefetch import Prefetcher
+
+with startup_phase("pygame.init"):
+    pygame.init()
+    pygame.mixer.init()
 
 # ------------------ CONSTANTS ------------------------------
 SCREEN_WIDTH, SCREEN_HEIGHT = 800, 650
@@ -19,18 +53,25 @@ ACCENT_3   = (173, 255, 173)  # Green - Snake
 ACCENT_4   = (255, 253, 182)  # Yellow - Sudoku
 TEXT_COLOR = (70, 70, 70)
 FPS = 60
+PREFETCH_IDLE_MS = 1500  # Menu idle time before games are prefetched in turn
+PREFETCH_ENABLED = "--no-prefetch" not in sys.argv
 
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Puzzle Selector")
-clock  = pygame.time.Clock()
+with startup_phase("display"):
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Puzzle Selector")
+    clock  = pygame.time.Clock()
 
 # ------------------ BACKGROUND IMAGE -----------------------
-try:
-    background_img = pygame.image.load("assets/background.jpg")
-    background_img = pygame.transform.scale(background_img, (SCREEN_WIDTH, SCREEN_HEIGHT))
-except:
-    background_img = None
-    print("Background image not found. Using solid color background.")
+with startup_phase("background image"):
+    try:
+        bundle = shared_bundle()
+        background_img = bundle and bundle.surface("background.jpg", (SCREEN_WIDTH, SCREEN_HEIGHT))
+        if not background_img:
+            background_img = pygame.image.load("assets/background.jpg")
+            background_img = pygame.transform.scale(background_img, (SCREEN_WIDTH, SCREEN_HEIGHT))
+    except:
+        background_img = None
+        print("Background image not found. Using solid color background.")
 
 # ------------------ FONTS ----------------------------------
 def safe_font(size):
@@ -39,9 +80,10 @@ def safe_font(size):
     except:
         return pygame.font.SysFont("comicsansms", size)
 
-title_font = safe_font(60)
-btn_font   = safe_font(28)
-icon_font  = safe_font(40)  # For button icons
+with startup_phase("fonts"):
+    title_font = safe_font(60)
+    btn_font   = safe_font(28)
+    icon_font  = safe_font(40)  # For button icons
 
 # ------------------ ENHANCED BUTTON ------------------------
 def draw_button(rect, color, text, icon=None):
@@ -75,17 +117,100 @@ def draw_button(rect, color, text, icon=None):
     
     return rect
 
-# ------------------ PLACEHOLDER JIGSAW SCENE ---------------
-def jigsaw_scene():
-    run_jigsaw()
+# ------------------ GAME REGISTRY --------------------------
+# Lazy entry points: (module, scene class). A game's module, with its
+# fonts, sounds and first puzzle, is imported only when the game is
+# first chosen, so the menu appears without waiting for any of them.
+GAMES = {
+    "sliding": ("sliding_puzzle", "SlidingPuzzleScene"),
+    "jigsaw":  ("jigsaw", "JigsawScene"),
+    "snake":   ("snake", "SnakeScene"),
+    "sudoku":  ("sudoku", "SudokuScene"),
+}
+
+def load_game(key):
+    """Imports a game's module on first use and returns its Scene class."""
+    module_name, entry = GAMES[key]
+    module = sys.modules.get(module_name)
+    if module is None:
+        with startup_phase(f"import {module_name}"):
+            module = importlib.import_module(module_name)
+    return getattr(module, entry)
+
+# ------------------ SCENE STACK ----------------------------
+class SceneStack:
+    """
+    Games shown over the launcher, all drawing on its one window. A game
+    the player leaves is suspended and kept in ``suspended``, so choosing
+    it again resumes it instead of setting it up anew.
+    """
+    def __init__(self):
+        self.stack = []
+        self.suspended = {}
+
+    def show(self, key):
+        """Enters or resumes ``key`` and runs it until the player leaves."""
+        scene = self.suspended.pop(key, None)
+        if scene is None:
+            scene = load_game(key)()
+            scene.enter(screen)
+        else:
+            scene.resume(screen)
+        self.stack.append(scene)
+        try:
+            scene.run()
+        finally:
+            self.stack.pop()
+            scene.suspend()
+            self.suspended[key] = scene
+            pygame.display.set_caption("Puzzle Selector")
 
-# ------------------ PLACEHOLDER SNAKE SCENE ----------------
-def snake_scene():
-    run_snake()
+    def close(self):
+        """Exits every scene; called before the application quits."""
+        for scene in reversed(self.stack):
+            scene.exit()
+        for scene in self.suspended.values():
+            scene.exit()
+        self.stack.clear()
+        self.suspended.clear()
 
-# ------------------ PLACEHOLDER SUDOKU SCENE ---------------
-def sudoku_scene():
-    run_sudoku()
+scenes = SceneStack()
+
+# ------------------ LAUNCH TIMING --------------------------
+# Click-to-first-frame time of every launch: (game, ms, how), where how
+# is "cold", "prefetched" or "resumed". Printed with --profile-startup;
+# compare runs with and without --no-prefetch.
+launch_times = []
+prefetcher = Prefetcher()
+
+def timed_first_flip(key, start, how):
+    """Wraps pygame.display.flip so the game's first flip records the launch time."""
+    real_flip = pygame.display.flip
+
+    def first_flip():
+        pygame.display.flip = real_flip
+        real_flip()
+        elapsed = time.perf_counter() - start
+        launch_times.append((key, elapsed, how))
+        if PROFILE_STARTUP:
+            print(f"[launch]  {key:28s} {1000 * elapsed:8.1f} ms to first frame ({how})")
+
+    pygame.display.flip = first_flip
+    return real_flip
+
+def run_game(key):
+    start = time.perf_counter()
+    prefetcher.finish(key)
+    if key in scenes.suspended:
+        how = "resumed"
+    else:
+        how = "prefetched" if key in prefetcher.ready else "cold"
+    real_flip = timed_first_flip(key, start, how)
+    try:
+        scenes.show(key)
+    finally:
+        pygame.display.flip = real_flip
+    prefetcher.ready.add(key)  # Suspended in place; nothing left to prefetch
 
 # ------------------ LAUNCHER -------------------------------
 def launcher():
@@ -98,6 +223,8 @@ def launcher():
     btn_jigsaw = pygame.Rect(margin_x + button_width + spacing_x, margin_y, button_width, button_height)
     btn_snake  = pygame.Rect(margin_x, margin_y + button_height + spacing_y, button_width, button_height)
     btn_sudoku = pygame.Rect(margin_x + button_width + spacing_x, margin_y + button_height + spacing_y, button_width, button_height)
+    buttons = (("sliding", btn_slide), ("jigsaw", btn_jigsaw), ("snake", btn_snake), ("sudoku", btn_sudoku))
+    last_activity = pygame.time.get_ticks()
 
     while True:
         # Draw background
@@ -121,24 +248,38 @@ def launcher():
         draw_button(btn_sudoku, ACCENT_4, "Sudoku Puzzle")
         
         pygame.display.flip()
+        if not startup_reported:
+            report_startup()
 
         for ev in pygame.event.get():
+            if ev.type in (MOUSEMOTION, MOUSEBUTTONDOWN, KEYDOWN):
+                last_activity = pygame.time.get_ticks()
             if ev.type == QUIT:
+                scenes.close()
                 pygame.quit(); sys.exit()
             if ev.type == MOUSEBUTTONDOWN:
                 if btn_slide.collidepoint(ev.pos):
-                    run_sliding_puzzle()  # original game
+                    run_game("sliding")
                 if btn_jigsaw.collidepoint(ev.pos):
-                    jigsaw_scene()
+                    run_game("jigsaw")
                 if btn_snake.collidepoint(ev.pos):
-                    snake_scene()
+                    run_game("snake")
                 if btn_sudoku.collidepoint(ev.pos):
-                    sudoku_scene()
+                    run_game("sudoku")
+                last_activity = pygame.time.get_ticks()
 
-        clock.tick(FPS)
+        # Prefetch the hovered game, or any game once the menu is idle
+        if PREFETCH_ENABLED:
+            mouse_pos = pygame.mouse.get_pos()
+            hovered = next((key for key, rect in buttons if rect.collidepoint(mouse_pos)), None)
+            if hovered:
+                prefetcher.request(hovered)
+            elif not prefetcher.busy and pygame.time.get_ticks() - last_activity > PREFETCH_IDLE_MS:
+                waiting = next((key for key, _ in buttons if prefetcher.wants(key)), None)
+                if waiting:
+                    prefetcher.request(waiting)
 
-# ------------------ ORIGINAL SLIDING-PUZZLE MAIN -----------
-from sliding_puzzle import run_sliding_puzzle
+        clock.tick(FPS)
 
 # ------------------ ENTRY POINT ----------------------------
 if __name__ == "__main__":
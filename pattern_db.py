@@ -0,0 +1,317 @@
+# -----------------------------------------------------------
+#  pattern_db.py  (additive pattern databases for the 4x4 puzzle)
+# -----------------------------------------------------------
+#  Build once, offline:   python pattern_db.py build
+#  The solver memory-maps the resulting file at startup and uses it
+#  automatically for 4x4 boards when it is present.
+# -----------------------------------------------------------
+import mmap
+import os
+import struct
+import sys
+import time
+
+PDB_SIZE = 4
+PDB_PATTERNS = ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4))  # 6-6-3 split
+PDB_PATH = os.path.join("assets", "cache", "puzzle4x4_663.pdb")
+
+# File layout (little endian):
+#   header   b"SPDB", version, board size, pattern count
+#   entries  per pattern: tile count, 16 tile slots, data offset, data length
+#   data     one byte per ranked placement of the pattern tiles
+_MAGIC = b"SPDB"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHH")
+_ENTRY = struct.Struct("<H16BQQ")
+
+# ------------------ PERMUTATION RANKING --------------------
+def placement_count(cells, k):
+    """Number of ways to place ``k`` distinct tiles on ``cells`` cells."""
+    count = 1
+    for i in range(k):
+        count *= cells - i
+    return count
+
+def rank_multipliers(cells, k):
+    """Weights used by ``placement_rank`` for each tile slot."""
+    return [placement_count(cells - i - 1, k - i - 1) for i in range(k)]
+
+def placement_rank(positions, multipliers):
+    """
+    Perfect hash of distinct cell positions into 0 .. placement_count - 1.
+    Each position is replaced by its index among the cells still free,
+    which gives a mixed-radix number.
+    """
+    rank = 0
+    for i, p in enumerate(positions):
+        smaller = 0
+        for j in range(i):
+            if positions[j] < p:
+                smaller += 1
+        rank += (p - smaller) * multipliers[i]
+    return rank
+
+def packed_rank_tables(cells, k, multipliers):
+    """
+    ``placement_rank`` split into tables so it can be read from packed
+    positions (4 bits per tile, tile ``i`` at bits ``4 * i``) in O(k):
+    the first ``split`` tiles form the head code and the rest the tail
+    code, and
+
+        rank = head[head code] + tail[tail code]
+               - sum(cross[p][tail code] for each head position p)
+
+    ``cross`` carries the "free cells before p" corrections between the
+    halves. The tables have 16 ** split, 16 ** (k - split) and
+    16 * 16 ** (k - split) entries, a few thousand for a 6-tile pattern.
+    """
+    if cells > 16:
+        raise ValueError("packed ranks hold at most 16 cells")
+    split = (k + 1) // 2
+
+    def half_ranks(count, weights):
+        table = []
+        for code in range(16 ** count):
+            positions = [(code >> (4 * i)) & 15 for i in range(count)]
+            table.append(placement_rank(positions, weights))
+        return table
+
+    head = half_ranks(split, multipliers[:split])
+    tail = half_ranks(k - split, multipliers[split:])
+    cross = []
+    for p in range(16):
+        row = []
+        for code in range(16 ** (k - split)):
+            row.append(sum(multipliers[split + i] for i in range(k - split) if p < (code >> (4 * i)) & 15))
+        cross.append(row)
+    return split, head, tail, cross
+
+# ------------------ LOOKUP ---------------------------------
+class PatternDatabase:
+    """
+    Read-only view of a pattern database file.
+    The tables are memory-mapped, so lookups read straight from the page
+    cache and every process using the file shares the same pages.
+    """
+    def __init__(self, path=PDB_PATH):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, size, count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a pattern database")
+        self.size = size
+        self.patterns = []
+        cells = size * size
+        offset = _HEADER.size
+        for _ in range(count):
+            fields = _ENTRY.unpack_from(self._map, offset)
+            k = fields[0]
+            tiles = tuple(fields[1:1 + k])
+            data_offset, length = fields[17], fields[18]
+            if length != placement_count(cells, k):
+                self.close()
+                raise ValueError(f"{path} has a truncated table")
+            self.patterns.append((tiles, data_offset, rank_multipliers(cells, k)))
+            offset += _ENTRY.size
+        self._packed = None
+
+    def lookup(self, pattern_index, positions):
+        """Moves needed to bring one pattern's tiles home from ``positions``."""
+        tiles, data_offset, multipliers = self.patterns[pattern_index]
+        return self._map[data_offset + placement_rank(positions, multipliers)]
+
+    def packed_tables(self):
+        """``packed_rank_tables`` of every pattern, built on first use and shared."""
+        if self._packed is None:
+            cells = self.size * self.size
+            self._packed = [packed_rank_tables(cells, len(tiles), multipliers)
+                            for tiles, _, multipliers in self.patterns]
+        return self._packed
+
+    def close(self):
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+class PatternDatabaseHeuristic:
+    """
+    Additive pattern-database heuristic for the solver.
+    Each move shifts one tile, so only that tile's pattern needs a new
+    lookup. The search reports moves through ``slide``, which keeps every
+    pattern's positions packed into two integers and updates them in
+    place; a lookup is then a few table reads, with no board scans. One
+    instance tracks one search, so it must not be shared between threads.
+    """
+    name = "6-6-3 pattern database"
+
+    def __init__(self, database):
+        self.database = database
+        self.size = database.size
+        cells = self.size * self.size
+        self.group_of = [None] * cells  # tile -> pattern index
+        self.slot = [None] * cells  # tile -> (0 head / 1 tail, bit shift in that code)
+        self.patterns = []  # (head tiles, data offset, head, tail, cross) per pattern
+        for index, ((tiles, data_offset, _), (split, head, tail, cross)) in enumerate(
+                zip(database.patterns, database.packed_tables())):
+            for i, tile in enumerate(tiles):
+                self.group_of[tile] = index
+                self.slot[tile] = (0, 4 * i) if i < split else (1, 4 * (i - split))
+            self.patterns.append((tiles[:split], data_offset, head, tail, cross))
+        self.where = [0] * cells  # tile -> position in the tracked board
+        self.codes = [[0, 0] for _ in self.patterns]  # packed head and tail positions per pattern
+        self.values = [0] * len(self.patterns)
+
+    def _group_value(self, board, index):
+        tiles = self.database.patterns[index][0]
+        return self.database.lookup(index, [board.index(t) for t in tiles])
+
+    def estimate(self, board):
+        return sum(self._group_value(board, i) for i in range(len(self.database.patterns)))
+
+    def _packed_value(self, index):
+        lead, data_offset, head, tail, cross = self.patterns[index]
+        code_head, code_tail = self.codes[index]
+        rank = head[code_head] + tail[code_tail]
+        where = self.where
+        for tile in lead:
+            rank -= cross[where[tile]][code_tail]
+        return self.database._map[data_offset + rank]
+
+    def reset(self, board):
+        """Starts tracking ``board``; returns its estimate."""
+        for pos, tile in enumerate(board):
+            self.where[tile] = pos
+        for codes in self.codes:
+            codes[0] = codes[1] = 0
+        for tile in range(1, len(board)):
+            half, shift = self.slot[tile]
+            self.codes[self.group_of[tile]][half] += self.where[tile] << shift
+        for index in range(len(self.patterns)):
+            self.values[index] = self._packed_value(index)
+        return sum(self.values)
+
+    def slide(self, tile, source, target):
+        """Moves ``tile`` from ``source`` to ``target`` in the tracked board; returns the estimate's change."""
+        self.where[tile] = target
+        index = self.group_of[tile]
+        half, shift = self.slot[tile]
+        self.codes[index][half] += (target - source) << shift
+        value = self._packed_value(index)
+        change = value - self.values[index]
+        self.values[index] = value
+        return change
+
+    def slide_back(self, tile, source, target, change):
+        """Undoes ``slide(tile, source, target)`` that returned ``change``, without a lookup."""
+        self.where[tile] = source
+        index = self.group_of[tile]
+        half, shift = self.slot[tile]
+        self.codes[index][half] -= (target - source) << shift
+        self.values[index] -= change
+
+_database = None
+_database_checked = False
+
+def load_pattern_database(path=PDB_PATH):
+    """Memory-maps the pattern database once, with its rank tables; returns None when it has not been built."""
+    global _database, _database_checked
+    if not _database_checked:
+        if os.path.exists(path):
+            try:
+                _database = PatternDatabase(path)
+                _database.packed_tables()  # Built here so the first hint does not pay for them
+            except (OSError, ValueError, struct.error) as e:
+                print(f"Ignoring pattern database {path}: {e}")
+        # Set last: the launcher may be loading it on its prefetch thread
+        _database_checked = True
+    return _database
+
+# ------------------ OFFLINE BUILD --------------------------
+def build_pattern_table(tiles, size=PDB_SIZE, progress=print):
+    """
+    Backwards breadth-first search from the goal over placements of
+    ``tiles`` only. The blank and all other tiles are abstracted away, and
+    every step of a pattern tile costs one move, so tables for disjoint
+    patterns can be added. Returns a bytearray indexed by ``placement_rank``.
+    Requires NumPy.
+    """
+    import numpy as np
+
+    k = len(tiles)
+    cells = size * size
+    unseen = 255
+    seen = np.full(cells ** k, unseen, dtype=np.uint8)  # indexed by packed 4-bit positions
+    start = sum((t - 1) << (4 * i) for i, t in enumerate(tiles))
+    seen[start] = 0
+    frontier = np.array([start], dtype=np.int64)
+    visited = 1
+    total = placement_count(cells, k)
+    depth = 0
+    began = time.perf_counter()
+
+    while frontier.size:
+        depth += 1
+        digits = [(frontier >> (4 * i)) & 15 for i in range(k)]
+        found = []
+        for i in range(k):
+            pos = digits[i]
+            row, col = pos // size, pos % size
+            for delta, legal in ((-size, row > 0), (size, row < size - 1),
+                                 (-1, col > 0), (1, col < size - 1)):
+                target = pos + delta
+                for j in range(k):
+                    if j != i:
+                        legal = legal & (digits[j] != target)
+                nxt = frontier[legal] + (delta << (4 * i))
+                found.append(nxt[seen[nxt] == unseen])
+        frontier = np.unique(np.concatenate(found))
+        seen[frontier] = depth
+        visited += frontier.size
+        if progress:
+            progress(f"  tiles {tiles}: depth {depth:2d}  {visited:>9,}/{total:,} "
+                     f"({100.0 * visited / total:5.1f}%)  {time.perf_counter() - began:6.1f}s")
+
+    codes = np.nonzero(seen != unseen)[0]
+    digits = [(codes >> (4 * i)) & 15 for i in range(k)]
+    multipliers = rank_multipliers(cells, k)
+    ranks = np.zeros(codes.size, dtype=np.int64)
+    for i in range(k):
+        smaller = np.zeros(codes.size, dtype=np.int64)
+        for j in range(i):
+            smaller += digits[j] < digits[i]
+        ranks += (digits[i] - smaller) * multipliers[i]
+    table = np.zeros(total, dtype=np.uint8)
+    table[ranks] = seen[codes]
+    return bytearray(table.tobytes())
+
+def build_pattern_database(path=PDB_PATH, patterns=PDB_PATTERNS, size=PDB_SIZE, progress=print):
+    """Builds every pattern table and writes them to ``path`` atomically."""
+    tables = []
+    for tiles in patterns:
+        if progress:
+            progress(f"Building pattern {tiles}...")
+        tables.append(build_pattern_table(tiles, size, progress))
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, size, len(patterns)))
+        offset = _HEADER.size + _ENTRY.size * len(patterns)
+        for tiles, table in zip(patterns, tables):
+            slots = list(tiles) + [0] * (16 - len(tiles))
+            f.write(_ENTRY.pack(len(tiles), *slots, offset, len(table)))
+            offset += len(table)
+        for table in tables:
+            f.write(table)
+    os.replace(tmp_path, path)
+    if progress:
+        progress(f"Wrote {path} ({os.path.getsize(path):,} bytes)")
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2 or sys.argv[1] != "build":
+        print("usage: python pattern_db.py build [output-path]")
+        sys.exit(1)
+    build_pattern_database(sys.argv[2] if len(sys.argv) > 2 else PDB_PATH)
@@ -0,0 +1,120 @@
+# -----------------------------------------------------------
+#  piece_groups.py  (union-find of jigsaw pieces joined on the board)
+# -----------------------------------------------------------
+import pygame
+
+def turn_rect(rect, turn):
+    """``rect`` after ``turn`` quarter turns clockwise about the origin (y points down)."""
+    x, y, w, h = rect
+    turn %= 4
+    if turn == 1:
+        return pygame.Rect(-y - h, x, h, w)
+    if turn == 2:
+        return pygame.Rect(-x - w, -y - h, w, h)
+    if turn == 3:
+        return pygame.Rect(y, -x - w, h, w)
+    return pygame.Rect(rect)
+
+def turn_pixel(pos, turn):
+    """Where pixel ``pos`` lands after ``turn`` quarter turns clockwise, matching turn_rect."""
+    x, y = pos
+    turn %= 4
+    if turn == 1:
+        return -y - 1, x
+    if turn == 2:
+        return -x - 1, -y - 1
+    if turn == 3:
+        return y, -x - 1
+    return x, y
+
+class PieceGroups:
+    """
+    Disjoint sets of piece ids with path compression and union by size.
+
+    Pieces in one group always sit at their correct positions relative to
+    each other, so a whole group is placed by one transform of the pieces'
+    home positions: ``turn`` quarter turns clockwise about the board's
+    origin, then ``offset``. Moving or rotating a group of any size changes
+    a few numbers. ``bounds`` is the group's outline at home.
+    """
+    def __init__(self):
+        self.parent = {}  # id -> parent id; roots are their own parent
+        self.members = {}  # root -> ids in the group
+        self.offset = {}  # root -> [dx, dy] from home, applied after the turn
+        self.turn = {}  # root -> quarter turns clockwise, 0-3
+        self.bounds = {}  # root -> Rect covering the group at home
+
+    def __len__(self):
+        """Number of groups."""
+        return len(self.members)
+
+    def __contains__(self, id):
+        return id in self.parent
+
+    def clear(self):
+        self.parent.clear()
+        self.members.clear()
+        self.offset.clear()
+        self.turn.clear()
+        self.bounds.clear()
+
+    def add(self, id, rect, offset, turn=0):
+        """Starts a group of one: piece ``id`` covering ``rect`` at home, turned by ``turn`` and moved by ``offset``."""
+        self.parent[id] = id
+        self.members[id] = [id]
+        self.offset[id] = list(offset)
+        self.turn[id] = turn
+        self.bounds[id] = pygame.Rect(rect)
+
+    def find(self, id):
+        parent = self.parent
+        root = id
+        while parent[root] != root:
+            root = parent[root]
+        while parent[id] != root:
+            parent[id], id = root, parent[id]
+        return root
+
+    def group_size(self, id):
+        return len(self.members[self.find(id)])
+
+    def union(self, keep, join):
+        """
+        Merges the groups of ``keep`` and ``join`` and returns the new root.
+        The merged group takes ``keep``'s offset and turn, so ``join``'s
+        pieces move.
+        """
+        a, b = self.find(keep), self.find(join)
+        if a == b:
+            return a
+        offset, turn = self.offset.pop(a), self.turn.pop(a)
+        bounds = self.bounds.pop(a).union(self.bounds.pop(b))
+        del self.offset[b], self.turn[b]
+        if len(self.members[a]) < len(self.members[b]):
+            a, b = b, a
+        self.parent[b] = a
+        self.members[a].extend(self.members.pop(b))
+        self.offset[a] = offset
+        self.turn[a] = turn
+        self.bounds[a] = bounds
+        return a
+
+    def place(self, root, rect):
+        """Where home ``rect`` of a piece in group ``root`` currently is on the board."""
+        return turn_rect(rect, self.turn[root]).move(self.offset[root])
+
+    def rect(self, root):
+        """The group's outline where it currently is on the board."""
+        return self.place(root, self.bounds[root])
+
+    def to_home(self, root, pos):
+        """The home pixel of group ``root`` that is at board pixel ``pos``."""
+        ox, oy = self.offset[root]
+        return turn_pixel((pos[0] - ox, pos[1] - oy), -self.turn[root])
+
+    def rotate(self, root, pivot):
+        """Turns group ``root`` a quarter turn clockwise about board pixel ``pivot``."""
+        home = self.to_home(root, pivot)
+        self.turn[root] = (self.turn[root] + 1) % 4
+        x, y = turn_pixel(home, self.turn[root])
+        self.offset[root] = [pivot[0] - x, pivot[1] - y]
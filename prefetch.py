@@ -0,0 +1,187 @@
+# -----------------------------------------------------------
+#  prefetch.py  (warming games up while the launcher is idle)
+# -----------------------------------------------------------
+#  The launcher asks for a game when the pointer rests on its button or
+#  the menu has been idle for a while. A worker thread then loads what
+#  the game needs first (sounds, its first image, solver tables, the
+#  first puzzle) into the shared caches the game reads from anyway.
+#
+#  Only work that is safe off the main thread happens here. Fonts,
+#  windows and display-format conversion stay with the game: SDL_ttf is
+#  not thread-safe, and prefetched surfaces are converted on first use.
+# -----------------------------------------------------------
+import importlib
+import os
+import threading
+
+from image_library import IMAGE_SIZE, shared_library
+
+PREFETCH_BUDGET = 48 * 1024 * 1024  # Estimated bytes all prefetches may hold
+SOUND_DIR = "assets/sounds"
+IMAGE_BYTES = IMAGE_SIZE[0] * IMAGE_SIZE[1] * 4  # One image in display format
+
+def sound_estimate(path):
+    """Decoded size guess made before loading: WAV is already PCM, compressed audio about 10x."""
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return 0
+    return size if path.lower().endswith(".wav") else 10 * size
+
+# ------------------ STEPS PER GAME -------------------------
+# Each step takes the Prefetcher and must reserve memory with ``charge``
+# before allocating it; a refused charge skips the step. Charges count
+# against the game being prefetched and are given back once that game is
+# launched and owns what was loaded, or when it is prefetched again. A
+# charge with a key (the file it loads) is only made once, however many
+# steps or games load that file.
+def prefetch_sound(name):
+    def step(prefetcher):
+        from asset_bundle import load_sound
+        path = os.path.join(SOUND_DIR, name)
+        if os.path.exists(path) and prefetcher.charge(sound_estimate(path)):
+            load_sound(path)
+    return step
+
+def prefetch_first_image(prefetcher):
+    library = shared_library()
+    if prefetcher.charge(IMAGE_BYTES, key=library.filenames[0]):
+        library.prefetch(0)
+
+def prefetch_distance_table(prefetcher):
+    # Only a cached table is loaded; building one is left to the game
+    from distance_table import TABLE_PATH, load_distance_table
+    # The distance index used for scrambling costs about 4 bytes per entry
+    if os.path.exists(TABLE_PATH) and prefetcher.charge(5 * os.path.getsize(TABLE_PATH)):
+        load_distance_table().by_distance()
+
+def prefetch_pattern_database(prefetcher):
+    from pattern_db import load_pattern_database
+    load_pattern_database()  # Memory-mapped, so nothing to charge
+
+def prefetch_jigsaw_pieces(prefetcher):
+    from jigsaw_pieces import prepare_pieces
+    library = shared_library()
+    filename = library.filenames[0]
+    # The 16 pieces with their tabs and thumbnails take about one more image
+    if prefetcher.charge(IMAGE_BYTES, key=filename) and prefetcher.charge(IMAGE_BYTES, key=("pieces", filename)):
+        prepare_pieces(filename, library.prefetch(0))
+
+def prefetch_sudoku(prefetcher):
+    from sudoku import prepare_game  # Already imported by request(), on the main thread
+    prepare_game()
+
+PREFETCH_STEPS = {
+    "sliding": [prefetch_sound("slide.wav"), prefetch_sound("win.wav"),
+                prefetch_first_image, prefetch_distance_table, prefetch_pattern_database],
+    "jigsaw":  [prefetch_sound("right.mp3"), prefetch_sound("winning.mp3"),
+                prefetch_first_image, prefetch_jigsaw_pieces],
+    "sudoku":  [prefetch_sudoku],
+}
+
+# Game modules a prefetch needs, imported by ``request`` on the main thread:
+# the launcher imports them there too, and would otherwise wait on the
+# worker's import lock, or see a half-run module body
+PREFETCH_IMPORTS = {
+    "sudoku": ("sudoku",),
+}
+
+# ------------------ PREFETCHER -----------------------------
+class Prefetcher:
+    """
+    Runs one game's prefetch at a time on a daemon thread. Asking for
+    another game cancels the current one between steps; games that
+    finished are remembered in ``ready``. ``used_bytes`` is what is
+    prefetched but not yet handed to a game.
+    """
+    def __init__(self, budget_bytes=PREFETCH_BUDGET, steps=PREFETCH_STEPS, imports=PREFETCH_IMPORTS):
+        self.budget_bytes = budget_bytes
+        self.charged = {}  # Game -> bytes charged by its prefetch
+        self.charged_keys = {}  # Key -> game whose charge covers it
+        self.steps = steps
+        self.imports = imports
+        self.ready = set()
+        self._lock = threading.Lock()
+        self._game = None
+        self._thread = None
+        self._cancel = None
+        self._session = threading.local()  # .game: whose prefetch the calling thread runs
+
+    @property
+    def used_bytes(self):
+        with self._lock:
+            return sum(self.charged.values())
+
+    @property
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def wants(self, game):
+        """True if ``game`` has steps that are neither done nor running."""
+        return game in self.steps and game not in self.ready and not (self.busy and self._game == game)
+
+    def request(self, game):
+        """Starts prefetching ``game``, cancelling whatever else is running."""
+        if not self.wants(game):
+            return
+        self.cancel()
+        self.release(game)  # Steps charge again for what is already loaded
+        for module in self.imports.get(game, ()):
+            importlib.import_module(module)
+        self._game = game
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(game, self._cancel),
+                                        name=f"prefetch-{game}", daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Stops the running prefetch after its current step."""
+        if self._cancel is not None:
+            self._cancel.set()
+
+    def finish(self, game):
+        """
+        Called when ``game`` is launched: stops any prefetch after its
+        current step, and waits for that step if it is ``game``'s own so the
+        game does not load the same thing alongside it. The game loads
+        whatever the remaining steps would have.
+        """
+        self.cancel()
+        if self.busy and self._game == game:
+            self._thread.join()
+        self.release(game)  # The game's own caches hold it from here on
+
+    def charge(self, nbytes, key=None):
+        """
+        Reserves ``nbytes`` of the budget for the running prefetch; False
+        when it would be exceeded. True without charging again when ``key``
+        is already paid for.
+        """
+        game = getattr(self._session, "game", None)
+        with self._lock:
+            if key is not None and key in self.charged_keys:
+                return True
+            if sum(self.charged.values()) + nbytes > self.budget_bytes:
+                return False
+            self.charged[game] = self.charged.get(game, 0) + nbytes
+            if key is not None:
+                self.charged_keys[key] = game
+            return True
+
+    def release(self, game):
+        """Gives back everything charged for ``game``."""
+        with self._lock:
+            self.charged.pop(game, None)
+            self.charged_keys = {key: owner for key, owner in self.charged_keys.items() if owner != game}
+
+    def _run(self, game, cancel):
+        self._session.game = game
+        for step in self.steps[game]:
+            if cancel.is_set():
+                return
+            try:
+                step(self)
+            except Exception as e:
+                print(f"Prefetch of {game} failed: {e}")
+                return
+        self.ready.add(game)
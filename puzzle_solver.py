@@ -0,0 +1,324 @@
+# -----------------------------------------------------------
+#  puzzle_solver.py  (optimal solver for the sliding puzzle)
+# -----------------------------------------------------------
+import time
+
+from distance_table import TABLE_SIZE, load_distance_table
+from pattern_db import PDB_SIZE, PatternDatabaseHeuristic, load_pattern_database
+
+# A board state is a tuple of ints read row by row, where tile ``t`` belongs
+# at index ``t - 1`` and ``0`` marks the empty slot (solved = 1, 2, ..., 0).
+# Moves use the same vocabulary as ``sliding_puzzle.move_tile``: the
+# direction the *tile* slides into the empty slot.
+
+FOUND = -1
+TABLE_HEURISTIC_NAME = "3x3 distance table"
+CHECK_INTERVAL = 4096  # Nodes between checks of the cancel flag and the node budget (power of two)
+FALLBACK_WEIGHTS = (2, 4)  # Heuristic weights tried in turn once the optimal search is over budget
+LINE_COST_CACHE_LIMIT = 50000  # Conflict costs kept per direction, oldest dropped first (~12 MB each on 4x4)
+
+# ------------------ STATE HELPERS --------------------------
+def goal_state(size):
+    """Returns the solved board for a ``size`` x ``size`` puzzle."""
+    return tuple(range(1, size * size)) + (0,)
+
+def is_solvable(state, size):
+    """
+    Checks the permutation parity of ``state``.
+    Odd widths need an even number of inversions; even widths need the
+    inversions plus the blank's row (counted from the bottom, 1-based) to be odd.
+    """
+    tiles = [t for t in state if t]
+    inversions = 0
+    for i in range(len(tiles)):
+        ti = tiles[i]
+        for j in range(i + 1, len(tiles)):
+            if tiles[j] < ti:
+                inversions += 1
+    if size % 2 == 1:
+        return inversions % 2 == 0
+    blank_row_from_bottom = size - state.index(0) // size
+    return (inversions + blank_row_from_bottom) % 2 == 1
+
+_neighbor_tables = {}
+
+def neighbor_table(size):
+    """
+    For every blank position, lists the positions the blank can swap with
+    and the tile direction that swap corresponds to.
+    """
+    table = _neighbor_tables.get(size)
+    if table is None:
+        table = []
+        for pos in range(size * size):
+            row, col = divmod(pos, size)
+            moves = []
+            if row < size - 1:
+                moves.append((pos + size, "up"))
+            if row > 0:
+                moves.append((pos - size, "down"))
+            if col < size - 1:
+                moves.append((pos + 1, "left"))
+            if col > 0:
+                moves.append((pos - 1, "right"))
+            table.append(tuple(moves))
+        _neighbor_tables[size] = table
+    return table
+
+def apply_move(state, size, direction):
+    """Returns the state after sliding a tile in ``direction``, or None if illegal."""
+    blank = state.index(0)
+    for nb, name in neighbor_table(size)[blank]:
+        if name == direction:
+            board = list(state)
+            board[blank], board[nb] = board[nb], 0
+            return tuple(board)
+    return None
+
+# ------------------ HEURISTICS -----------------------------
+class LinearConflictHeuristic:
+    """
+    Manhattan distance plus linear conflicts.
+    Two tiles that sit in their goal row (or column) in reversed order must
+    leave that line to pass each other, which costs two extra moves per
+    tile that has to step aside.
+    """
+    name = "manhattan+linear-conflict"
+
+    def __init__(self, size):
+        self.size = size
+        cells = size * size
+        self.distance = [[0] * cells for _ in range(cells)]
+        for tile in range(1, cells):
+            goal_row, goal_col = divmod(tile - 1, size)
+            for pos in range(cells):
+                row, col = divmod(pos, size)
+                self.distance[tile][pos] = abs(row - goal_row) + abs(col - goal_col)
+        self._row_costs = {}
+        self._col_costs = {}
+
+    @staticmethod
+    def _conflict_cost(targets):
+        # 2 * (tiles that must leave the line) = 2 * (len - longest increasing run)
+        if len(targets) < 2:
+            return 0
+        tails = []
+        for t in targets:
+            lo, hi = 0, len(tails)
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if tails[mid] < t:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            if lo == len(tails):
+                tails.append(t)
+            else:
+                tails[lo] = t
+        return 2 * (len(targets) - len(tails))
+
+    def row_cost(self, board, row):
+        size = self.size
+        line = tuple(board[row * size:(row + 1) * size])
+        key = (row, line)
+        cost = self._row_costs.get(key)
+        if cost is None:
+            targets = [(t - 1) % size for t in line if t and (t - 1) // size == row]
+            cost = self._row_costs[key] = self._conflict_cost(targets)
+            if len(self._row_costs) > LINE_COST_CACHE_LIMIT:
+                del self._row_costs[next(iter(self._row_costs))]
+        return cost
+
+    def col_cost(self, board, col):
+        size = self.size
+        line = tuple(board[col::size])
+        key = (col, line)
+        cost = self._col_costs.get(key)
+        if cost is None:
+            targets = [(t - 1) // size for t in line if t and (t - 1) % size == col]
+            cost = self._col_costs[key] = self._conflict_cost(targets)
+            if len(self._col_costs) > LINE_COST_CACHE_LIMIT:
+                del self._col_costs[next(iter(self._col_costs))]
+        return cost
+
+    def estimate(self, board):
+        """Full heuristic value of ``board``."""
+        distance = self.distance
+        h = 0
+        for pos, tile in enumerate(board):
+            if tile:
+                h += distance[tile][pos]
+        for i in range(self.size):
+            h += self.row_cost(board, i) + self.col_cost(board, i)
+        return h
+
+    def local(self, board, a, b):
+        """
+        The part of the heuristic that a swap between positions ``a`` and
+        ``b`` can change. Evaluated before and after the swap, the
+        difference is the change in ``estimate``.
+        """
+        size = self.size
+        tile = board[a]
+        pos = a
+        if not tile:
+            tile = board[b]
+            pos = b
+        h = self.distance[tile][pos]
+        if a // size != b // size:
+            return h + self.row_cost(board, a // size) + self.row_cost(board, b // size)
+        return h + self.col_cost(board, a % size) + self.col_cost(board, b % size)
+
+def default_heuristic(size):
+    """
+    Picks the strongest heuristic available for ``size``: the 4x4 pattern
+    database when it has been built, otherwise linear conflicts.
+    """
+    if size == PDB_SIZE:
+        database = load_pattern_database()
+        if database is not None:
+            return PatternDatabaseHeuristic(database)
+    return LinearConflictHeuristic(size)
+
+# ------------------ IDA* SEARCH ----------------------------
+class SolveResult:
+    """
+    Outcome of a solver run.
+    ``moves`` is the list of tile directions, or None when the state is
+    unsolvable. It is optimal unless ``optimal`` is False, which means the
+    node budget ran out and a weighted search found it. ``nodes`` counts
+    expanded search nodes, or table lookups when the 3x3 distance table
+    answered.
+    """
+    def __init__(self, moves, nodes, elapsed, heuristic_name="", optimal=True):
+        self.moves = moves
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.heuristic_name = heuristic_name
+        self.optimal = optimal
+
+    @property
+    def solvable(self):
+        return self.moves is not None
+
+    @property
+    def nodes_per_second(self):
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def node_unit(self):
+        """What ``nodes`` counts: "lookups" for the distance table, else "nodes"."""
+        return "lookups" if self.heuristic_name == TABLE_HEURISTIC_NAME else "nodes"
+
+    def __repr__(self):
+        if not self.solvable:
+            return "SolveResult(unsolvable)"
+        unit = self.node_unit
+        kind = "" if self.optimal else ", weighted"
+        return (f"SolveResult({len(self.moves)} moves{kind}, {self.nodes} {unit}, "
+                f"{self.elapsed:.3f}s, {self.nodes_per_second:,.0f} {unit}/s)")
+
+class _Stopped(Exception):
+    """Raised inside the search when it is cancelled or over its node budget."""
+
+def solve(state, size, heuristic=None, cancel=None, node_limit=None):
+    """
+    Finds an optimal solution with IDA*.
+    Returns a SolveResult; unsolvable states are rejected by the parity
+    check before any search happens. 3x3 boards are read straight from the
+    precomputed distance table unless a heuristic is given.
+
+    ``cancel`` is a ``threading.Event``; once it is set the search stops
+    within ``CHECK_INTERVAL`` nodes and returns None. When the optimal
+    search expands ``node_limit`` nodes without finishing, it falls back to
+    weighted IDA* (f = g + w * h for each w in ``FALLBACK_WEIGHTS``), whose
+    solutions are found much faster but may be longer than optimal.
+    """
+    start = time.perf_counter()
+    state = tuple(state)
+    if not is_solvable(state, size):
+        return SolveResult(None, 0, time.perf_counter() - start)
+    if size == TABLE_SIZE and heuristic is None:
+        moves, lookups = load_distance_table().walk(state)
+        return SolveResult(moves, lookups, time.perf_counter() - start, TABLE_HEURISTIC_NAME)
+    if heuristic is None:
+        heuristic = default_heuristic(size)
+
+    goal = list(goal_state(size))
+    board = list(state)
+    neighbors = neighbor_table(size)
+    # Heuristics with ``slide`` track the board themselves and are told
+    # each move; the others are asked about the swapped cells
+    slide = getattr(heuristic, "slide", None)
+    slide_back = getattr(heuristic, "slide_back", None)
+    local = getattr(heuristic, "local", None)
+    path = []
+    nodes = 0
+    limit = None
+    weight = 1
+
+    def search(blank, g, bound, h, prev_blank):
+        nonlocal nodes
+        f = g + weight * h
+        if f > bound:
+            return f
+        if h == 0 and board == goal:
+            return FOUND
+        nodes += 1
+        if not nodes & (CHECK_INTERVAL - 1):
+            if (cancel is not None and cancel.is_set()) or (limit is not None and nodes >= limit):
+                raise _Stopped
+        minimum = None
+        for nb, direction in neighbors[blank]:
+            if nb == prev_blank:
+                continue
+            tile = board[nb]
+            if slide is None:
+                before = local(board, blank, nb)
+                board[blank] = tile
+                board[nb] = 0
+                child_h = h - before + local(board, blank, nb)
+            else:
+                board[blank] = tile
+                board[nb] = 0
+                change = slide(tile, nb, blank)
+                child_h = h + change
+            path.append(direction)
+            t = search(nb, g + 1, bound, child_h, blank)
+            if t == FOUND:
+                return FOUND
+            path.pop()
+            board[nb] = tile
+            board[blank] = 0
+            if slide is not None:
+                slide_back(tile, nb, blank, change)
+            if minimum is None or t < minimum:
+                minimum = t
+        return minimum
+
+    initial = list(board)
+    blank = board.index(0)
+    for weight in (1,) + (FALLBACK_WEIGHTS if node_limit is not None else ()):
+        # The last weight runs without a budget, so some solution is always found
+        limit = nodes + node_limit if node_limit is not None and weight != FALLBACK_WEIGHTS[-1] else None
+        board[:] = initial
+        del path[:]
+        h = heuristic.reset(board) if slide is not None else heuristic.estimate(board)
+        bound = weight * h
+        try:
+            while True:
+                t = search(blank, 0, bound, h, -1)
+                if t == FOUND:
+                    return SolveResult(list(path), nodes, time.perf_counter() - start,
+                                       heuristic.name, optimal=weight == 1)
+                bound = t
+        except _Stopped:
+            if cancel is not None and cancel.is_set():
+                return None
+
+def hint(state, size, heuristic=None, node_limit=None):
+    """Returns the first move of a solution, or None if there is none; optimal unless ``node_limit`` is hit."""
+    result = solve(state, size, heuristic, node_limit=node_limit)
+    if result.moves:
+        return result.moves[0]
+    return None
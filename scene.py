@@ -0,0 +1,52 @@
+# -----------------------------------------------------------
+#  scene.py  (games as scenes on the launcher's scene stack)
+# -----------------------------------------------------------
+#  The launcher owns the only window. Each game is a Scene that draws
+#  on that window; when the player goes back to the menu the scene is
+#  suspended with all of its state, and choosing the game again resumes
+#  it instead of loading and setting it up a second time.
+#
+#  Hooks, in the order the stack calls them:
+#    enter(screen)   once, before the first run
+#    run()           plays until the player leaves; called on every visit
+#    suspend()       after each run
+#    resume(screen)  before every run after the first
+#    exit()          when the scene is dropped for good (application quit)
+# -----------------------------------------------------------
+import pygame
+
+SCREEN_SIZE = (800, 650)
+
+def shared_screen():
+    """The launcher's window, or a new one when a game runs on its own."""
+    return pygame.display.get_surface() or pygame.display.set_mode(SCREEN_SIZE)
+
+class Scene:
+    caption = "Puzzle Selector"
+
+    def __init__(self):
+        self.screen = None
+        self.suspended_at = None
+
+    def enter(self, screen):
+        self.screen = screen
+        pygame.display.set_caption(self.caption)
+
+    def run(self):
+        raise NotImplementedError
+
+    def suspend(self):
+        self.suspended_at = pygame.time.get_ticks()
+
+    def resume(self, screen):
+        self.screen = screen
+        pygame.display.set_caption(self.caption)
+
+    def exit(self):
+        pass
+
+    def suspended_ms(self):
+        """How long the scene was suspended; timers add this to their start."""
+        if self.suspended_at is None:
+            return 0
+        return pygame.time.get_ticks() - self.suspended_at
@@ -1,22 +1,23 @@
 import pygame
 import os
 import random
-import shutil
+import threading
 from pygame.locals import *
-import tkinter as tk
-from tkinter import filedialog
-from PIL import Image, ImageTk
+from puzzle_solver import goal_state, is_solvable, solve
+from distance_table import TABLE_SIZE, load_distance_table
+from pattern_db import load_pattern_database
+from image_library import shared_library
+from asset_bundle import load_sound as load_bundled_sound
+from image_picker import ImageBrowser, ask_image_path
+from upload_pipeline import UPLOAD_DONE, draw_upload_progress, start_upload
+from scene import Scene, shared_screen
 
 # Initialize pygame
 pygame.init()
 pygame.mixer.init()
 
-# Initialize tkinter for file dialog
-root = tk.Tk()
-root.withdraw()
-
 # Grid options
-GRID_OPTIONS = {3: "3x3", 4: "4x4"}
+GRID_OPTIONS = {n: f"{n}x{n}" for n in range(3, 11)}
 current_grid_size = 3  # Default to 3x3
 
 # Constants
@@ -25,7 +26,13 @@ SCREEN_HEIGHT = 650
 TILE_SIZE = 600 // current_grid_size
 FPS = 60
 MAX_VISIBLE_IMAGES = 5
-POPUP_COLS = 3
+AUTO_SOLVE_STEP_MS = 180  # Delay between animated auto-solve moves
+SCRAMBLE_DISTANCES = (8, 14, 20, 26, 31)  # 3x3 difficulty levels, in optimal moves
+MAX_SOLVER_SIZE = 4  # Optimal solving is out of reach beyond 4x4
+SOLVER_NODE_LIMIT = 60000  # Auto-solve only: optimal-search budget before a weighted solve takes over (~0.25 s on 4x4)
+TILE_RADIUS = 5
+TILE_SHADOW = 3  # Shadow offset baked into each atlas cell
+ATLAS_CACHE_LIMIT = 4  # Baked (image, grid size) atlases kept around
 
 # Ensure assets directories exist
 os.makedirs("assets/images", exist_ok=True)
@@ -63,9 +70,8 @@ def safe_load_fonts():
 
 title_font, header_font, button_font, info_font, show_more, emoji_font = safe_load_fonts()
 
-# Screen
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Sliding Puzzle Pro")
+# Screen (the launcher's window when started from the menu)
+screen = shared_screen()
 clock = pygame.time.Clock()
 
 # Sounds
@@ -75,129 +81,21 @@ sound_settings = {
     'music_volume': 0.5
 }
 
-def get_next_image_number():
-    existing = [f for f in os.listdir("assets/images") if f.startswith('image') and f.lower().endswith(('.jpg', '.jpeg', '.png'))]
-    nums = []
-    for f in existing:
-        try:
-            nums.append(int(''.join(filter(str.isdigit, f))))
-        except:
-            pass
-    return max(nums) + 1 if nums else 1
-
-def load_images():
-    try:
-        image_files = [f for f in os.listdir("assets/images") if f.lower().endswith(('.jpg', '.jpeg', '.png'))]
-    except FileNotFoundError:
-        image_files = []
-    images = []
-    for file in image_files:
-        try:
-            img = pygame.image.load(os.path.join("assets/images", file))
-            img = pygame.transform.scale(img, (600, 600))
-            images.append((file, img))
-        except:
-            print(f"Failed to load: {file}")
-    if not images:
-        fallback = pygame.Surface((600, 600))
-        fallback.fill(ACCENT_2)
-        pygame.draw.rect(fallback, TILE_BG, (50, 50, 500, 500))
-        images.append(("fallback.png", fallback))
-    return images
-
 def upload_image():
-    file_path = filedialog.askopenfilename(
-        title="Select an image",
-        filetypes=[("Image files", "*.jpg *.jpeg *.png")]
-    )
+    """Asks for an image and hands it to the background upload pipeline."""
+    file_path = ask_image_path()
     if file_path:
-        try:
-            next_num = get_next_image_number()
-            ext = os.path.splitext(file_path)[1].lower()
-            if ext not in ['.jpg', '.jpeg', '.png']:
-                ext = '.jpg'
-            new_filename = f"image{next_num}{ext}"
-            new_path = os.path.join("assets/images", new_filename)
-            shutil.copy(file_path, new_path)
-            img = pygame.image.load(new_path)
-            img = pygame.transform.scale(img, (600, 600))
-            return (new_filename, img)
-        except Exception as e:
-            print(f"Failed to load/copy uploaded image: {e}")
-    return None
-
-def show_image_popup():
-    popup = tk.Toplevel()
-    popup.title("Select Image")
-    popup.geometry("500x500")
-    popup.resizable(False, False)
-
-    # Center the popup on the main window
-    popup_width = 500
-    popup_height = 500
-    screen_width = popup.winfo_screenwidth()
-    screen_height = popup.winfo_screenheight()
-    x = (screen_width - popup_width) // 2
-    y = (screen_height - popup_height) // 2
-    popup.geometry(f"{popup_width}x{popup_height}+{x}+{y}")
-
-    # Scrollable frame
-    canvas = tk.Canvas(popup, highlightthickness=0)
-    scrollbar = tk.Scrollbar(popup, orient="vertical", command=canvas.yview)
-    scrollable_frame = tk.Frame(canvas)
-
-    scrollable_frame.bind(
-        "<Configure>",
-        lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-    )
-    canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-    canvas.configure(yscrollcommand=scrollbar.set)
-
-    THUMB_SIZE = 150
-    for idx, (filename, _) in enumerate(image_data):
-        col = idx % POPUP_COLS
-        if col == 0:
-            row_frame = tk.Frame(scrollable_frame)
-            row_frame.pack()
-
-        img_path = os.path.join("assets/images", filename)
-        try:
-            pil_img = Image.open(img_path).convert("RGBA")
-
-            # Fill square, keep aspect
-            pil_img.thumbnail((THUMB_SIZE, THUMB_SIZE), Image.LANCZOS)
-            square = Image.new("RGBA", (THUMB_SIZE, THUMB_SIZE), (255, 255, 255, 255))
-            offset = ((THUMB_SIZE - pil_img.width) // 2,
-                      (THUMB_SIZE - pil_img.height) // 2)
-            square.paste(pil_img, offset, pil_img)
-
-            photo = ImageTk.PhotoImage(square)
-
-            btn = tk.Label(row_frame, image=photo, bd=2, relief="solid")
-            btn.image = photo  # Keep reference
-            btn.grid(row=0, column=col, padx=5, pady=5)
-            btn.bind("<Button-1>", lambda e, i=idx: select_image(i))
-
-            label = tk.Label(row_frame, text=os.path.splitext(filename)[0][:10])
-            label.grid(row=1, column=col, padx=5, pady=5)
-        except Exception as e:
-            print(f"Thumbnail error for {filename}: {e}")
-
-    canvas.pack(side="left", fill="both", expand=True)
-    scrollbar.pack(side="right", fill="y")
-
-    def select_image(idx):
-        global current_image_idx, original_image
-        current_image_idx = idx
-        original_image = image_data[current_image_idx][1]
-        reset_game()
-        popup.destroy()
-
-    popup.wait_window()
+        start_upload(file_path)
+
+def select_image(index):
+    global current_image_idx, original_image
+    current_image_idx = index
+    original_image = image_library.load(current_image_idx)
+    reset_game()
 
 def load_sound(name):
     try:
-        return pygame.mixer.Sound(os.path.join("assets/sounds", name))
+        return load_bundled_sound(os.path.join("assets/sounds", name))
     except:
         return None
 
@@ -205,16 +103,19 @@ def toggle_background_music():
     global sound_settings
     sound_settings['background_music'] = not sound_settings['background_music']
     if sound_settings['background_music']:
-        try:
-            pygame.mixer.music.load(os.path.join("assets/sounds", "background.mp3"))
-            pygame.mixer.music.set_volume(sound_settings['music_volume'])
-            pygame.mixer.music.play(-1)
-        except:
-            print("Could not load background music")
-            sound_settings['background_music'] = False
+        play_background_music()
     else:
         pygame.mixer.music.stop()
 
+def play_background_music():
+    try:
+        pygame.mixer.music.load(os.path.join("assets/sounds", "background.mp3"))
+        pygame.mixer.music.set_volume(sound_settings['music_volume'])
+        pygame.mixer.music.play(-1)
+    except:
+        print("Could not load background music")
+        sound_settings['background_music'] = False
+
 def adjust_music_volume(change):
     global sound_settings
     sound_settings['music_volume'] = max(0.0, min(1.0, sound_settings['music_volume'] + change))
@@ -222,57 +123,192 @@ def adjust_music_volume(change):
         pygame.mixer.music.set_volume(sound_settings['music_volume'])
 
 # Game state
-image_data = load_images()
-current_image_idx = 0 if image_data else -1
-original_image = image_data[current_image_idx][1] if image_data else None
-tiles = []
+image_library = shared_library()
+current_image_idx = 0
+original_image = image_library.load(current_image_idx)
+# The board is a permutation of tile numbers read row by row: tile ``t``
+# belongs at index ``t - 1`` and 0 marks the empty slot.
+board = []
 empty_pos = current_grid_size ** 2 - 1
+misplaced = 0  # Tiles not on their home square; 0 means solved
+tile_atlas = None  # All tiles of the current image, baked by build_tile_atlas
+tile_rects = []  # Atlas cell of tile ``t`` at index ``t - 1``
+board_origins = []  # Screen position of each board slot
+atlas_cache = {}
 moves = 0
 start_time = 0
+finish_time = 0
 timer_active = False
 show_preview = False
 show_settings = False
+image_browser = ImageBrowser(image_library, select_image, show_more)
 slide_sound = load_sound("slide.wav")
 win_sound = load_sound("win.wav")
-
-def shuffle_tiles(tiles_in):
-    shuffled = tiles_in[:-1]
-    random.shuffle(shuffled)
-    shuffled.append(tiles_in[-1])
-    return shuffled
-
-def create_tiles(image):
+load_pattern_database()  # Memory-maps the 4x4 hint tables if they have been built
+
+# Solver state
+solver_job = None  # Background solve in progress: {'state', 'size', 'purpose', 'cancel', 'result'}
+hint_pos = None  # Board index of the tile the hint suggests moving
+auto_solve_moves = []  # Remaining moves of an animated auto-solve
+last_auto_step = 0
+solver_message = ""
+scramble_distance = 20
+
+def scramble_state():
+    """
+    A solvable starting board for the current grid size.
+    3x3 boards are drawn from the distance table at exactly
+    ``scramble_distance`` optimal moves; larger boards are shuffled with the
+    blank in the corner and a parity fix.
+    """
+    if current_grid_size == TABLE_SIZE:
+        return load_distance_table().scramble(scramble_distance)
+    state = list(goal_state(current_grid_size)[:-1])
+    random.shuffle(state)
+    state.append(0)
+    if not is_solvable(state, current_grid_size):
+        state[0], state[1] = state[1], state[0]
+    return tuple(state)
+
+def build_tile_atlas(image):
+    """
+    Bakes every rounded, shadowed tile of ``image`` into one surface.
+    Returns (atlas, cell rects indexed by ``t - 1``). Atlases are cached per
+    (image, grid size), so switching back and forth never re-bakes.
+    """
     global TILE_SIZE  # Ensure TILE_SIZE is updated according to the current grid size
     TILE_SIZE = 600 // current_grid_size  # Update TILE_SIZE dynamically
-    tiles_local = []
-    
+
+    key = (id(image), current_grid_size)
+    cached = atlas_cache.get(key)
+    if cached:
+        return cached[1], cached[2]
+
     # Check if the original image is large enough
     if image.get_width() < TILE_SIZE * current_grid_size or image.get_height() < TILE_SIZE * current_grid_size:
         print("Image size is too small for the selected grid size.")
-        return []
+        return None, []
+
+    stride = TILE_SIZE + TILE_SHADOW
+    atlas = pygame.Surface((stride * current_grid_size, stride * current_grid_size), pygame.SRCALPHA)
+    corner_mask = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+    pygame.draw.rect(corner_mask, (255, 255, 255, 255), corner_mask.get_rect(), border_radius=TILE_RADIUS)
 
+    rects = []
     for row in range(current_grid_size):
         for col in range(current_grid_size):
+            cell = pygame.Rect(col * stride, row * stride, stride, stride)
+            shadow = pygame.Rect(cell.x + TILE_SHADOW, cell.y + TILE_SHADOW, TILE_SIZE, TILE_SIZE)
+            pygame.draw.rect(atlas, (200, 200, 200), shadow, border_radius=TILE_RADIUS)
+
             tile_rect = pygame.Rect(col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-            tile = image.subsurface(tile_rect)
-            tiles_local.append(tile)
-    return tiles_local
+            tile = image.subsurface(tile_rect).convert_alpha()
+            tile.blit(corner_mask, (0, 0), special_flags=BLEND_RGBA_MIN)
+            atlas.blit(tile, cell.topleft)
+            rects.append(cell)
+    atlas = atlas.convert_alpha()
+
+    # The image is kept in the entry so its id cannot be reused while cached
+    atlas_cache[key] = (image, atlas, rects)
+    while len(atlas_cache) > ATLAS_CACHE_LIMIT:
+        del atlas_cache[next(iter(atlas_cache))]
+    return atlas, rects
+
+def next_grid_size():
+    sizes = list(GRID_OPTIONS)
+    return sizes[(sizes.index(current_grid_size) + 1) % len(sizes)]
+
+def count_misplaced(state):
+    return sum(1 for i, t in enumerate(state) if t and t != i + 1)
 
 def reset_game():
-    global tiles, empty_pos, moves, start_time, timer_active
+    global board, empty_pos, misplaced, tile_atlas, tile_rects, board_origins, moves, start_time, timer_active
+    cancel_solver()
     if original_image:
-        tiles = create_tiles(original_image)
-        tiles = shuffle_tiles(tiles)
-        empty_pos = current_grid_size ** 2 - 1
+        tile_atlas, tile_rects = build_tile_atlas(original_image)
+        board_origins = [((i % current_grid_size) * TILE_SIZE, (i // current_grid_size) * TILE_SIZE)
+                         for i in range(current_grid_size ** 2)]
+        board = list(scramble_state())
+        empty_pos = board.index(0)
+        misplaced = count_misplaced(board)
         moves = 0
         start_time = pygame.time.get_ticks()
         timer_active = True
 
-if image_data:
-    reset_game()
+# --- Solver integration ---
+
+def board_state():
+    """Current board as the integer tuple used by puzzle_solver (0 = empty)."""
+    return tuple(board)
+
+def tile_for_direction(direction):
+    """Board index of the tile that slides into the empty slot for ``direction``."""
+    return {
+        "up": empty_pos + current_grid_size,
+        "down": empty_pos - current_grid_size,
+        "left": empty_pos + 1,
+        "right": empty_pos - 1,
+    }[direction]
+
+def cancel_solver():
+    global solver_job, hint_pos, auto_solve_moves, solver_message
+    if solver_job:
+        solver_job['cancel'].set()  # The worker stops within a few thousand nodes
+    solver_job = None
+    hint_pos = None
+    auto_solve_moves = []
+    solver_message = ""
+
+def request_solution(purpose):
+    """Starts solving the current board on a background thread ('hint' or 'solve')."""
+    global solver_job, solver_message
+    if not board or (solver_job and solver_job['result'] is None):
+        return
+    if current_grid_size > MAX_SOLVER_SIZE:
+        solver_message = f"Hints are available up to {GRID_OPTIONS[MAX_SOLVER_SIZE]}."
+        return
+    job = {'state': board_state(), 'size': current_grid_size, 'purpose': purpose,
+           'cancel': threading.Event(), 'result': None}
+
+    def worker():
+        # Hints always search to the optimum, however long it takes (moving
+        # a tile cancels it); auto-solve may settle for a longer solution
+        limit = SOLVER_NODE_LIMIT if purpose == 'solve' else None
+        job['result'] = solve(job['state'], job['size'], cancel=job['cancel'], node_limit=limit)
+
+    solver_job = job
+    solver_message = "Solving..."
+    threading.Thread(target=worker, daemon=True).start()
+
+def poll_solver():
+    """Collects a finished solve and steps the auto-solve animation."""
+    global solver_job, hint_pos, auto_solve_moves, last_auto_step, solver_message
+    if solver_job and solver_job['result'] is not None:
+        job, solver_job = solver_job, None
+        result = job['result']
+        if job['state'] != board_state():
+            solver_message = ""  # Board changed while solving
+        elif not result.solvable:
+            solver_message = "This board is unsolvable."
+        elif not result.moves:
+            solver_message = "Already solved!"
+        else:
+            solver_message = (f"{'Optimal' if result.optimal else 'Not optimal'}: {len(result.moves)} moves "
+                              f"({result.nodes_per_second:,.0f} {result.node_unit}/s)")
+            if job['purpose'] == 'hint':
+                hint_pos = tile_for_direction(result.moves[0])
+            else:
+                auto_solve_moves = list(result.moves)
+                last_auto_step = pygame.time.get_ticks()
+
+    if auto_solve_moves and pygame.time.get_ticks() - last_auto_step >= AUTO_SOLVE_STEP_MS:
+        move_tile(auto_solve_moves.pop(0))
+        last_auto_step = pygame.time.get_ticks()
+
+reset_game()
 
 def move_tile(direction):
-    global empty_pos, moves, timer_active
+    global empty_pos, misplaced, moves, timer_active, finish_time, hint_pos
     row, col = empty_pos // current_grid_size, empty_pos % current_grid_size
     new_pos = None
 
@@ -286,22 +322,25 @@ def move_tile(direction):
         new_pos = empty_pos - 1
 
     if new_pos is not None:
-        tiles[empty_pos], tiles[new_pos] = tiles[new_pos], tiles[empty_pos]
+        hint_pos = None
+        tile = board[new_pos]
+        misplaced += (tile != empty_pos + 1) - (tile != new_pos + 1)
+        board[empty_pos], board[new_pos] = tile, 0
         empty_pos = new_pos
         moves += 1
         if slide_sound and sound_settings['slide_sound']:
             slide_sound.play()
+        if misplaced == 0 and timer_active:
+            # Just solved: stop the clock and celebrate once
+            timer_active = False
+            finish_time = pygame.time.get_ticks()
+            if win_sound:
+                win_sound.play()
         return True
     return False
 
 def is_solved():
-    for i in range(len(tiles) - 1):
-        expected_tile = original_image.subsurface(
-            (i % current_grid_size * TILE_SIZE, i // current_grid_size * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-        )
-        if tiles[i] != expected_tile:
-            return False
-    return True
+    return bool(board) and misplaced == 0
 
 # --- Emoji-aware text rendering ---
 
@@ -381,7 +420,7 @@ def draw_settings():
     grid_size_btn = draw_button(
         pygame.Rect(250, 390, 300, 50),
         ACCENT_4,
-        f"Switch to {GRID_OPTIONS[3 if current_grid_size == 4 else 4]}"
+        f"Switch to {GRID_OPTIONS[next_grid_size()]}"
     )
 
     quit_btn = draw_button(pygame.Rect(250, 450, 300, 50), ACCENT_4, "Quit Game")
@@ -395,7 +434,8 @@ def draw_sidebar():
 
     settings_btn = draw_button(pygame.Rect(610, 10, 180, 45), ACCENT_4, " Settings")
 
-    elapsed = (pygame.time.get_ticks() - start_time) // 1000 if timer_active else 0
+    end = pygame.time.get_ticks() if timer_active else finish_time
+    elapsed = (end - start_time) // 1000 if board else 0
     time_text = info_font.render(f"Time: {elapsed}s", True, TEXT_COLOR)
     screen.blit(time_text, (610, 75))
 
@@ -405,9 +445,9 @@ def draw_sidebar():
     y_offset = 155
 
     button_rects = []
-    visible_images = min(MAX_VISIBLE_IMAGES, len(image_data))
+    visible_images = min(MAX_VISIBLE_IMAGES, len(image_library))
     for i in range(visible_images):
-        filename, _ = image_data[i]
+        filename = image_library.filenames[i]
         btn_rect = pygame.Rect(610, y_offset, 180, 40)
         btn_color = HIGHLIGHT if i == current_image_idx else TILE_BG
         display_text = os.path.splitext(filename)[0][:12]
@@ -415,7 +455,7 @@ def draw_sidebar():
         button_rects.append(btn)
         y_offset += 50
 
-    if len(image_data) > MAX_VISIBLE_IMAGES:
+    if len(image_library) > MAX_VISIBLE_IMAGES:
         show_more_text = show_more.render("Show more", True, TEXT_COLOR)
         screen.blit(show_more_text, (660, y_offset + 5))
         show_more_btn = pygame.Rect(610, y_offset, 180, 45)
@@ -424,6 +464,7 @@ def draw_sidebar():
         show_more_btn = None
 
     upload_btn = draw_button(pygame.Rect(610, y_offset, 180, 45), ACCENT_3, "Upload Image")
+    draw_upload_progress(screen, show_more, upload_btn, TEXT_COLOR, ACCENT_3)
     y_offset += 50
 
     preview_btn = draw_button(pygame.Rect(610, y_offset, 180, 45), ACCENT_4, "Preview (P)")
@@ -434,6 +475,15 @@ def draw_sidebar():
 
     return button_rects, show_more_btn, upload_btn, preview_btn, reset_btn, settings_btn
 
+status_cache = (None, None)
+
+def render_status(text):
+    """Renders the status line, re-rendering only when the text changes."""
+    global status_cache
+    if status_cache[0] != text:
+        status_cache = (text, show_more.render(text, True, TEXT_COLOR))
+    return status_cache[1]
+
 def draw_puzzle():
     if show_preview:
         screen.blit(original_image, (0, 0))
@@ -444,24 +494,24 @@ def draw_puzzle():
         preview_text = header_font.render("Preview Mode", True, TEXT_COLOR)
         screen.blit(preview_text, (300 - preview_text.get_width()//2, 300))
     else:
-        for i, tile in enumerate(tiles):
-            if i != empty_pos:
-                row, col = i // current_grid_size, i % current_grid_size
-                x, y = col * TILE_SIZE, row * TILE_SIZE
+        # One blit per tile straight from the pre-baked atlas
+        for i, t in enumerate(board):
+            if t:
+                screen.blit(tile_atlas, board_origins[i], tile_rects[t - 1])
 
-                shadow = pygame.Rect(x + 3, y + 3, TILE_SIZE, TILE_SIZE)
-                pygame.draw.rect(screen, (200, 200, 200, 100), shadow, border_radius=5)
+        if hint_pos is not None:
+            x, y = board_origins[hint_pos]
+            pygame.draw.rect(screen, HIGHLIGHT, (x, y, TILE_SIZE, TILE_SIZE), 5, border_radius=TILE_RADIUS)
 
-                tile_surface = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-                pygame.draw.rect(tile_surface, (255, 255, 255), (0, 0, TILE_SIZE, TILE_SIZE), border_radius=5)
-                tile_surface.blit(tile, (0, 0))
-                screen.blit(tile_surface, (x, y))
+    status_text = render_status(solver_message or "H: hint   A: auto-solve   D: difficulty")
+    screen.blit(status_text, (300 - status_text.get_width()//2, 625 - status_text.get_height()//2))
 
 def main():
-    global current_image_idx, original_image, show_preview, timer_active, tiles, empty_pos, moves, start_time, image_data, show_settings, current_grid_size
+    global current_image_idx, original_image, show_preview, timer_active, moves, start_time, show_settings, current_grid_size, scramble_distance, solver_message
 
     running = True
     while running:
+        poll_solver()
         screen.fill(BACKGROUND)
 
         draw_puzzle()
@@ -471,10 +521,6 @@ def main():
         if show_settings:
             slide_btn, music_btn, vol_dec_btn, vol_inc_btn, grid_size_btn, quit_btn = draw_settings()
         if is_solved():
-            timer_active = False
-            if win_sound:
-                win_sound.play()
-
             overlay = pygame.Surface((600, 600), pygame.SRCALPHA)
             overlay.fill((255, 255, 255, 150))
             screen.blit(overlay, (0, 0))
@@ -485,21 +531,47 @@ def main():
             screen.blit(text_shadow, (303 - win_text.get_width()//2, 303 - win_text.get_height()//2))
             screen.blit(win_text, (300 - win_text.get_width()//2, 300 - win_text.get_height()//2))
 
-            stats_text = info_font.render(f"Time: {(pygame.time.get_ticks() - start_time) // 1000}s  Moves: {moves}", True, TEXT_COLOR)
+            stats_text = info_font.render(f"Time: {(finish_time - start_time) // 1000}s  Moves: {moves}", True, TEXT_COLOR)
             screen.blit(stats_text, (300 - stats_text.get_width()//2, 370 - stats_text.get_height()//2))
 
+        image_browser.draw(screen)
+
         for event in pygame.event.get():
+            if image_browser.handle_event(event):
+                continue
             if event.type == QUIT:
                 running = False
 
+            elif event.type == UPLOAD_DONE:
+                if event.surface is None:
+                    print(event.error)
+                else:
+                    current_image_idx = image_library.add(event.filename, event.surface)
+                    original_image = event.surface
+                    reset_game()
+
             elif event.type == KEYDOWN:
                 if event.key == K_p:
                     show_preview = not show_preview
                 elif event.key in (K_UP, K_DOWN, K_LEFT, K_RIGHT):
                     direction = ["up", "down", "left", "right"][[K_UP, K_DOWN, K_LEFT, K_RIGHT].index(event.key)]
-                    move_tile(direction)
+                    if move_tile(direction):
+                        cancel_solver()
                 elif event.key == K_r:
                     reset_game()
+                elif event.key == K_h:
+                    request_solution('hint')
+                elif event.key == K_d and current_grid_size == TABLE_SIZE:
+                    scramble_distance = SCRAMBLE_DISTANCES[
+                        (SCRAMBLE_DISTANCES.index(scramble_distance) + 1) % len(SCRAMBLE_DISTANCES)]
+                    reset_game()
+                    solver_message = f"New board: {scramble_distance} moves from solved"
+
+                elif event.key == K_a:
+                    if auto_solve_moves:
+                        cancel_solver()
+                    else:
+                        request_solution('solve')
 
             elif event.type == MOUSEBUTTONDOWN:
                 mouse_pos = pygame.mouse.get_pos()
@@ -514,7 +586,7 @@ def main():
                     elif vol_inc_btn.collidepoint(mouse_pos):
                         adjust_music_volume(0.1)
                     elif grid_size_btn.collidepoint(mouse_pos):
-                        current_grid_size = 4 if current_grid_size == 3 else 3
+                        current_grid_size = next_grid_size()
                         reset_game()  # Reset the game with the new grid size
                     elif quit_btn.collidepoint(mouse_pos):
                         running = False
@@ -528,36 +600,65 @@ def main():
                     elif reset_btn.collidepoint(mouse_pos):
                         reset_game()
                     elif upload_btn.collidepoint(mouse_pos):
-                        uploaded = upload_image()
-                        if uploaded:
-                            image_data.append(uploaded)
-                            current_image_idx = len(image_data) - 1
-                            original_image = image_data[current_image_idx][1]
-                            reset_game()
+                        upload_image()
                     elif show_more_btn and show_more_btn.collidepoint(mouse_pos):
-                        show_image_popup()
+                        image_browser.open()
                     else:
                         for i, btn_rect in enumerate(button_rects):
                             if btn_rect.collidepoint(mouse_pos) and i != current_image_idx:
                                 current_image_idx = i
-                                original_image = image_data[current_image_idx][1]
+                                original_image = image_library.load(current_image_idx)
                                 reset_game()
                                 break
 
-                        if mouse_pos[0] < 600:
-                            clicked_col = mouse_pos[0] // TILE_SIZE
-                            clicked_row = mouse_pos[1] // TILE_SIZE
+                        clicked_col = mouse_pos[0] // TILE_SIZE
+                        clicked_row = mouse_pos[1] // TILE_SIZE
+                        if clicked_col < current_grid_size and clicked_row < current_grid_size:
                             clicked_pos = clicked_row * current_grid_size + clicked_col
 
                             if abs(clicked_pos - empty_pos) == 1 and clicked_pos // current_grid_size == empty_pos // current_grid_size:
                                 direction = "left" if clicked_pos > empty_pos else "right"
-                                move_tile(direction)
+                                if move_tile(direction):
+                                    cancel_solver()
                             elif abs(clicked_pos - empty_pos) == current_grid_size:
                                 direction = "up" if clicked_pos > empty_pos else "down"
-                                move_tile(direction)
+                                if move_tile(direction):
+                                    cancel_solver()
 
         pygame.display.flip()
         clock.tick(FPS)
 
+# ------------------ SCENE ----------------------------------
+class SlidingPuzzleScene(Scene):
+    """
+    The board is set up when the module is imported and kept in its
+    globals, so entering only takes over the window and suspending keeps
+    the board, timer and any running solve as they are.
+    """
+    caption = "Sliding Puzzle Pro"
+
+    def run(self):
+        main()
+
+    def suspend(self):
+        super().suspend()
+        pygame.mixer.music.stop()
+
+    def resume(self, screen):
+        global start_time, last_auto_step
+        super().resume(screen)
+        paused = self.suspended_ms()
+        if timer_active:
+            start_time += paused  # The timer does not run while suspended
+        last_auto_step += paused
+        if sound_settings['background_music']:
+            play_background_music()
+
+    def exit(self):
+        cancel_solver()
+
 def run_sliding_puzzle():
-    main()      # launches the sliding puzzle
\ No newline at end of file
+    scene = SlidingPuzzleScene()
+    scene.enter(shared_screen())
+    scene.run()      # launches the sliding puzzle
+    scene.suspend()
\ No newline at end of file
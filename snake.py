@@ -3,9 +3,9 @@
 # -----------------------------------------------------------
 import pygame
 import random
-import sys
 import math
 from pygame.locals import *
+from scene import Scene, shared_screen
 
 # ------------------ CONSTANTS ------------------------------
 SNAKE_CELL_SIZE = 20
@@ -36,9 +36,8 @@ RIGHT = (1, 0)
 
 # ------------------ SNAKE GAME CLASS -----------------------
 class SnakeGame:
-    def __init__(self):
-        self.screen = pygame.display.set_mode((SNAKE_SCREEN_WIDTH, SNAKE_SCREEN_HEIGHT))
-        pygame.display.set_caption("Snake Game")
+    def __init__(self, screen=None):
+        self.screen = screen or shared_screen()
         self.clock = pygame.time.Clock()
         
         # Load fonts
@@ -169,8 +168,9 @@ class SnakeGame:
     def handle_events(self):
         for event in pygame.event.get():
             if event.type == QUIT:
-                pygame.quit()
-                sys.exit()
+                # Back to the menu, which closes every scene before quitting
+                pygame.event.post(pygame.event.Event(QUIT))
+                return False
             elif event.type == KEYDOWN:
                 if self.game_over:
                     if event.key == K_r:
@@ -466,10 +466,30 @@ class SnakeGame:
         
         return True  # Return to menu
 
+# ------------------ SNAKE SCENE ----------------------------
+class SnakeScene(Scene):
+    """
+    Wraps a SnakeGame. The game advances by frames, not wall time, so a
+    suspended game simply continues where it stopped.
+    """
+    caption = "Snake Game"
+
+    def enter(self, screen):
+        super().enter(screen)
+        self.game = SnakeGame(screen)
+
+    def resume(self, screen):
+        super().resume(screen)
+        self.game.screen = screen
+
+    def run(self):
+        self.game.run()
+
 # ------------------ SNAKE GAME ENTRY POINT -----------------
 def run_snake():
-    game = SnakeGame()
-    game.run()
+    scene = SnakeScene()
+    scene.enter(shared_screen())
+    scene.run()
 
 # For testing the game directly
 if __name__ == "__main__":
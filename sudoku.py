@@ -5,6 +5,7 @@ import pygame
 import random
 import time
 from pygame.locals import *
+from scene import Scene, shared_screen
 
 # ------------------ SUDOKU GENERATION ----------------------
 def generate_sudoku(difficulty=0.5):
@@ -282,196 +283,229 @@ class SudokuGame:
         
         return incorrect_cells
 
-# ------------------ SUDOKU MAIN FUNCTION -------------------
-def run_sudoku():
+# ------------------ PREFETCH -------------------------------
+prepared_game = None  # First puzzle, generated ahead of time by the launcher
+
+def prepare_game(difficulty=0.5):
     """
-    Main function to run the Sudoku game.
-    Handles the game loop, user input, and rendering.
+    Generates the first puzzle in advance. Pure Python, so the launcher
+    can call it from its prefetch thread.
     """
-    pygame.init()
-    # Set up the display window (same size as main menu)
-    screen = pygame.display.set_mode((800, 650))
-    pygame.display.set_caption("Sudoku")
-    clock = pygame.time.Clock()
-    
-    # Load fonts with fallback to system fonts if custom font isn't available
-    try:
-        font = pygame.font.Font("assets/fonts/cute.ttf", 36)
-        small_font = pygame.font.Font("assets/fonts/cute.ttf", 24)
-        title_font = pygame.font.Font("assets/fonts/cute.ttf", 40)
-    except:
-        font = pygame.font.SysFont("comicsansms", 36)
-        small_font = pygame.font.SysFont("comicsansms", 24)
-        title_font = pygame.font.SysFont("comicsansms", 40)
-    
-    # Create a new Sudoku game with medium difficulty
-    game = SudokuGame(difficulty=0.5)
-    
-    # Define button positions and sizes
-    new_game_btn = pygame.Rect(50, 80, 120, 40)
-    check_btn = pygame.Rect(200, 80, 120, 40)
-    solve_btn = pygame.Rect(350, 80, 120, 40)
-    back_btn = pygame.Rect(630, 80, 150, 40)
-    
-    # Initialize game state variables
-    start_time = time.time()  # For the timer
-    running = True
-    message = ""
-    message_timer = 0
-    incorrect_cells = []
-    showing_solution = False
-    
-    # Main game loop
-    while running:
-        # Fill the screen with the background color
-        screen.fill((249, 246, 239))
+    global prepared_game
+    prepared_game = SudokuGame(difficulty=difficulty)
+    return prepared_game
+
+# ------------------ SUDOKU SCENE --------------------------
+class SudokuScene(Scene):
+    """
+    The Sudoku screen. Its puzzle, timer and messages are attributes, so
+    going back to the menu suspends the game instead of discarding it.
+    """
+    caption = "Sudoku"
+
+    def enter(self, screen):
+        global prepared_game
+        super().enter(screen)
+        self.clock = pygame.time.Clock()
+
+        # Load fonts with fallback to system fonts if custom font isn't available
+        try:
+            self.font = pygame.font.Font("assets/fonts/cute.ttf", 36)
+            self.small_font = pygame.font.Font("assets/fonts/cute.ttf", 24)
+            self.title_font = pygame.font.Font("assets/fonts/cute.ttf", 40)
+        except:
+            self.font = pygame.font.SysFont("comicsansms", 36)
+            self.small_font = pygame.font.SysFont("comicsansms", 24)
+            self.title_font = pygame.font.SysFont("comicsansms", 40)
+
+        # Create a new Sudoku game with medium difficulty, unless one was prefetched
+        self.game = prepared_game or SudokuGame(difficulty=0.5)
+        prepared_game = None
+
+        # Define button positions and sizes
+        self.new_game_btn = pygame.Rect(50, 80, 120, 40)
+        self.check_btn = pygame.Rect(200, 80, 120, 40)
+        self.solve_btn = pygame.Rect(350, 80, 120, 40)
+        self.back_btn = pygame.Rect(630, 80, 150, 40)
+
+        # Initialize game state variables
+        self.start_time = time.time()  # For the timer
+        self.message = ""
+        self.message_timer = 0
+        self.incorrect_cells = []
+        self.showing_solution = False
+
+    def resume(self, screen):
+        super().resume(screen)
+        self.start_time += self.suspended_ms() / 1000  # The timer does not run while suspended
+
+    def run(self):
+        """
+        Handles the game loop, user input, and rendering until the player
+        goes back to the menu.
+        """
+        running = True
+
+        # Main game loop
+        while running:
+            # Fill the screen with the background color
+            self.screen.fill((249, 246, 239))
         
-        # Calculate and format elapsed time
-        elapsed_time = time.time() - start_time
-        minutes = int(elapsed_time // 60)
-        seconds = int(elapsed_time % 60)
+            # Calculate and format elapsed time
+            elapsed_time = time.time() - self.start_time
+            minutes = int(elapsed_time // 60)
+            seconds = int(elapsed_time % 60)
         
-        # Draw the game title
-        title = title_font.render("Sudoku Puzzle", True, (90, 90, 140))
-        screen.blit(title, (400 - title.get_width()//2, 30))
+            # Draw the game title
+            title = self.title_font.render("Sudoku Puzzle", True, (90, 90, 140))
+            self.screen.blit(title, (400 - title.get_width()//2, 30))
         
-        # Draw the timer in the top right corner
-        timer_text = small_font.render(f"Time: {minutes:02d}:{seconds:02d}", True, (100, 100, 100))
-        screen.blit(timer_text, (650, 30))
+            # Draw the timer in the top right corner
+            timer_text = self.small_font.render(f"Time: {minutes:02d}:{seconds:02d}", True, (100, 100, 100))
+            self.screen.blit(timer_text, (650, 30))
         
-        # Draw the Sudoku grid and numbers
-        game.draw(screen, font, small_font)
+            # Draw the Sudoku grid and numbers
+            self.game.draw(self.screen, self.font, self.small_font)
         
-        # Highlight incorrect cells if we're showing the solution
-        if showing_solution:
-            for row, col in incorrect_cells:
-                # Draw a red background for incorrect cells
-                cell_rect = pygame.Rect(
-                    game.offset_x + col * game.cell_size,
-                    game.offset_y + row * game.cell_size,
-                    game.cell_size, game.cell_size
-                )
-                pygame.draw.rect(screen, (255, 200, 200), cell_rect)
+            # Highlight incorrect cells if we're showing the solution
+            if self.showing_solution:
+                for row, col in self.incorrect_cells:
+                    # Draw a red background for incorrect cells
+                    cell_rect = pygame.Rect(
+                        self.game.offset_x + col * self.game.cell_size,
+                        self.game.offset_y + row * self.game.cell_size,
+                        self.game.cell_size, self.game.cell_size
+                    )
+                    pygame.draw.rect(self.screen, (255, 200, 200), cell_rect)
                 
-                # Redraw the number in red to indicate it's incorrect
-                if game.board[row][col] != 0:
-                    num_text = font.render(str(game.board[row][col]), True, (220, 0, 0))
-                    # Center the number in the cell
-                    text_x = game.offset_x + col * game.cell_size + (game.cell_size - num_text.get_width()) // 2
-                    text_y = game.offset_y + row * game.cell_size + (game.cell_size - num_text.get_height()) // 2
-                    screen.blit(num_text, (text_x, text_y))
+                    # Redraw the number in red to indicate it's incorrect
+                    if self.game.board[row][col] != 0:
+                        num_text = self.font.render(str(self.game.board[row][col]), True, (220, 0, 0))
+                        # Center the number in the cell
+                        text_x = self.game.offset_x + col * self.game.cell_size + (self.game.cell_size - num_text.get_width()) // 2
+                        text_y = self.game.offset_y + row * self.game.cell_size + (self.game.cell_size - num_text.get_height()) // 2
+                        self.screen.blit(num_text, (text_x, text_y))
         
-        # Draw buttons with nice colors
-        button_colors = [
-            (180, 230, 180),  # New Game - Light green
-            (180, 200, 230),  # Check - Light blue
-            (230, 200, 180),  # Solve - Light orange
-            (220, 220, 220)   # Back - Light gray
-        ]
+            # Draw buttons with nice colors
+            button_colors = [
+                (180, 230, 180),  # New Game - Light green
+                (180, 200, 230),  # Check - Light blue
+                (230, 200, 180),  # Solve - Light orange
+                (220, 220, 220)   # Back - Light gray
+            ]
         
-        buttons = [new_game_btn, check_btn, solve_btn, back_btn]
-        button_texts = ["New Game", "Check", "Solve", "Back to Menu"]
+            buttons = [self.new_game_btn, self.check_btn, self.solve_btn, self.back_btn]
+            button_texts = ["New Game", "Check", "Solve", "Back to Menu"]
         
-        for i, (btn, text) in enumerate(zip(buttons, button_texts)):
-            # Draw button background
-            pygame.draw.rect(screen, button_colors[i], btn, border_radius=8)
-            # Draw button border
-            pygame.draw.rect(screen, (150, 150, 150), btn, 2, border_radius=8)
+            for i, (btn, text) in enumerate(zip(buttons, button_texts)):
+                # Draw button background
+                pygame.draw.rect(self.screen, button_colors[i], btn, border_radius=8)
+                # Draw button border
+                pygame.draw.rect(self.screen, (150, 150, 150), btn, 2, border_radius=8)
             
-            # Draw button text
-            btn_text = small_font.render(text, True, (50, 50, 50))
-            screen.blit(btn_text, (btn.centerx - btn_text.get_width()//2, 
-                                  btn.centery - btn_text.get_height()//2))
+                # Draw button text
+                btn_text = self.small_font.render(text, True, (50, 50, 50))
+                self.screen.blit(btn_text, (btn.centerx - btn_text.get_width()//2, 
+                                           btn.centery - btn_text.get_height()//2))
         
-        # Draw message with a colored background if there is one to display
-        if message and message_timer > 0:
-            # Create a background for the message
-            msg_bg = pygame.Rect(300 - small_font.size(message)[0]//2 - 10, 
-                                590, small_font.size(message)[0] + 20, 30)
-            pygame.draw.rect(screen, (240, 240, 240), msg_bg, border_radius=5)
-            pygame.draw.rect(screen, (200, 200, 200), msg_bg, 2, border_radius=5)
+            # Draw message with a colored background if there is one to display
+            if self.message and self.message_timer > 0:
+                # Create a background for the message
+                msg_bg = pygame.Rect(300 - self.small_font.size(self.message)[0]//2 - 10, 
+                                    590, self.small_font.size(self.message)[0] + 20, 30)
+                pygame.draw.rect(self.screen, (240, 240, 240), msg_bg, border_radius=5)
+                pygame.draw.rect(self.screen, (200, 200, 200), msg_bg, 2, border_radius=5)
             
-            # Draw the message text
-            msg_text = small_font.render(message, True, (70, 70, 70))
-            screen.blit(msg_text, (400 - msg_text.get_width()//2, 595))
-            message_timer -= 1
+                # Draw the message text
+                msg_text = self.small_font.render(self.message, True, (70, 70, 70))
+                self.screen.blit(msg_text, (400 - msg_text.get_width()//2, 595))
+                self.message_timer -= 1
         
-        # Update the display
-        pygame.display.flip()
+            # Update the display
+            pygame.display.flip()
         
-        # Handle events
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                running = False
+            # Handle events
+            for event in pygame.event.get():
+                if event.type == QUIT:
+                    running = False
                 
-            if event.type == MOUSEBUTTONDOWN:
-                pos = pygame.mouse.get_pos()
+                if event.type == MOUSEBUTTONDOWN:
+                    pos = pygame.mouse.get_pos()
                 
-                # Handle button clicks
-                if new_game_btn.collidepoint(pos):
-                    # Start a new game
-                    game = SudokuGame(difficulty=0.5)
-                    start_time = time.time()  # Reset timer
-                    message = "New game started!"
-                    message_timer = 60
-                    incorrect_cells = []
-                    showing_solution = False
+                    # Handle button clicks
+                    if self.new_game_btn.collidepoint(pos):
+                        # Start a new game
+                        self.game = SudokuGame(difficulty=0.5)
+                        self.start_time = time.time()  # Reset timer
+                        self.message = "New game started!"
+                        self.message_timer = 60
+                        self.incorrect_cells = []
+                        self.showing_solution = False
                     
-                elif check_btn.collidepoint(pos):
-                    # Check the current solution
-                    if is_board_complete(game.board):
-                        incorrect_cells = game.check_solution()
-                        if not incorrect_cells:
-                            message = "Congratulations! Puzzle solved correctly!"
-                            showing_solution = False
+                    elif self.check_btn.collidepoint(pos):
+                        # Check the current solution
+                        if is_board_complete(self.game.board):
+                            self.incorrect_cells = self.game.check_solution()
+                            if not self.incorrect_cells:
+                                self.message = "Congratulations! Puzzle solved correctly!"
+                                self.showing_solution = False
+                            else:
+                                self.message = f"Found {len(self.incorrect_cells)} incorrect cells!"
+                                self.showing_solution = True
                         else:
-                            message = f"Found {len(incorrect_cells)} incorrect cells!"
-                            showing_solution = True
-                    else:
-                        message = "Puzzle is not complete yet!"
-                    message_timer = 60
+                            self.message = "Puzzle is not complete yet!"
+                        self.message_timer = 60
                     
-                elif solve_btn.collidepoint(pos):
-                    # Show all incorrect cells
-                    incorrect_cells = game.check_solution()
-                    message = f"Found {len(incorrect_cells)} incorrect cells!"
-                    message_timer = 60
-                    showing_solution = True
+                    elif self.solve_btn.collidepoint(pos):
+                        # Show all incorrect cells
+                        self.incorrect_cells = self.game.check_solution()
+                        self.message = f"Found {len(self.incorrect_cells)} incorrect cells!"
+                        self.message_timer = 60
+                        self.showing_solution = True
                     
-                elif back_btn.collidepoint(pos):
-                    # Return to main menu
-                    running = False
+                    elif self.back_btn.collidepoint(pos):
+                        # Return to main menu
+                        running = False
                     
-                else:
-                    # Handle grid clicks
-                    game.handle_click(pos)
+                    else:
+                        # Handle grid clicks
+                        self.game.handle_click(pos)
             
-            if event.type == KEYDOWN:
-                # Handle keyboard input
-                if event.key == K_ESCAPE:
-                    running = False
-                elif event.key in (K_1, K_KP1):
-                    game.place_number(1)
-                elif event.key in (K_2, K_KP2):
-                    game.place_number(2)
-                elif event.key in (K_3, K_KP3):
-                    game.place_number(3)
-                elif event.key in (K_4, K_KP4):
-                    game.place_number(4)
-                elif event.key in (K_5, K_KP5):
-                    game.place_number(5)
-                elif event.key in (K_6, K_KP6):
-                    game.place_number(6)
-                elif event.key in (K_7, K_KP7):
-                    game.place_number(7)
-                elif event.key in (K_8, K_KP8):
-                    game.place_number(8)
-                elif event.key in (K_9, K_KP9):
-                    game.place_number(9)
-                elif event.key in (K_BACKSPACE, K_DELETE, K_0):
-                    game.place_number(0)
+                if event.type == KEYDOWN:
+                    # Handle keyboard input
+                    if event.key == K_ESCAPE:
+                        running = False
+                    elif event.key in (K_1, K_KP1):
+                        self.game.place_number(1)
+                    elif event.key in (K_2, K_KP2):
+                        self.game.place_number(2)
+                    elif event.key in (K_3, K_KP3):
+                        self.game.place_number(3)
+                    elif event.key in (K_4, K_KP4):
+                        self.game.place_number(4)
+                    elif event.key in (K_5, K_KP5):
+                        self.game.place_number(5)
+                    elif event.key in (K_6, K_KP6):
+                        self.game.place_number(6)
+                    elif event.key in (K_7, K_KP7):
+                        self.game.place_number(7)
+                    elif event.key in (K_8, K_KP8):
+                        self.game.place_number(8)
+                    elif event.key in (K_9, K_KP9):
+                        self.game.place_number(9)
+                    elif event.key in (K_BACKSPACE, K_DELETE, K_0):
+                        self.game.place_number(0)
         
-        # Cap the frame rate
-        clock.tick(60)
-    
-    return
\ No newline at end of file
+            # Cap the frame rate
+            self.clock.tick(60)
+
+# ------------------ SUDOKU MAIN FUNCTION -------------------
+def run_sudoku():
+    """
+    Main function to run the Sudoku game on its own.
+    """
+    pygame.init()
+    scene = SudokuScene()
+    scene.enter(shared_screen())
+    scene.run()
+    scene.suspend()
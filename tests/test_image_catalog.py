@@ -0,0 +1,70 @@
+import os
+import shutil
+
+import pytest
+from PIL import Image
+
+from image_catalog import ImageCatalog, file_hash
+
+EXTENSIONS = (".jpg", ".png")
+
+@pytest.fixture
+def folder(tmp_path):
+    images = tmp_path / "images"
+    images.mkdir()
+    Image.new("RGB", (40, 30), "red").save(images / "image1.jpg")
+    Image.new("RGB", (20, 20), "blue").save(images / "image2.png")
+    Image.new("RGB", (20, 20), "blue").save(images / "image5.png")  # Same pixels, same bytes
+    return images
+
+@pytest.fixture
+def catalog(folder, tmp_path):
+    catalog = ImageCatalog(str(folder), EXTENSIONS, path=str(tmp_path / "catalog.sqlite3"))
+    catalog.sync()
+    yield catalog
+    catalog.close()
+
+def test_listing_and_numbers(catalog, folder):
+    assert catalog.filenames() == ["image1.jpg", "image2.png", "image5.png"]
+    assert catalog.next_number() == 6
+    digest, width, height, source = catalog.lookup("image1.jpg")
+    assert (digest, width, height, source) == (file_hash(str(folder / "image1.jpg")), 40, 30, None)
+    assert "image9.jpg" not in catalog
+
+def test_duplicates_are_found_by_content(catalog, folder):
+    assert catalog.find_hash(file_hash(str(folder / "image2.png"))) == "image2.png"
+    assert catalog.find_hash("0" * 64) is None
+
+def test_upload_is_found_by_its_source_hash(catalog, folder):
+    Image.new("RGB", (30, 30), "green").save(folder / "image6.jpg")
+    catalog.add("image6.jpg", "uploadhash", (30, 30))
+    assert catalog.find_hash("uploadhash") == "image6.jpg"
+    assert catalog.find_hash(file_hash(str(folder / "image6.jpg"))) == "image6.jpg"
+    assert catalog.next_number() == 7
+    os.utime(folder / "image6.jpg", ns=(1, 1))  # Touched, not changed
+    assert catalog.lookup("image6.jpg")[3] == "uploadhash"
+
+def test_sync_sees_added_and_removed_files(catalog, folder):
+    assert not catalog.sync()  # Folder unchanged
+    shutil.copy(folder / "image1.jpg", folder / "photo.jpg")
+    os.remove(folder / "image5.png")
+    (folder / "notes.txt").write_text("not an image")
+    assert catalog.sync()
+    assert catalog.filenames() == ["image1.jpg", "image2.png", "photo.jpg"]
+    assert catalog.find_hash(file_hash(str(folder / "photo.jpg"))) == "image1.jpg"
+
+def test_file_overwritten_in_place_is_rehashed(catalog, folder):
+    catalog.add("image1.jpg", "uploadhash", (40, 30))
+    old = catalog.lookup("image1.jpg")[0]
+    Image.new("RGB", (50, 50), "white").save(folder / "image1.jpg")
+    os.utime(folder / "image1.jpg", ns=(2, 2))
+    assert catalog.lookup("image1.jpg")[:3] == (file_hash(str(folder / "image1.jpg")), 50, 50)
+    assert catalog.find_hash(old) is None
+    assert catalog.find_hash("uploadhash") is None  # No longer what was uploaded
+
+def test_catalog_survives_reopening(catalog, folder, tmp_path):
+    catalog.add("image2.png", "uploadhash", (20, 20))
+    reopened = ImageCatalog(str(folder), EXTENSIONS, path=catalog.path)
+    assert not reopened.sync()
+    assert reopened.find_hash("uploadhash") == "image2.png"
+    reopened.close()
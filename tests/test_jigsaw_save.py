@@ -0,0 +1,71 @@
+import pytest
+
+from jigsaw_save import _HEADER_V1, _MAGIC_V1, decode_save, encode_save, load_save, take_snapshot, write_save
+from piece_groups import PieceGroups
+
+ROWS, COLS = 3, 4
+
+def board():
+    """Pieces 0-5 on the board in three groups; the rest in the carousel."""
+    groups = PieceGroups()
+    for id in range(6):
+        groups.add(id, (id % COLS * 50, id // COLS * 50, 50, 50), (10 * id, -5 * id), turn=id % 4)
+    groups.union(0, 1)
+    groups.union(0, 4)
+    groups.union(2, 3)
+    z = {groups.find(0): 2, groups.find(2): 0, groups.find(5): 1}
+    turns = bytes([0] * 6 + [1, 2, 3, 0, 1, 2])
+    return groups, z, turns
+
+def test_round_trip():
+    groups, z, turns = board()
+    snapshot = take_snapshot("image3.jpg", 123456789, ROWS, COLS, 98765, groups, z, turns, True)
+    save = decode_save(encode_save(snapshot))
+    assert (save.image, save.seed, save.rows, save.cols, save.elapsed_ms, save.rotate) == \
+           ("image3.jpg", 123456789, ROWS, COLS, 98765, True)
+    # Groups are stored bottom of the stack first
+    order = sorted(z, key=z.get)
+    for id in range(ROWS * COLS):
+        if id in groups:
+            root = groups.find(id)
+            assert save.groups[id] == order.index(root)
+            assert save.turns[id] == groups.turn[root]
+        else:
+            assert save.groups[id] == -1
+            assert save.turns[id] == turns[id]
+    assert save.offsets == [tuple(groups.offset[root]) for root in order]
+
+def test_moving_group_is_saved_where_it_came_from():
+    groups, z, turns = board()
+    root = groups.find(0)
+    snapshot = take_snapshot("a.png", 1, ROWS, COLS, 0, groups, z, turns, False, moving={root: ((7, 8), 3)})
+    save = decode_save(encode_save(snapshot))
+    index = sorted(z, key=z.get).index(root)
+    assert save.offsets[index] == (7, 8)
+    assert save.turns[0] == save.turns[1] == 3
+    assert not save.rotate
+
+def test_version_1_loads_upright():
+    name = "image1.jpg".encode("utf-8")
+    groups = [0, 0, -1, 1] + [-1] * (ROWS * COLS - 4)
+    data = (_HEADER_V1.pack(_MAGIC_V1, 42, ROWS, COLS, 1500, len(name), 2) + name
+            + b"".join(g.to_bytes(4, "little", signed=True) for g in groups)
+            + b"".join(v.to_bytes(4, "little", signed=True) for v in (3, -4, 100, 200)))
+    save = decode_save(data)
+    assert (save.image, save.seed, save.elapsed_ms) == ("image1.jpg", 42, 1500)
+    assert save.groups == groups
+    assert save.offsets == [(3, -4), (100, 200)]
+    assert save.turns == bytes(ROWS * COLS)
+    assert not save.rotate
+
+def test_damaged_saves_are_rejected(tmp_path):
+    groups, z, turns = board()
+    data = encode_save(take_snapshot("image3.jpg", 1, ROWS, COLS, 0, groups, z, turns, False))
+    with pytest.raises(ValueError):
+        decode_save(b"NOTASAVE" + data[8:])
+    path = str(tmp_path / "jigsaw.sav")
+    write_save(path, data[:-20])  # Cut short
+    assert load_save(path) is None
+    write_save(path, data)
+    assert load_save(path).image == "image3.jpg"
+    assert load_save(str(tmp_path / "missing.sav")) is None
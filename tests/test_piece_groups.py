@@ -0,0 +1,55 @@
+import pygame
+
+from piece_groups import PieceGroups, turn_pixel, turn_rect
+
+def row_of_pieces(count):
+    groups = PieceGroups()
+    for id in range(count):
+        groups.add(id, (id * 10, 0, 10, 10), (id, 0))
+    return groups
+
+def test_union_merges_members_and_keeps_the_first_placement():
+    groups = row_of_pieces(4)
+    groups.offset[2] = [5, 6]
+    groups.turn[2] = 1
+    root = groups.union(2, 3)
+    assert groups.find(2) == groups.find(3) == root
+    assert sorted(groups.members[root]) == [2, 3]
+    assert groups.offset[root] == [5, 6] and groups.turn[root] == 1
+    assert groups.bounds[root] == pygame.Rect(20, 0, 20, 10)
+    assert len(groups) == 3
+
+def test_union_by_size_and_repeat_union():
+    groups = row_of_pieces(6)
+    for id in (1, 2, 3):
+        groups.union(0, id)
+    big = groups.find(0)
+    root = groups.union(4, 0)  # The smaller group joins the larger one's root
+    assert root == big
+    assert groups.offset[root] == [4, 0]  # But the kept group's placement wins
+    assert groups.union(1, 4) == root
+    assert groups.group_size(4) == 5
+    assert groups.find(5) == 5 and len(groups) == 2
+    assert set(groups.offset) == set(groups.turn) == set(groups.bounds) == set(groups.members)
+
+def test_find_compresses_paths():
+    groups = row_of_pieces(4)
+    groups.union(1, 0)
+    groups.union(2, 3)
+    root = groups.union(1, 2)
+    for id in range(4):
+        groups.find(id)
+    assert all(groups.parent[id] == root for id in range(4))
+
+def test_turns_and_rotation():
+    rect = pygame.Rect(3, 4, 10, 20)
+    for turn in range(4):
+        corner = turn_pixel(rect.topleft, turn)
+        assert turn_rect(rect, turn).collidepoint(corner)
+    assert turn_rect(turn_rect(rect, 1), 3) == rect
+    groups = row_of_pieces(1)
+    pivot = (5, 5)
+    for _ in range(4):
+        groups.rotate(0, pivot)
+        assert groups.to_home(0, pivot) == (5, 5)  # The pivot stays put
+    assert groups.turn[0] == 0 and groups.rect(0) == pygame.Rect(0, 0, 10, 10).move(groups.offset[0])
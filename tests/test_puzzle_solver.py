@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from distance_table import load_distance_table
+from puzzle_solver import LinearConflictHeuristic, apply_move, goal_state, hint, neighbor_table, solve
+
+def scrambled(size, moves, seed):
+    """A board ``moves`` random tile slides from solved (no immediate undo)."""
+    rng = random.Random(seed)
+    state = goal_state(size)
+    previous = None
+    for _ in range(moves):
+        blank = state.index(0)
+        options = [nb for nb, _ in neighbor_table(size)[blank] if nb != previous]
+        nb = rng.choice(options)
+        board = list(state)
+        board[blank], board[nb] = board[nb], 0
+        state, previous = tuple(board), blank
+    return state
+
+def bfs_distance(state, size):
+    """Optimal distance by breadth-first search from both ends."""
+    goal = goal_state(size)
+    if state == goal:
+        return 0
+    seen = [{state: 0}, {goal: 0}]
+    frontiers = [[state], [goal]]
+    depth = [0, 0]
+    while True:
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        depth[side] += 1
+        following = []
+        for board in frontiers[side]:
+            blank = board.index(0)
+            for nb, _ in neighbor_table(size)[blank]:
+                child = list(board)
+                child[blank], child[nb] = child[nb], 0
+                child = tuple(child)
+                if child in seen[side]:
+                    continue
+                if child in seen[1 - side]:
+                    return depth[side] + seen[1 - side][child]
+                seen[side][child] = depth[side]
+                following.append(child)
+        frontiers[side] = following
+
+def replay(state, size, moves):
+    for direction in moves:
+        state = apply_move(state, size, direction)
+        assert state is not None, f"illegal move {direction}"
+    return state
+
+@pytest.mark.parametrize("seed", range(5))
+def test_3x3_solutions_are_optimal(seed):
+    state = scrambled(3, 40, seed)
+    result = solve(state, 3, heuristic=LinearConflictHeuristic(3))
+    assert result.optimal
+    assert replay(state, 3, result.moves) == goal_state(3)
+    assert len(result.moves) == bfs_distance(state, 3)
+
+@pytest.mark.parametrize("seed", range(3))
+def test_4x4_solutions_are_optimal(seed):
+    state = scrambled(4, 30, seed)
+    result = solve(state, 4, heuristic=LinearConflictHeuristic(4))
+    assert result.optimal
+    assert replay(state, 4, result.moves) == goal_state(4)
+    assert len(result.moves) == bfs_distance(state, 4)
+
+def test_4x4_default_heuristic_is_optimal():
+    # The pattern databases when they are built, linear conflicts otherwise
+    state = scrambled(4, 30, 7)
+    result = solve(state, 4)
+    assert result.optimal
+    assert len(result.moves) == bfs_distance(state, 4)
+
+def test_hint_starts_an_optimal_solution():
+    state = scrambled(4, 24, 3)
+    distance = bfs_distance(state, 4)
+    assert bfs_distance(apply_move(state, 4, hint(state, 4)), 4) == distance - 1
+
+def test_node_limit_falls_back_to_a_labelled_solution():
+    state = scrambled(4, 60, 11)
+    result = solve(state, 4, heuristic=LinearConflictHeuristic(4), node_limit=100)
+    assert not result.optimal
+    assert replay(state, 4, result.moves) == goal_state(4)
+
+def test_unsolvable_board_is_rejected():
+    board = list(goal_state(3))
+    board[0], board[1] = board[1], board[0]
+    result = solve(tuple(board), 3)
+    assert not result.solvable
+
+def test_distance_table_agrees_with_ida_star():
+    table = load_distance_table()
+    heuristic = LinearConflictHeuristic(3)
+    rng = random.Random(5)
+    for distance in (0, 1, 9, 17, 25, table.max_distance):
+        state = table.scramble(distance, rng)
+        assert table.distance(state) == min(distance, table.max_distance)
+        moves = table.solution(state)
+        assert replay(state, 3, moves) == goal_state(3)
+        assert len(moves) == len(solve(state, 3, heuristic=heuristic).moves) == table.distance(state)
+    assert table.max_distance == 31
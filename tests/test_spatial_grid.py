@@ -0,0 +1,49 @@
+from spatial_grid import SpatialGrid
+
+def test_topmost_follows_stacking_order():
+    grid = SpatialGrid(50)
+    grid.insert("a", (0, 0, 100, 100))
+    grid.insert("b", (50, 50, 100, 100))
+    assert grid.topmost_at((75, 75)) == "b"
+    assert grid.topmost_at((25, 25)) == "a"
+    assert grid.topmost_at((175, 175)) is None
+    grid.raise_to_top("a")
+    assert grid.topmost_at((75, 75)) == "a"
+
+def test_hit_callback_refines_the_rectangle():
+    grid = SpatialGrid(50)
+    grid.insert("low", (0, 0, 60, 60))
+    grid.insert("high", (0, 0, 60, 60))
+    assert grid.topmost_at((10, 10), hit=lambda item, pos: item != "high") == "low"
+
+def test_edges_are_half_open():
+    grid = SpatialGrid(32)
+    grid.insert(1, (10, 10, 22, 22))  # Ends exactly on a cell border
+    assert grid.at_point((31, 31)) == [1]
+    assert grid.at_point((32, 32)) == []
+    assert grid.at_point((10, 10)) == [1]
+    assert grid.at_point((9, 10)) == []
+
+def test_move_keeps_order_and_updates_cells():
+    grid = SpatialGrid(40)
+    grid.insert(1, (0, 0, 40, 40))
+    grid.insert(2, (0, 0, 40, 40))
+    grid.move(1, (200, 200, 40, 40))
+    assert grid.at_point((10, 10)) == [2]
+    assert grid.topmost_at((210, 210)) == 1
+    grid.move(1, (0, 0, 40, 40))
+    assert grid.topmost_at((10, 10)) == 2  # Still below 2
+    grid.remove(2)
+    assert grid.topmost_at((10, 10)) == 1
+    assert 2 not in grid and len(grid) == 1
+
+def test_in_rect_and_negative_coordinates():
+    grid = SpatialGrid(25)
+    grid.insert("left", (-60, -60, 30, 30))
+    grid.insert("wide", (-10, 0, 300, 20))
+    grid.insert("far", (500, 500, 10, 10))
+    assert grid.topmost_at((-45, -45)) == "left"
+    assert grid.in_rect((-100, -100, 150, 150)) == {"left", "wide"}
+    assert grid.in_rect((250, 5, 10, 10)) == {"wide"}
+    grid.clear()
+    assert len(grid) == 0 and not grid.cells
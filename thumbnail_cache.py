@@ -0,0 +1,95 @@
+# -----------------------------------------------------------
+#  thumbnail_cache.py  (on-disk thumbnails built on a thread pool)
+# -----------------------------------------------------------
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+THUMB_DIR = os.path.join("assets", "cache", "thumbnails")
+THUMB_SIZE = 150
+THUMB_WORKERS = min(8, os.cpu_count() or 2)
+
+def thumbnail_path(image_path, size=THUMB_SIZE):
+    """
+    Cache file for ``image_path``. The name hashes the path, modification
+    time and file size, so an edited or replaced image gets a new thumbnail.
+    """
+    st = os.stat(image_path)
+    key = f"{os.path.abspath(image_path)}|{st.st_mtime_ns}|{st.st_size}|{size}"
+    return os.path.join(THUMB_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
+
+def make_thumbnail(image_path, size=THUMB_SIZE):
+    """
+    Writes the square thumbnail for ``image_path`` and returns its path.
+    The image keeps its aspect ratio and is centered on white. Pillow
+    releases the GIL while decoding and resampling, so workers run in parallel.
+    """
+    out_path = thumbnail_path(image_path, size)
+    if os.path.exists(out_path):
+        return out_path
+    with Image.open(image_path) as img:
+        img.draft("RGB", (size, size))  # Lets JPEGs decode at a fraction of full size
+        img = img.convert("RGBA")
+        img.thumbnail((size, size), Image.LANCZOS)
+        square = Image.new("RGBA", (size, size), (255, 255, 255, 255))
+        square.paste(img, ((size - img.width) // 2, (size - img.height) // 2), img)
+    os.makedirs(THUMB_DIR, exist_ok=True)
+    tmp_path = f"{out_path}.{os.getpid()}.{id(square)}.tmp"
+    square.save(tmp_path, "PNG")
+    os.replace(tmp_path, out_path)  # Readers never see a half-written file
+    return out_path
+
+class ThumbnailCache:
+    """
+    Hands out thumbnail paths immediately when they are cached and
+    schedules the missing ones on a shared worker pool.
+    """
+    def __init__(self, size=THUMB_SIZE, workers=THUMB_WORKERS):
+        self.size = size
+        self.workers = workers
+        self._executor = None
+        self._pending = {}
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="thumbs")
+        return self._executor
+
+    def cached(self, image_path):
+        """Path of an up-to-date thumbnail, or None when it still has to be built."""
+        try:
+            path = thumbnail_path(image_path, self.size)
+        except OSError:
+            return None
+        return path if os.path.exists(path) else None
+
+    def request(self, image_path):
+        """
+        Future resolving to the thumbnail path. Repeated requests for an
+        image that is already being generated share one job.
+        """
+        future = self._pending.get(image_path)
+        if future is None:
+            future = self._pool().submit(make_thumbnail, image_path, self.size)
+            self._pending[image_path] = future
+            future.add_done_callback(lambda f, p=image_path: self._finished(p, f))
+        return future
+
+    def _finished(self, image_path, future):
+        if self._pending.get(image_path) is future:
+            del self._pending[image_path]
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+_shared = None
+
+def shared_thumbnails():
+    global _shared
+    if _shared is None:
+        _shared = ThumbnailCache()
+    return _shared
@@ -0,0 +1,318 @@
+# -----------------------------------------------------------
+#  tile_pyramid.py  (full-resolution images as tiled mip pyramids)
+# -----------------------------------------------------------
+#  Build:  python tile_pyramid.py build IMAGE [IMAGE ...]
+#
+#  A pyramid file holds an image at full resolution plus every halving
+#  down to one tile, cut into JPEG-compressed square tiles. At runtime
+#  the file is memory-mapped and only the tiles a view needs, at the
+#  coarsest level that is still sharp enough, are decoded. Decoded tiles
+#  live in a byte-bounded LRU cache, so memory stays the same for a
+#  50-megapixel photo as for a small one.
+#
+#  Pyramids are a cache. The full-resolution source of an upload is kept
+#  as a real asset in assets/originals, named by its content hash, so a
+#  deleted or stale pyramid is always rebuilt at full resolution.
+# -----------------------------------------------------------
+import hashlib
+import io
+import math
+import mmap
+import os
+import struct
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+from PIL import Image, ImageOps
+
+PYRAMID_DIR = os.path.join("assets", "cache", "pyramids")
+ORIGINALS_DIR = os.path.join("assets", "originals")
+TILE_SIZE = 256
+TILE_QUALITY = 90  # JPEG quality of the stored tiles
+TILE_CACHE_BUDGET = 48 * 1024 * 1024  # Decoded tiles kept in memory, about 240 tiles
+
+# File layout: header, one level record per level, then one (offset,
+# length) entry per tile, level by level and row-major within a level,
+# then the tile blobs. Level 0 is full resolution.
+_MAGIC = b"PZPYRAM1"
+_HEADER = struct.Struct("<8sIIII")  # magic, tile size, width, height, level count
+_LEVEL = struct.Struct("<IIII")  # width, height, columns, rows
+_ENTRY = struct.Struct("<QI")  # offset, length
+
+Image.MAX_IMAGE_PIXELS = None  # Pyramids are meant for very large photos
+
+def pyramid_path(image_path):
+    """
+    Cache file for ``image_path``. Like thumbnails, the name hashes the
+    path, modification time and size, so a replaced image is re-tiled.
+    """
+    st = os.stat(image_path)
+    key = f"{os.path.abspath(image_path)}|{st.st_mtime_ns}|{st.st_size}|{TILE_SIZE}"
+    return os.path.join(PYRAMID_DIR, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".pyr")
+
+def original_path(digest):
+    """
+    Where the full-resolution original with content hash ``digest`` is
+    kept. Named by the hash alone, so the catalog's hash is all it takes
+    to find it; PIL reads the format from the file itself.
+    """
+    return os.path.join(ORIGINALS_DIR, digest)
+
+def find_original(digest):
+    """Path of the kept original with content hash ``digest``, or None."""
+    path = original_path(digest)
+    return path if os.path.exists(path) else None
+
+# ------------------ BUILD ----------------------------------
+def build_pyramid(source, out_path, tile_size=TILE_SIZE, quality=TILE_QUALITY, upright=False):
+    """
+    Writes the pyramid of ``source`` (a path or an RGB PIL image) to
+    ``out_path`` and returns the path. ``upright`` applies the file's EXIF
+    rotation, as uploads are stored.
+
+    All levels are built in one pass over the source, a band of one tile
+    row at a time: each band is cut into tiles and halved (2x2 box) into
+    the band the next level is collecting. Besides the source, only about
+    one tile row per level is in memory, never a whole reduced level.
+    """
+    if isinstance(source, Image.Image):
+        img = source if source.mode == "RGB" else source.convert("RGB")
+    else:
+        with Image.open(source) as opened:
+            # Unrotated unless asked, like the board's copy of library images
+            img = ImageOps.exif_transpose(opened) if upright else opened
+            img = img if img.mode == "RGB" else img.convert("RGB")
+            img.load()  # Decoded once and not copied; the file can close
+
+    levels = []
+    width, height = img.size
+    while True:
+        levels.append((width, height, -(-width // tile_size), -(-height // tile_size)))
+        if max(width, height) <= tile_size:
+            break
+        width, height = max(1, width // 2), max(1, height // 2)
+    first_tile = []
+    tile_count = 0
+    for _, _, cols, rows in levels:
+        first_tile.append(tile_count)
+        tile_count += cols * rows
+
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    tmp_path = f"{out_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    entries = [None] * tile_count
+    held = [[] for _ in levels]  # Rows each level has received but not yet cut, as bands
+    held_rows = [0] * len(levels)
+    cut_rows = [0] * len(levels)
+
+    def halved_rows(y, height, next_height):
+        # Rows of the next level that come from the first ``y`` rows of this one
+        return next_height if y >= height else min(next_height, y // 2)
+
+    def receive(number, band):
+        width, height, cols, _ = levels[number]
+        held[number].append(band)
+        held_rows[number] += band.height
+        while held_rows[number] >= tile_size or (held_rows[number] and cut_rows[number] + held_rows[number] >= height):
+            count = min(tile_size, held_rows[number])
+            strip = Image.new("RGB", (width, count))
+            y = 0
+            while y < count:
+                part = held[number].pop(0)
+                take = min(part.height, count - y)
+                strip.paste(part.crop((0, 0, width, take)), (0, y))
+                if take < part.height:
+                    held[number].insert(0, part.crop((0, take, width, part.height)))
+                y += take
+            held_rows[number] -= count
+            top = cut_rows[number]
+            cut_rows[number] += count
+            row_start = first_tile[number] + (top // tile_size) * cols
+            for tx in range(cols):
+                blob = io.BytesIO()
+                strip.crop((tx * tile_size, 0, min(width, (tx + 1) * tile_size), count)).save(
+                    blob, "JPEG", quality=quality)
+                entries[row_start + tx] = (f.tell(), blob.tell())
+                f.write(blob.getbuffer())
+            if number + 1 < len(levels):
+                next_width, next_height = levels[number + 1][:2]
+                rows = (halved_rows(top + count, height, next_height)
+                        - halved_rows(top, height, next_height))
+                if rows:
+                    box = (0, 0, min(width, 2 * next_width), min(count, 2 * rows))
+                    receive(number + 1, strip.resize((next_width, rows), Image.BOX, box=box))
+
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, tile_size, img.width, img.height, len(levels)))
+        for level in levels:
+            f.write(_LEVEL.pack(*level))
+        index_at = f.tell()
+        f.write(b"\0" * (_ENTRY.size * tile_count))  # Filled in once the offsets are known
+        for top in range(0, img.height, tile_size):
+            receive(0, img.crop((0, top, img.width, min(img.height, top + tile_size))))
+        f.seek(index_at)
+        f.write(b"".join(_ENTRY.pack(*entry) for entry in entries))
+    os.replace(tmp_path, out_path)  # Readers never see a half-written file
+    return out_path
+
+def ensure_pyramid(image_path, upright=False):
+    """Path of the pyramid for ``image_path``, building it first if needed."""
+    out_path = pyramid_path(image_path)
+    if not os.path.exists(out_path):
+        build_pyramid(image_path, out_path, upright=upright)
+    return out_path
+
+# ------------------ TILE CACHE -----------------------------
+class TileCache:
+    """LRU cache of surfaces bounded in bytes; every open pyramid shares one for its tiles."""
+    def __init__(self, budget_bytes=TILE_CACHE_BUDGET):
+        self.budget_bytes = budget_bytes
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._tiles = OrderedDict()
+
+    def get(self, key):
+        surface = self._tiles.get(key)
+        if surface is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._tiles.move_to_end(key)
+        return surface
+
+    def put(self, key, surface):
+        old = self._tiles.pop(key, None)
+        if old is not None:
+            self.memory_bytes -= old.get_pitch() * old.get_height()
+        self._tiles[key] = surface
+        self.memory_bytes += surface.get_pitch() * surface.get_height()
+        while self.memory_bytes > self.budget_bytes and len(self._tiles) > 1:
+            _, evicted = self._tiles.popitem(last=False)
+            self.memory_bytes -= evicted.get_pitch() * evicted.get_height()
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def clear(self):
+        self._tiles.clear()
+        self.memory_bytes = 0
+
+_shared_cache = None
+
+def shared_tile_cache():
+    global _shared_cache
+    if _shared_cache is None:
+        _shared_cache = TileCache()
+    return _shared_cache
+
+# ------------------ RUNTIME --------------------------------
+class TilePyramid:
+    """Read-only, memory-mapped view of a pyramid file."""
+    def __init__(self, path, cache=None):
+        self.path = path
+        self.cache = cache if cache is not None else shared_tile_cache()
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.tile_size, self.width, self.height, count = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a tile pyramid")
+        self.levels = [_LEVEL.unpack_from(self._map, _HEADER.size + i * _LEVEL.size) for i in range(count)]
+        self._index_at = _HEADER.size + count * _LEVEL.size
+        self._first_tile = []
+        first = 0
+        for _, _, cols, rows in self.levels:
+            self._first_tile.append(first)
+            first += cols * rows
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def level_for(self, scale):
+        """Coarsest level with at least ``scale`` of its pixels per full-resolution pixel."""
+        level = 0
+        while level + 1 < len(self.levels) and 0.5 ** (level + 1) >= scale:
+            level += 1
+        return level
+
+    def tile(self, level, tx, ty):
+        """Decoded tile (tx, ty) of ``level``, from the cache when possible."""
+        key = (self.path, level, tx, ty)
+        surface = self.cache.get(key)
+        if surface is None:
+            cols = self.levels[level][2]
+            offset, length = _ENTRY.unpack_from(
+                self._map, self._index_at + (self._first_tile[level] + ty * cols + tx) * _ENTRY.size)
+            surface = pygame.image.load(io.BytesIO(self._map[offset:offset + length]), "tile.jpg")
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            self.cache.put(key, surface)
+        return surface
+
+    def region(self, level, rect):
+        """
+        Pixels of ``rect`` (in ``level`` coordinates) composited from the
+        tiles under it; parts outside the image stay black.
+        """
+        rect = pygame.Rect(rect)
+        out = pygame.Surface(rect.size)
+        width, height, _, _ = self.levels[level]
+        inside = rect.clip((0, 0, width, height))
+        if not inside.width or not inside.height:
+            return out
+        size = self.tile_size
+        for ty in range(inside.top // size, (inside.bottom - 1) // size + 1):
+            for tx in range(inside.left // size, (inside.right - 1) // size + 1):
+                out.blit(self.tile(level, tx, ty), (tx * size - rect.x, ty * size - rect.y))
+        return out
+
+    def render(self, src_rect, dest_size):
+        """
+        ``src_rect`` (x, y, w, h in full-resolution pixels, floats allowed)
+        scaled to ``dest_size``. Reads the coarsest level that still has
+        at least one pixel per output pixel, so the work and memory depend
+        on ``dest_size``, not on the image.
+        """
+        x, y, w, h = src_rect
+        level = self.level_for(max(dest_size[0] / w, dest_size[1] / h))
+        factor = 0.5 ** level
+        # Whole level pixels covering the source, scaled, then cropped to it
+        left, top = math.floor(x * factor), math.floor(y * factor)
+        right, bottom = math.ceil((x + w) * factor), math.ceil((y + h) * factor)
+        kx, ky = dest_size[0] / (w * factor), dest_size[1] / (h * factor)
+        pixels = self.region(level, (left, top, right - left, bottom - top))
+        scaled = pygame.transform.smoothscale(
+            pixels, (max(dest_size[0], round((right - left) * kx)), max(dest_size[1], round((bottom - top) * ky))))
+        crop_x = min(round((x * factor - left) * kx), scaled.get_width() - dest_size[0])
+        crop_y = min(round((y * factor - top) * ky), scaled.get_height() - dest_size[1])
+        return scaled.subsurface((crop_x, crop_y, *dest_size)).copy()
+
+_loader = None
+
+def open_pyramid_async(image_path, upright=False):
+    """
+    Future of the TilePyramid for ``image_path``. Building a missing
+    pyramid takes a few seconds for a 50-megapixel photo, so it runs on
+    a background thread; tiles are only decoded once the game asks.
+    """
+    global _loader
+    if _loader is None:
+        _loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pyramid")
+    return _loader.submit(lambda: TilePyramid(ensure_pyramid(image_path, upright)))
+
+# ------------------ COMMAND LINE ---------------------------
+if __name__ == "__main__":
+    # python tile_pyramid.py build IMAGE [IMAGE ...]
+    if len(sys.argv) > 2 and sys.argv[1] == "build":
+        for image in sys.argv[2:]:
+            print(ensure_pyramid(image))
+    else:
+        print("usage: python tile_pyramid.py build IMAGE [IMAGE ...]")
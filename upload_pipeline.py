@@ -0,0 +1,145 @@
+# -----------------------------------------------------------
+#  upload_pipeline.py  (custom image uploads off the main thread)
+# -----------------------------------------------------------
+import os
+import shutil
+import threading
+
+import pygame
+from PIL import Image, ImageOps
+
+from image_catalog import file_hash, image_number
+from image_library import IMAGE_DIR, IMAGE_EXTENSIONS, IMAGE_SIZE, decode_image, shared_library
+from thumbnail_cache import make_thumbnail
+from tile_pyramid import build_pyramid, original_path, pyramid_path
+
+# Posted to the pygame event queue when an upload finishes. The event has
+# ``filename`` and ``surface`` on success, or ``error`` (a message) on
+# failure. Uploading a photo that is already in the library finishes with
+# the existing file's name instead of a copy.
+UPLOAD_DONE = pygame.event.custom_type()
+
+MAX_UPLOAD_EDGE = 1200  # Longest side of the normalized copy stored in assets/images;
+                        # the uploaded file itself is kept in assets/originals
+
+_name_lock = threading.Lock()
+_reserved_names = set()
+_reserved_hashes = set()  # Content hashes of uploads still running
+active_uploads = []  # Uploads still running, oldest first; guarded by _name_lock
+
+def get_next_image_number():
+    """N for the next ``imageN`` file: past every catalogued and reserved name."""
+    reserved = [image_number(name) or 0 for name in _reserved_names]
+    return max([shared_library().catalog.next_number()] + [number + 1 for number in reserved])
+
+class Upload:
+    """One image being imported; ``stage`` and ``progress`` drive the UI."""
+    def __init__(self, source_path):
+        self.source_path = source_path
+        self.filename = None
+        self.digest = None
+        self.stage = "Queued"
+        self.progress = 0.0
+
+    def _step(self, stage, progress):
+        self.stage = stage
+        self.progress = progress
+
+    def run(self):
+        try:
+            self._step("Hashing", 0.05)
+            library = shared_library()
+            digest = file_hash(self.source_path)
+            with _name_lock:
+                existing = library.catalog.find_hash(digest)
+                if existing is None and digest in _reserved_hashes:
+                    raise ValueError("the same image is already being uploaded")
+                if existing is None:
+                    self.digest = digest
+                    _reserved_hashes.add(digest)
+            if existing is not None:
+                self.filename = existing
+                surface = decode_image(os.path.join(IMAGE_DIR, existing), convert=False)
+                library.add(existing)
+                self._step("Already added", 1.0)
+                pygame.event.post(pygame.event.Event(UPLOAD_DONE, filename=existing, surface=surface))
+                return
+
+            self._step("Decoding", 0.1)
+            with Image.open(self.source_path) as img:
+                img.load()
+                ImageOps.exif_transpose(img, in_place=True)  # Avoids another full-size copy
+                img = img if img.mode == "RGB" else img.convert("RGB")
+
+            self._step("Resizing", 0.3)
+            full = img
+            if max(img.size) > MAX_UPLOAD_EDGE:
+                img = ImageOps.contain(img, (MAX_UPLOAD_EDGE, MAX_UPLOAD_EDGE), Image.LANCZOS)
+            display = img.resize(IMAGE_SIZE, Image.LANCZOS)
+
+            self._step("Saving", 0.45)
+            ext = os.path.splitext(self.source_path)[1].lower()
+            if ext not in IMAGE_EXTENSIONS:
+                ext = '.jpg'
+            with _name_lock:
+                os.makedirs(IMAGE_DIR, exist_ok=True)
+                self.filename = f"image{get_next_image_number()}{ext}"
+                _reserved_names.add(self.filename)
+            new_path = os.path.join(IMAGE_DIR, self.filename)
+            tmp_path = new_path + ".tmp"
+            img.save(tmp_path, "PNG" if ext == '.png' else "JPEG", quality=92)
+            os.replace(tmp_path, new_path)
+            # The untouched upload, so full resolution never depends on the cache
+            full_path = original_path(digest)
+            if not os.path.exists(full_path):
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                shutil.copyfile(self.source_path, full_path + ".tmp")
+                os.replace(full_path + ".tmp", full_path)
+            library.catalog.add(self.filename, digest, img.size)
+            library.add(self.filename)  # Listed even if no game is open to get the event
+
+            self._step("Tiling", 0.6)
+            del img
+            build_pyramid(full, pyramid_path(full_path))  # Zooming in reads from this
+            del full
+
+            self._step("Thumbnail", 0.9)
+            make_thumbnail(new_path)  # Cached for the image browser
+
+            # Plain pixel copy; converting to the display format is left to the main thread
+            surface = pygame.image.frombuffer(display.tobytes(), IMAGE_SIZE, "RGB").copy()
+            self._step("Done", 1.0)
+            pygame.event.post(pygame.event.Event(UPLOAD_DONE, filename=self.filename, surface=surface))
+        except Exception as e:
+            self._step("Failed", 1.0)
+            pygame.event.post(pygame.event.Event(UPLOAD_DONE, filename=self.filename, surface=None,
+                                                 error=f"Failed to load/copy uploaded image: {e}"))
+        finally:
+            with _name_lock:
+                _reserved_names.discard(self.filename)
+                _reserved_hashes.discard(self.digest)
+                active_uploads.remove(self)
+
+def start_upload(source_path):
+    """Imports ``source_path`` on a worker thread and returns its Upload."""
+    upload = Upload(source_path)
+    with _name_lock:
+        active_uploads.append(upload)
+    threading.Thread(target=upload.run, daemon=True).start()
+    return upload
+
+def draw_upload_progress(screen, font, rect, text_color, bar_color):
+    """Draws a progress bar for the oldest running upload inside ``rect``."""
+    with _name_lock:
+        uploads = list(active_uploads)  # Workers remove themselves as they finish
+    if not uploads:
+        return
+    upload = uploads[0]
+    pygame.draw.rect(screen, (255, 255, 255), rect, border_radius=5)
+    fill = rect.copy()
+    fill.width = int(rect.width * upload.progress)
+    pygame.draw.rect(screen, bar_color, fill, border_radius=5)
+    pygame.draw.rect(screen, (200, 200, 200), rect, 2, border_radius=5)
+    label = upload.stage if len(uploads) == 1 else f"{upload.stage} (+{len(uploads) - 1})"
+    text = font.render(label, True, text_color)
+    screen.blit(text, text.get_rect(center=rect.center))